@@ -27,6 +27,24 @@ def pytest_addoption(parser: Parser) -> None:
         default=False,
         help="run tests that are a bit slow",
     )
+    parser.addoption(
+        "--run-benchmarks",
+        action="store_true",
+        default=False,
+        help="run the benchmarks and fail any that are slower or use more memory than their stored baselines",
+    )
+    parser.addoption(
+        "--update-benchmark-baselines",
+        action="store_true",
+        default=False,
+        help="run the benchmarks and store their measurements as the new baselines",
+    )
+    parser.addoption(
+        "--benchmark-baseline-tolerance",
+        type=float,
+        default=None,
+        help="the fraction of its baseline a benchmark may exceed the baseline by (0.5 if not set)",
+    )
 
 
 def pytest_collection_modifyitems(config: Config, items: List[Function]) -> None:
@@ -45,3 +63,14 @@ def pytest_collection_modifyitems(config: Config, items: List[Function]) -> None
         for item in items:
             if "slow" in item.keywords:
                 item.add_marker(skip_slow)
+
+    if not (
+        config.getoption("--run-benchmarks")
+        or config.getoption("--update-benchmark-baselines")
+    ):
+        skip_benchmark = pytest.mark.skip(
+            reason="benchmarks are skipped unless --run-benchmarks or --update-benchmark-baselines option is set"
+        )
+        for item in items:
+            if "benchmark" in item.keywords:
+                item.add_marker(skip_benchmark)
@@ -31,6 +31,7 @@ setup(
         "requests>=2.24.0",
         'importlib-metadata ~= 1.0 ; python_version < "3.8"',
     ],
+    extras_require={"parquet": ["pyarrow>=3.0.0"]},
     zip_safe=False,
     include_package_data=True,
     classifiers=[
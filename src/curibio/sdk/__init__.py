@@ -1,52 +1,200 @@
 # -*- coding: utf-8 -*-
 """Docstring."""
+import importlib
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from typing import TYPE_CHECKING
 
-from mantarray_file_manager import WellFile
+if TYPE_CHECKING:  # pragma: no cover
+    from mantarray_file_manager import WellFile
+
+    from . import jupyter_helpers
+    from .aggregate_statistics import get_aggregate_statistics
+    from .constants import AGGREGATE_METRICS_SHEET_NAME
+    from .constants import AGGREGATE_STATISTIC_NAMES
+    from .constants import ALL_FORMATS
+    from .constants import CALCULATED_METRIC_DISPLAY_NAMES
+    from .constants import CHART_BASE_WIDTH
+    from .constants import CHART_DATA_COLUMNS_PER_WELL
+    from .constants import CHART_DATA_SHEET_NAME
+    from .constants import CHART_FIXED_WIDTH
+    from .constants import CHART_FIXED_WIDTH_CELLS
+    from .constants import CHART_HEIGHT
+    from .constants import CHART_HEIGHT_CELLS
+    from .constants import CHART_WINDOW_NUM_DATA_POINTS
+    from .constants import CHART_WINDOW_NUM_SECONDS
+    from .constants import CONTINUOUS_WAVEFORM_SHEET_NAME
+    from .constants import CSV_OPTICAL_DATA_START_ROW
+    from .constants import CSV_OPTICAL_METADATA_ROWS
+    from .constants import DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES
+    from .constants import DEFAULT_CELL_WIDTH
+    from .constants import DEFAULT_CHART_MAX_POINTS
+    from .constants import EXCEL_OPTICAL_METADATA_CELLS
+    from .constants import FORCE_FREQUENCY_RELATIONSHIP_SHEET
+    from .constants import FULL_CHART_SHEET_NAME
+    from .constants import H5_RESULTS_CHUNK_NUM_SAMPLES
+    from .constants import H5_RESULTS_FILE_FORMAT_VERSION
+    from .constants import INTERPOLATED_DATA_PERIOD_CMS
+    from .constants import INTERPOLATED_DATA_PERIOD_SECONDS
+    from .constants import INTERPOLATION_VALUE_UUID
+    from .constants import METADATA_EXCEL_SHEET_NAME
+    from .constants import METADATA_INSTRUMENT_ROW_START
+    from .constants import METADATA_OUTPUT_FILE_ROW_START
+    from .constants import METADATA_RECORDING_ROW_START
+    from .constants import METADATA_UUID_DESCRIPTIONS
+    from .constants import MICROSECONDS_PER_CENTIMILLISECOND
+    from .constants import NUMBER_OF_PER_TWITCH_METRICS
+    from .constants import PACKAGE_VERSION as __version__
+    from .constants import PEAK_VALLEY_COLUMN_START
+    from .constants import PEAKS_AND_VALLEYS_TABLE_NAME
+    from .constants import PER_TWITCH_METRICS_SHEET_NAME
+    from .constants import PER_TWITCH_TIMEPOINT_COLUMN_NAME
+    from .constants import SECONDS_PER_CELL
+    from .constants import SNAPSHOT_CHART_SHEET_NAME
+    from .constants import TSP_TO_DEFAULT_FILTER_UUID
+    from .constants import TWITCH_FREQUENCIES_CHART_SHEET_NAME
+    from .constants import TWITCHES_POINT_UP_UUID
+    from .csv_well_file import CsvWellFile
+    from .excel_well_file import ExcelWellFile
+    from .excel_well_file import OpticalWellMetadata
+    from .exceptions import MetadataNotFoundError
+    from .exceptions import WellFileLoadingError
+    from .instrumentation import StageMeasurement
+    from .instrumentation import StageRecorder
+    from .instrumentation import StageReport
+    from .jupyter_helpers import check_if_latest_version
+    from .jupyter_helpers import get_latest_version_from_pypi
+    from .plate_analysis import PlateAnalysisResult
+    from .plate_recording import PlateRecording
+    from .well_analysis import get_per_twitch_table
+    from .well_analysis import WellAnalysisResult
+    from .xlsx_writing import XlsxWritingOptions
+
+# The public names are imported when first accessed, so that importing the
+# package doesn't import the analysis and plotting libraries. Each is found
+# by the module it is in and its name there, or None for submodules.
+_LAZY_ATTRIBUTES: Dict[str, Tuple[str, Optional[str]]] = {
+    "WellFile": ("mantarray_file_manager", "WellFile"),
+    "jupyter_helpers": (".jupyter_helpers", None),
+    "get_aggregate_statistics": (".aggregate_statistics", "get_aggregate_statistics"),
+    "AGGREGATE_METRICS_SHEET_NAME": (".constants", "AGGREGATE_METRICS_SHEET_NAME"),
+    "AGGREGATE_STATISTIC_NAMES": (".constants", "AGGREGATE_STATISTIC_NAMES"),
+    "ALL_FORMATS": (".constants", "ALL_FORMATS"),
+    "CALCULATED_METRIC_DISPLAY_NAMES": (
+        ".constants",
+        "CALCULATED_METRIC_DISPLAY_NAMES",
+    ),
+    "CHART_BASE_WIDTH": (".constants", "CHART_BASE_WIDTH"),
+    "CHART_DATA_COLUMNS_PER_WELL": (".constants", "CHART_DATA_COLUMNS_PER_WELL"),
+    "CHART_DATA_SHEET_NAME": (".constants", "CHART_DATA_SHEET_NAME"),
+    "CHART_FIXED_WIDTH": (".constants", "CHART_FIXED_WIDTH"),
+    "CHART_FIXED_WIDTH_CELLS": (".constants", "CHART_FIXED_WIDTH_CELLS"),
+    "CHART_HEIGHT": (".constants", "CHART_HEIGHT"),
+    "CHART_HEIGHT_CELLS": (".constants", "CHART_HEIGHT_CELLS"),
+    "CHART_WINDOW_NUM_DATA_POINTS": (".constants", "CHART_WINDOW_NUM_DATA_POINTS"),
+    "CHART_WINDOW_NUM_SECONDS": (".constants", "CHART_WINDOW_NUM_SECONDS"),
+    "CONTINUOUS_WAVEFORM_SHEET_NAME": (".constants", "CONTINUOUS_WAVEFORM_SHEET_NAME"),
+    "CSV_OPTICAL_DATA_START_ROW": (".constants", "CSV_OPTICAL_DATA_START_ROW"),
+    "CSV_OPTICAL_METADATA_ROWS": (".constants", "CSV_OPTICAL_METADATA_ROWS"),
+    "DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES": (
+        ".constants",
+        "DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES",
+    ),
+    "DEFAULT_CELL_WIDTH": (".constants", "DEFAULT_CELL_WIDTH"),
+    "DEFAULT_CHART_MAX_POINTS": (".constants", "DEFAULT_CHART_MAX_POINTS"),
+    "EXCEL_OPTICAL_METADATA_CELLS": (".constants", "EXCEL_OPTICAL_METADATA_CELLS"),
+    "FORCE_FREQUENCY_RELATIONSHIP_SHEET": (
+        ".constants",
+        "FORCE_FREQUENCY_RELATIONSHIP_SHEET",
+    ),
+    "FULL_CHART_SHEET_NAME": (".constants", "FULL_CHART_SHEET_NAME"),
+    "H5_RESULTS_CHUNK_NUM_SAMPLES": (".constants", "H5_RESULTS_CHUNK_NUM_SAMPLES"),
+    "H5_RESULTS_FILE_FORMAT_VERSION": (".constants", "H5_RESULTS_FILE_FORMAT_VERSION"),
+    "INTERPOLATED_DATA_PERIOD_CMS": (".constants", "INTERPOLATED_DATA_PERIOD_CMS"),
+    "INTERPOLATED_DATA_PERIOD_SECONDS": (
+        ".constants",
+        "INTERPOLATED_DATA_PERIOD_SECONDS",
+    ),
+    "INTERPOLATION_VALUE_UUID": (".constants", "INTERPOLATION_VALUE_UUID"),
+    "METADATA_EXCEL_SHEET_NAME": (".constants", "METADATA_EXCEL_SHEET_NAME"),
+    "METADATA_INSTRUMENT_ROW_START": (".constants", "METADATA_INSTRUMENT_ROW_START"),
+    "METADATA_OUTPUT_FILE_ROW_START": (".constants", "METADATA_OUTPUT_FILE_ROW_START"),
+    "METADATA_RECORDING_ROW_START": (".constants", "METADATA_RECORDING_ROW_START"),
+    "METADATA_UUID_DESCRIPTIONS": (".constants", "METADATA_UUID_DESCRIPTIONS"),
+    "MICROSECONDS_PER_CENTIMILLISECOND": (
+        ".constants",
+        "MICROSECONDS_PER_CENTIMILLISECOND",
+    ),
+    "NUMBER_OF_PER_TWITCH_METRICS": (".constants", "NUMBER_OF_PER_TWITCH_METRICS"),
+    "__version__": (".constants", "PACKAGE_VERSION"),
+    "PEAK_VALLEY_COLUMN_START": (".constants", "PEAK_VALLEY_COLUMN_START"),
+    "PEAKS_AND_VALLEYS_TABLE_NAME": (".constants", "PEAKS_AND_VALLEYS_TABLE_NAME"),
+    "PER_TWITCH_METRICS_SHEET_NAME": (".constants", "PER_TWITCH_METRICS_SHEET_NAME"),
+    "PER_TWITCH_TIMEPOINT_COLUMN_NAME": (
+        ".constants",
+        "PER_TWITCH_TIMEPOINT_COLUMN_NAME",
+    ),
+    "SECONDS_PER_CELL": (".constants", "SECONDS_PER_CELL"),
+    "SNAPSHOT_CHART_SHEET_NAME": (".constants", "SNAPSHOT_CHART_SHEET_NAME"),
+    "TSP_TO_DEFAULT_FILTER_UUID": (".constants", "TSP_TO_DEFAULT_FILTER_UUID"),
+    "TWITCH_FREQUENCIES_CHART_SHEET_NAME": (
+        ".constants",
+        "TWITCH_FREQUENCIES_CHART_SHEET_NAME",
+    ),
+    "TWITCHES_POINT_UP_UUID": (".constants", "TWITCHES_POINT_UP_UUID"),
+    "CsvWellFile": (".csv_well_file", "CsvWellFile"),
+    "ExcelWellFile": (".excel_well_file", "ExcelWellFile"),
+    "OpticalWellMetadata": (".excel_well_file", "OpticalWellMetadata"),
+    "MetadataNotFoundError": (".exceptions", "MetadataNotFoundError"),
+    "WellFileLoadingError": (".exceptions", "WellFileLoadingError"),
+    "StageMeasurement": (".instrumentation", "StageMeasurement"),
+    "StageRecorder": (".instrumentation", "StageRecorder"),
+    "StageReport": (".instrumentation", "StageReport"),
+    "check_if_latest_version": (".jupyter_helpers", "check_if_latest_version"),
+    "get_latest_version_from_pypi": (
+        ".jupyter_helpers",
+        "get_latest_version_from_pypi",
+    ),
+    "PlateAnalysisResult": (".plate_analysis", "PlateAnalysisResult"),
+    "PlateRecording": (".plate_recording", "PlateRecording"),
+    "get_per_twitch_table": (".well_analysis", "get_per_twitch_table"),
+    "WellAnalysisResult": (".well_analysis", "WellAnalysisResult"),
+    "XlsxWritingOptions": (".xlsx_writing", "XlsxWritingOptions"),
+}
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name, attribute_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    module = importlib.import_module(module_name, __name__)
+    value = module if attribute_name is None else getattr(module, attribute_name)
+    globals()[name] = value  # later accesses don't go through __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
-from . import jupyter_helpers
-from .constants import AGGREGATE_METRICS_SHEET_NAME
-from .constants import ALL_FORMATS
-from .constants import CALCULATED_METRIC_DISPLAY_NAMES
-from .constants import CHART_BASE_WIDTH
-from .constants import CHART_FIXED_WIDTH
-from .constants import CHART_FIXED_WIDTH_CELLS
-from .constants import CHART_HEIGHT
-from .constants import CHART_HEIGHT_CELLS
-from .constants import CHART_WINDOW_NUM_DATA_POINTS
-from .constants import CHART_WINDOW_NUM_SECONDS
-from .constants import CONTINUOUS_WAVEFORM_SHEET_NAME
-from .constants import DEFAULT_CELL_WIDTH
-from .constants import EXCEL_OPTICAL_METADATA_CELLS
-from .constants import FORCE_FREQUENCY_RELATIONSHIP_SHEET
-from .constants import FULL_CHART_SHEET_NAME
-from .constants import INTERPOLATED_DATA_PERIOD_CMS
-from .constants import INTERPOLATED_DATA_PERIOD_SECONDS
-from .constants import INTERPOLATION_VALUE_UUID
-from .constants import METADATA_EXCEL_SHEET_NAME
-from .constants import METADATA_INSTRUMENT_ROW_START
-from .constants import METADATA_OUTPUT_FILE_ROW_START
-from .constants import METADATA_RECORDING_ROW_START
-from .constants import METADATA_UUID_DESCRIPTIONS
-from .constants import MICROSECONDS_PER_CENTIMILLISECOND
-from .constants import NUMBER_OF_PER_TWITCH_METRICS
-from .constants import PACKAGE_VERSION as __version__
-from .constants import PEAK_VALLEY_COLUMN_START
-from .constants import PER_TWITCH_METRICS_SHEET_NAME
-from .constants import SECONDS_PER_CELL
-from .constants import SNAPSHOT_CHART_SHEET_NAME
-from .constants import TSP_TO_DEFAULT_FILTER_UUID
-from .constants import TWITCH_FREQUENCIES_CHART_SHEET_NAME
-from .constants import TWITCHES_POINT_UP_UUID
-from .excel_well_file import ExcelWellFile
-from .exceptions import MetadataNotFoundError
-from .jupyter_helpers import check_if_latest_version
-from .jupyter_helpers import get_latest_version_from_pypi
-from .plate_recording import PlateRecording
 
 __all__ = [
     "WellFile",
     "ExcelWellFile",
+    "CsvWellFile",
+    "OpticalWellMetadata",
     "PlateRecording",
+    "PlateAnalysisResult",
+    "StageReport",
+    "StageMeasurement",
+    "StageRecorder",
+    "WellAnalysisResult",
+    "XlsxWritingOptions",
+    "get_per_twitch_table",
+    "get_aggregate_statistics",
     "check_if_latest_version",
     "get_latest_version_from_pypi",
     "jupyter_helpers",
@@ -74,9 +222,13 @@ __all__ = [
     "CHART_WINDOW_NUM_SECONDS",
     "CHART_WINDOW_NUM_DATA_POINTS",
     "EXCEL_OPTICAL_METADATA_CELLS",
+    "CSV_OPTICAL_METADATA_ROWS",
+    "CSV_OPTICAL_DATA_START_ROW",
+    "DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES",
     "TWITCHES_POINT_UP_UUID",
     "METADATA_UUID_DESCRIPTIONS",
     "MetadataNotFoundError",
+    "WellFileLoadingError",
     "INTERPOLATION_VALUE_UUID",
     "FULL_CHART_SHEET_NAME",
     "SECONDS_PER_CELL",
@@ -84,4 +236,12 @@ __all__ = [
     "NUMBER_OF_PER_TWITCH_METRICS",
     "TWITCH_FREQUENCIES_CHART_SHEET_NAME",
     "FORCE_FREQUENCY_RELATIONSHIP_SHEET",
+    "CHART_DATA_SHEET_NAME",
+    "CHART_DATA_COLUMNS_PER_WELL",
+    "DEFAULT_CHART_MAX_POINTS",
+    "PER_TWITCH_TIMEPOINT_COLUMN_NAME",
+    "AGGREGATE_STATISTIC_NAMES",
+    "PEAKS_AND_VALLEYS_TABLE_NAME",
+    "H5_RESULTS_FILE_FORMAT_VERSION",
+    "H5_RESULTS_CHUNK_NUM_SAMPLES",
 ]
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+"""Statistics of the per-twitch metrics of all the wells of a plate at once.
+
+The per-twitch tables of the wells are stacked into a single array (padded
+with NaN, since wells have different numbers of twitches), and every
+statistic of every metric of every well is computed from it in one pass.
+
+To match the aggregate metrics computed by the waveform analysis pipeline,
+the mean and standard deviation of each metric (other than twitch
+frequency) are rounded to a whole number of the units the metric was
+computed in, such as centimilliseconds for times.
+"""
+from __future__ import annotations
+
+from typing import Any
+from typing import Dict
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from mantarray_waveform_analysis import CENTIMILLISECONDS_PER_SECOND
+from mantarray_waveform_analysis import TWITCH_FREQUENCY_UUID
+from mantarray_waveform_analysis import TWITCH_PERIOD_UUID
+from mantarray_waveform_analysis import WIDTH_UUID
+from nptyping import NDArray
+import numpy as np
+
+from .constants import CALCULATED_METRIC_DISPLAY_NAMES
+
+
+def _get_metric_names_and_scales() -> Tuple[Tuple[str, ...], NDArray[(Any,), float]]:
+    """Get the name of each metric and the factor to convert it.
+
+    Each factor converts the metric to the units it was computed in.
+    """
+    metric_names = list()
+    scales = list()
+    for metric_uuid, metric_name in CALCULATED_METRIC_DISPLAY_NAMES.items():
+        if isinstance(metric_name, tuple):
+            _, metric_name = metric_name
+        metric_names.append(metric_name)
+        scales.append(
+            CENTIMILLISECONDS_PER_SECOND
+            if metric_uuid in (TWITCH_PERIOD_UUID, WIDTH_UUID)
+            else 1
+        )
+    return tuple(metric_names), np.array(scales, dtype=np.float64)
+
+
+def get_aggregate_statistics(
+    per_twitch_tables: Sequence[Optional[Dict[str, NDArray[(1, Any), float]]]]
+) -> Tuple[NDArray[(Any,), int], NDArray[(Any, Any, Any), float]]:
+    """Compute the statistics of the per-twitch metrics of each well.
+
+    Args:
+        per_twitch_tables: the per-twitch table of each well from ``get_per_twitch_table``, or None for wells whose metrics could not be computed.
+
+    Returns:
+        The number of twitches of each well, and an array of statistics with an axis for the wells, an axis for the metrics (in the order of ``CALCULATED_METRIC_DISPLAY_NAMES``) and an axis for the statistics (in the order of ``AGGREGATE_STATISTIC_NAMES``). The statistics are in the same units as the per-twitch tables (the coefficient of variation is a fraction). Wells without a table have no twitches and NaN statistics.
+    """
+    metric_names, scales = _get_metric_names_and_scales()
+    twitch_counts = np.array(
+        [
+            0 if table is None else len(table[metric_names[0]])
+            for table in per_twitch_tables
+        ],
+        dtype=np.int64,
+    )
+    values = np.full(
+        (len(per_twitch_tables), len(metric_names), max(twitch_counts, default=0)),
+        np.nan,
+        dtype=np.float64,
+    )
+    for well_idx, table in enumerate(per_twitch_tables):
+        if table is None:
+            continue
+        for metric_idx, metric_name in enumerate(metric_names):
+            values[well_idx, metric_idx, : twitch_counts[well_idx]] = table[metric_name]
+
+    # the per-twitch values of the rounded metrics are whole numbers in the units they were computed in
+    is_rounded = np.array(
+        [
+            metric_uuid != TWITCH_FREQUENCY_UUID
+            for metric_uuid in CALCULATED_METRIC_DISPLAY_NAMES
+        ]
+    )
+    raw_values = values * scales[:, np.newaxis]
+    raw_values[:, is_rounded] = np.rint(raw_values[:, is_rounded])
+    is_twitch = np.arange(values.shape[2]) < twitch_counts[:, np.newaxis, np.newaxis]
+    counts = twitch_counts[:, np.newaxis]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        means = np.where(is_twitch, raw_values, 0).sum(axis=2) / counts
+        deviations = np.where(is_twitch, raw_values - means[:, :, np.newaxis], 0)
+        stdevs = np.sqrt((deviations ** 2).sum(axis=2) / counts)
+        means[:, is_rounded] = np.rint(means[:, is_rounded])
+        stdevs[:, is_rounded] = np.rint(stdevs[:, is_rounded])
+        covs = stdevs / means
+        sems = stdevs / np.sqrt(counts)
+
+    # stacked in the order of AGGREGATE_STATISTIC_NAMES
+    statistics: NDArray[(Any, Any, Any), float] = np.stack(
+        (means / scales, stdevs / scales, covs, sems / scales), axis=2
+    )
+    return twitch_counts, statistics
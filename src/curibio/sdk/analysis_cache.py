@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""Persistent on-disk cache of the analysis results of wells.
+
+Each cached well is a pickle of its ``WellAnalysisResult`` in the cache
+directory, named by a key derived from the raw data of the well, the
+parameters of the pipeline template and the versions of the SDK and the
+waveform analysis package. Results are only loaded from a cache directory
+that was written by the SDK, so it should not be shared with untrusted users.
+
+The total size of the cache directory is bounded by evicting the least
+recently used results, judged by the modification time of their files, which
+is updated each time a result is loaded.
+"""
+from __future__ import annotations
+
+import dataclasses
+import functools
+import hashlib
+import logging
+import os
+import pickle
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from mantarray_waveform_analysis import PipelineTemplate
+from nptyping import NDArray
+import numpy as np
+
+from .constants import PACKAGE_VERSION
+from .well_analysis import WellAnalysisResult
+
+try:  # importlib.metadata was added in Python 3.8
+    from importlib import metadata
+except ImportError:  # pragma: no cover # the importlib-metadata package is installed on earlier versions
+    import importlib_metadata as metadata  # type: ignore # Eli (9/1/20): for some reason mypy is giving weird errors for this
+
+logger = logging.getLogger(__name__)
+
+ANALYSIS_CACHE_FORMAT_VERSION = 1
+ANALYSIS_CACHE_FILE_EXTENSION = ".pkl"
+
+
+def _get_cache_file_path(cache_dir: str, cache_key: str) -> str:
+    return os.path.join(cache_dir, f"{cache_key}{ANALYSIS_CACHE_FILE_EXTENSION}")
+
+
+@functools.lru_cache(maxsize=None)
+def _get_waveform_analysis_version() -> str:
+    # looked up when first needed instead of on import, since reading package metadata is slow
+    version: str = metadata.version("mantarray-waveform-analysis")  # type: ignore # Eli (9/1/20): for some reason mypy is giving weird errors for this
+    return version
+
+
+def get_analysis_cache_key(
+    raw_tissue_reading: NDArray[(2, Any), float],
+    raw_reference_reading: NDArray[(2, Any), float],
+    pipeline_template: PipelineTemplate,
+) -> str:
+    """Get the key of the cached analysis of the raw data of a well.
+
+    Args:
+        raw_tissue_reading: the tissue reading, as loaded into the pipeline.
+        raw_reference_reading: the reference reading, as loaded into the pipeline.
+        pipeline_template: the template the well is analyzed with.
+
+    Returns:
+        A hex digest that changes if the data, the template parameters or the versions of the analysis code change.
+    """
+    key_hash = hashlib.sha256()
+    key_hash.update(
+        repr(
+            (
+                ANALYSIS_CACHE_FORMAT_VERSION,
+                PACKAGE_VERSION,
+                _get_waveform_analysis_version(),
+                pipeline_template.tissue_sampling_period,
+                str(pipeline_template.noise_filter_uuid),
+                pipeline_template.magnetic_twitches_point_up,
+            )
+        ).encode("utf-8")
+    )
+    for reading in (raw_tissue_reading, raw_reference_reading):
+        reading = np.ascontiguousarray(reading)
+        key_hash.update(f"{reading.dtype.str}{reading.shape}".encode("utf-8"))
+        key_hash.update(reading.data)
+    return key_hash.hexdigest()
+
+
+def load_cached_analysis(
+    cache_dir: str, cache_key: str, well_index: int
+) -> Optional[WellAnalysisResult]:
+    """Load the cached analysis of a well, if there is one.
+
+    Args:
+        cache_dir: the directory the results are cached in.
+        cache_key: the key from ``get_analysis_cache_key``.
+        well_index: the index of the well being loaded, since wells with identical data share a cached result.
+
+    Returns:
+        The result of the analysis, or None if it isn't cached or can't be read.
+    """
+    file_path = _get_cache_file_path(cache_dir, cache_key)
+    try:
+        with open(file_path, "rb") as cache_file:
+            result = pickle.load(cache_file)
+    except Exception:  # pylint: disable=broad-except # a truncated or incompatible pickle can raise almost any error while loading, and is treated as a miss
+        return None
+    if not isinstance(result, WellAnalysisResult):
+        return None
+    try:
+        os.utime(file_path)  # mark the result as recently used
+    except OSError:
+        pass
+    return dataclasses.replace(result, well_index=well_index)
+
+
+def _evict_least_recently_used(cache_dir: str, max_size_bytes: int) -> None:
+    cache_files: List[Tuple[int, int, str]] = list()
+    with os.scandir(cache_dir) as dir_entries:
+        for entry in dir_entries:
+            if not entry.name.endswith(ANALYSIS_CACHE_FILE_EXTENSION):
+                continue
+            entry_stat = entry.stat()
+            cache_files.append((entry_stat.st_mtime_ns, entry_stat.st_size, entry.path))
+    total_size = sum(file_size for _, file_size, _ in cache_files)
+    for _, file_size, file_path in sorted(cache_files):
+        if total_size <= max_size_bytes:
+            break
+        try:
+            os.remove(file_path)
+        except FileNotFoundError:  # another process evicted it first
+            pass
+        total_size -= file_size
+
+
+def store_cached_analysis(
+    cache_dir: str,
+    cache_key: str,
+    result: WellAnalysisResult,
+    max_size_bytes: int,
+) -> None:
+    """Cache the analysis of a well and evict old results if needed.
+
+    Failing to write the result is logged instead of raised, since the well
+    was still analyzed.
+
+    Args:
+        cache_dir: the directory to cache the results in. It is created if needed.
+        cache_key: the key from ``get_analysis_cache_key``.
+        result: the result of the analysis.
+        max_size_bytes: the total size the cached results are trimmed to, starting with the least recently used.
+    """
+    file_path = _get_cache_file_path(cache_dir, cache_key)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp_file_path = f"{file_path}.tmp{os.getpid()}"
+        with open(tmp_file_path, "wb") as cache_file:
+            pickle.dump(result, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_file_path, file_path)
+        _evict_least_recently_used(cache_dir, max_size_bytes)
+    except OSError as e:
+        msg = f"Unable to write analysis cache for well {result.well_index}: {e}"
+        logger.warning(msg)
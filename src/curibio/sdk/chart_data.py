@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+"""Downsampled copies of waveforms for charts.
+
+Excel draws every point of a chart series, so charts of long recordings
+sampled at 100 Hz are very slow to open. Charts instead plot a copy of
+each waveform that keeps the smallest and largest value in each of a
+fixed number of buckets of consecutive points, which preserves the peaks
+and valleys that would be visible at the width of the chart.
+"""
+from __future__ import annotations
+
+from typing import Any
+
+from nptyping import NDArray
+import numpy as np
+
+
+def check_max_points(max_points: int) -> None:
+    """Make sure a number of points can be kept by the decimation.
+
+    Raises:
+        ValueError: if fewer than 4 points would be kept.
+    """
+    if max_points < 4:
+        raise ValueError(f"max_points must be at least 4, not {max_points}")
+
+
+def get_min_max_decimation_indices(
+    values: NDArray[(1, Any), float], max_points: int
+) -> NDArray[(1, Any), int]:
+    """Get the indices of the points to keep when downsampling a waveform.
+
+    The points are split into buckets of consecutive points, and the
+    smallest and largest value in each bucket are kept (in their original
+    order), along with the first and last points of the waveform.
+
+    Args:
+        values: the values of the waveform.
+        max_points: the maximum number of points to keep. Must be at least 4.
+
+    Returns:
+        The sorted indices of the points to keep. All indices are returned if there are no more than ``max_points`` values.
+    """
+    check_max_points(max_points)
+    num_values = len(values)
+    if num_values <= max_points:
+        return np.arange(num_values)
+    # leave room for the first and last points
+    num_buckets = (max_points - 2) // 2
+    bucket_size = -(-num_values // num_buckets)
+    num_buckets = -(-num_values // bucket_size)
+    padded_values = np.full(num_buckets * bucket_size, np.nan, dtype=np.float64)
+    padded_values[:num_values] = values
+    buckets = padded_values.reshape(num_buckets, bucket_size)
+    # NaN (including the padding at the end of the last bucket) is never the smallest or largest value
+    is_nan = np.isnan(buckets)
+    bucket_starts = np.arange(num_buckets) * bucket_size
+    min_indices = bucket_starts + np.argmin(np.where(is_nan, np.inf, buckets), axis=1)
+    max_indices = bucket_starts + np.argmax(np.where(is_nan, -np.inf, buckets), axis=1)
+    kept_indices: NDArray[(1, Any), int] = np.unique(
+        np.concatenate(([0, num_values - 1], min_indices, max_indices))
+    )
+    return kept_indices
@@ -42,10 +42,15 @@ CONTINUOUS_WAVEFORM_SHEET_NAME = "continuous-waveforms"
 AGGREGATE_METRICS_SHEET_NAME = "aggregate-metrics"
 PER_TWITCH_METRICS_SHEET_NAME = "per-twitch-metrics"
 NUMBER_OF_PER_TWITCH_METRICS = 18
+PER_TWITCH_TIMEPOINT_COLUMN_NAME = "Timepoint of Twitch Contraction"
 SNAPSHOT_CHART_SHEET_NAME = "continuous-waveform-snapshots"
 FULL_CHART_SHEET_NAME = "full-continuous-waveform-plots"
 TWITCH_FREQUENCIES_CHART_SHEET_NAME = "twitch-frequencies-plots"
 FORCE_FREQUENCY_RELATIONSHIP_SHEET = "force-frequency-relationship"
+CHART_DATA_SHEET_NAME = "chart-data"
+PEAKS_AND_VALLEYS_TABLE_NAME = "peaks-and-valleys"
+H5_RESULTS_FILE_FORMAT_VERSION = "0.1.0"
+H5_RESULTS_CHUNK_NUM_SAMPLES = 6000
 
 INTERPOLATED_DATA_PERIOD_SECONDS = 1 / 100
 INTERPOLATED_DATA_PERIOD_CMS = (
@@ -70,6 +75,8 @@ CHART_WINDOW_NUM_DATA_POINTS = (
     CHART_WINDOW_NUM_SECONDS / INTERPOLATED_DATA_PERIOD_SECONDS
 )
 SECONDS_PER_CELL = 2.5
+DEFAULT_CHART_MAX_POINTS = 5000
+CHART_DATA_COLUMNS_PER_WELL = 8
 
 CALCULATED_METRIC_DISPLAY_NAMES: Dict[
     uuid.UUID, Union[str, Tuple[int, str]]
@@ -82,6 +89,7 @@ CALCULATED_METRIC_DISPLAY_NAMES: Dict[
         (AUC_UUID, "Twitch Area Under the Curve (AUC)"),
     ]
 )
+AGGREGATE_STATISTIC_NAMES = ("Mean", "StDev", "CoV", "SEM")
 ALL_FORMATS = immutabledict({"CoV": {"num_format": "0.00%"}})
 
 TWITCHES_POINT_UP_UUID = uuid.UUID("97f69f56-f1c6-4c50-8590-7332570ed3c5")
@@ -102,3 +110,16 @@ EXCEL_OPTICAL_METADATA_CELLS = {
     MANTARRAY_SERIAL_NUMBER_UUID: "E7",
     INTERPOLATION_VALUE_UUID: "E8",
 }
+# Delimited text optical files start with a "label,value" row for each metadata value, in the same order as the cells of the excel template, followed by a row of column headers and then the time and displacement columns
+CSV_OPTICAL_METADATA_ROWS = {
+    WELL_NAME_UUID: 0,
+    UTC_BEGINNING_RECORDING_UUID: 1,
+    PLATE_BARCODE_UUID: 2,
+    TISSUE_SAMPLING_PERIOD_UUID: 3,
+    TWITCHES_POINT_UP_UUID: 4,
+    MANTARRAY_SERIAL_NUMBER_UUID: 5,
+    INTERPOLATION_VALUE_UUID: 6,
+}
+CSV_OPTICAL_DATA_START_ROW = 8
+
+DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES = 1024 * 1024 * 1024
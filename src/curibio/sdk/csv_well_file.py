@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""Classes and functions for reading delimited text files of optical data."""
+from __future__ import annotations
+
+from contextlib import contextmanager
+import csv
+import datetime
+import io
+import itertools
+import os
+from typing import Any
+from typing import Dict
+from typing import IO
+from typing import Iterator
+from typing import Optional
+from typing import Union
+from uuid import UUID
+
+from mantarray_file_manager import UTC_BEGINNING_RECORDING_UUID
+from nptyping import NDArray
+import numpy as np
+
+from .constants import CSV_OPTICAL_DATA_START_ROW
+from .constants import CSV_OPTICAL_METADATA_ROWS
+from .excel_well_file import ExcelWellFile
+from .excel_well_file import OPTICAL_BEGIN_RECORDING_FORMAT
+
+TSV_FILE_EXTENSION = ".tsv"
+# the template asks for YYYY-MM-DD HH:MM, and excel adds the seconds itself
+CSV_BEGIN_RECORDING_FORMATS = (OPTICAL_BEGIN_RECORDING_FORMAT, "%Y-%m-%d %H:%M")
+TEXT_ENCODING = "utf-8-sig"  # spreadsheet programs often start exported files with a byte order mark
+
+
+@contextmanager
+def _open_as_text(source: Union[str, IO[bytes]]) -> Iterator[IO[str]]:
+    if isinstance(source, str):
+        with open(source, "r", encoding=TEXT_ENCODING, newline="") as text_file:
+            yield text_file
+        return
+    source.seek(0)
+    text_file = io.TextIOWrapper(source, encoding=TEXT_ENCODING, newline="")
+    try:
+        yield text_file
+    finally:
+        text_file.detach()  # leave the binary file open so it can be read again
+
+
+def _normalize_begin_recording(begin_recording: str) -> str:
+    """Write the recording start time the way the excel template stores it.
+
+    Values in none of the CSV_BEGIN_RECORDING_FORMATS are returned
+    unchanged, so that the error raised when parsing the metadata shows
+    the value as it was entered.
+    """
+    for begin_recording_format in CSV_BEGIN_RECORDING_FORMATS:
+        try:
+            parsed = datetime.datetime.strptime(begin_recording, begin_recording_format)
+        except ValueError:
+            continue
+        return parsed.strftime(OPTICAL_BEGIN_RECORDING_FORMAT)
+    return begin_recording
+
+
+def _get_csv_metadata_values(
+    source: Union[str, IO[bytes]], delimiter: str
+) -> Dict[UUID, Optional[str]]:
+    num_metadata_rows = max(CSV_OPTICAL_METADATA_ROWS.values()) + 1
+    with _open_as_text(source) as text_file:
+        rows = list(
+            itertools.islice(
+                csv.reader(text_file, delimiter=delimiter), num_metadata_rows
+            )
+        )
+    metadata_values: Dict[UUID, Optional[str]] = dict()
+    for metadata_uuid, row_idx in CSV_OPTICAL_METADATA_ROWS.items():
+        value = (
+            rows[row_idx][1].strip()
+            if row_idx < len(rows) and len(rows[row_idx]) > 1
+            else ""
+        )
+        metadata_values[metadata_uuid] = value if value else None
+    begin_recording = metadata_values[UTC_BEGINNING_RECORDING_UUID]
+    if begin_recording is not None:
+        metadata_values[UTC_BEGINNING_RECORDING_UUID] = _normalize_begin_recording(
+            begin_recording
+        )
+    return metadata_values
+
+
+def _get_csv_tissue_columns(
+    source: Union[str, IO[bytes]], delimiter: str
+) -> NDArray[(2, Any), float]:
+    with _open_as_text(source) as text_file:
+        for _ in range(CSV_OPTICAL_DATA_START_ROW):
+            text_file.readline()
+        data_text = text_file.read()
+    # parsing every value at once is much faster than parsing the rows one at a time
+    values = np.array(data_text.replace(delimiter, " ").split(), dtype=np.float64)
+    return np.ascontiguousarray(values.reshape(-1, 2).T)
+
+
+class CsvWellFile(ExcelWellFile):
+    """Wrapper around a delimited text file for a single well of optical data.
+
+    The file starts with a ``label,value`` row for each metadata value, in
+    the order given by ``CSV_OPTICAL_METADATA_ROWS`` (the same order as the
+    cells of the excel template). The recording start time is given as
+    ``YYYY-MM-DD HH:MM`` or ``YYYY-MM-DD HH:MM:SS``. The metadata rows are
+    followed by a row of column headers, and then the time (in seconds)
+    and displacement columns. Files ending in ``.tsv`` are tab-delimited,
+    and all others are comma-delimited.
+
+    Takes the same arguments as ExcelWellFile.
+    """
+
+    def _get_delimiter(self) -> str:
+        return (
+            "\t"
+            if os.path.splitext(self._file_name)[1].lower() == TSV_FILE_EXTENSION
+            else ","
+        )
+
+    def get_h5_file(self) -> None:
+        raise NotImplementedError("CsvWellFiles do not store an H5 file")
+
+    def get_h5_attribute(self, attr_name: str) -> Any:
+        raise NotImplementedError(
+            "CsvWellFiles do not store an H5 file and therefore cannot get H5 attributes"
+        )
+
+    def _read_metadata_values(self) -> Dict[UUID, Optional[str]]:
+        return _get_csv_metadata_values(self._get_file_source(), self._get_delimiter())
+
+    def _read_raw_tissue_reading(self) -> NDArray[(2, Any), float]:
+        return _get_csv_tissue_columns(self._get_file_source(), self._get_delimiter())
@@ -1,11 +1,20 @@
 # -*- coding: utf-8 -*-
 """Classes and functions for finding and managing excel files."""
+from __future__ import annotations
+
+from dataclasses import dataclass
 import datetime
 from typing import Any
+from typing import Dict
+from typing import IO
+from typing import List
+from typing import Mapping
+from typing import NoReturn
 from typing import Optional
+from typing import Union
 from uuid import UUID
 
-from labware_domain_models import LabwareDefinition
+from immutabledict import immutabledict
 from mantarray_file_manager import CURI_BIO_ACCOUNT_UUID
 from mantarray_file_manager import CURI_BIO_USER_ACCOUNT_ID
 from mantarray_file_manager import MANTARRAY_SERIAL_NUMBER_UUID
@@ -24,11 +33,166 @@ from xlsxwriter.utility import xl_cell_to_rowcol
 from .constants import EXCEL_OPTICAL_METADATA_CELLS
 from .constants import INTERPOLATION_VALUE_UUID
 from .constants import METADATA_UUID_DESCRIPTIONS
+from .constants import TWENTY_FOUR_WELL_PLATE
 from .constants import TWITCHES_POINT_UP_UUID
 from .exceptions import MetadataNotFoundError
+from .sidecar_cache import load_sidecar
+from .sidecar_cache import write_sidecar
 
 PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
 
+OPTICAL_BEGIN_RECORDING_FORMAT = "%Y-%m-%d %H:%M:%S"
+
+METADATA_CELL_ROWS_AND_COLUMNS = immutabledict(
+    {
+        metadata_uuid: xl_cell_to_rowcol(cell_name)
+        for metadata_uuid, cell_name in EXCEL_OPTICAL_METADATA_CELLS.items()
+    }
+)
+
+
+def _raise_metadata_not_found(metadata_uuid: UUID) -> NoReturn:
+    raise MetadataNotFoundError(
+        f"Metadata entry not found for {METADATA_UUID_DESCRIPTIONS[metadata_uuid]}"
+    )
+
+
+def _parse_well_index(well_name: Optional[str]) -> Optional[int]:
+    if well_name is None:
+        return None
+    return int(TWENTY_FOUR_WELL_PLATE.get_well_index_from_well_name(well_name))
+
+
+def _parse_begin_recording(
+    begin_recording_str: Optional[str],
+) -> Optional[datetime.datetime]:
+    if begin_recording_str is None:
+        return None
+    try:
+        return datetime.datetime.strptime(
+            begin_recording_str, OPTICAL_BEGIN_RECORDING_FORMAT
+        )
+    except ValueError as e:
+        raise ValueError(
+            f"Unable to parse {METADATA_UUID_DESCRIPTIONS[UTC_BEGINNING_RECORDING_UUID]} '{begin_recording_str}', expected YYYY-MM-DD HH:MM:SS"
+        ) from e
+
+
+def _parse_sampling_period(
+    sampling_rate_str: Optional[str],
+) -> Optional[int]:
+    if sampling_rate_str is None:
+        return None
+    sampling_period_seconds = 1 / float(sampling_rate_str)
+    return int(round(sampling_period_seconds, 6) * 1e6)
+
+
+def _parse_interpolation_value(
+    interpolation_value_str: Optional[str],
+) -> Optional[float]:
+    if interpolation_value_str is None:
+        return None
+    return float(interpolation_value_str) * 1e6
+
+
+@dataclass(frozen=True)
+class OpticalWellMetadata:
+    """Immutable record of the metadata of a single optical well file.
+
+    Every value is parsed when the record is created, so a malformed cell
+    raises an error as soon as the metadata is read. The record holds no
+    reference to the workbook so it can be pickled.
+
+    Attributes:
+        raw_values: the user-entered value of each metadata cell as a string, or None if the cell is empty.
+        well_index: None if no well name was entered.
+        begin_recording: when the recording began, or None if no time was entered.
+        tissue_sampling_period_microseconds: None if no sampling rate was entered.
+        twitches_point_up: whether or not the twitches of the well point up.
+        interpolation_value_microseconds: None if no interpolation value was entered.
+    """
+
+    # pylint: disable=invalid-name # the names of the values in microseconds end with their unit, like WellFile.get_tissue_sampling_period_microseconds
+    raw_values: Mapping[UUID, Optional[str]]
+    well_index: Optional[int]
+    begin_recording: Optional[datetime.datetime]
+    tissue_sampling_period_microseconds: Optional[int]
+    twitches_point_up: bool
+    interpolation_value_microseconds: Optional[float]
+    # pylint: enable=invalid-name
+
+    @classmethod
+    def from_raw_values(
+        cls, raw_values: Mapping[UUID, Optional[str]]
+    ) -> "OpticalWellMetadata":
+        """Parse the raw cell values of the metadata block.
+
+        Raises:
+            ValueError: if a value can't be parsed, such as a recording start time not in the format YYYY-MM-DD HH:MM:SS.
+        """
+        all_raw_values: Mapping[UUID, Optional[str]] = immutabledict(
+            {
+                metadata_uuid: raw_values.get(metadata_uuid, None)
+                for metadata_uuid in EXCEL_OPTICAL_METADATA_CELLS
+            }
+        )
+        return cls(
+            raw_values=all_raw_values,
+            well_index=_parse_well_index(all_raw_values[WELL_NAME_UUID]),
+            begin_recording=_parse_begin_recording(
+                all_raw_values[UTC_BEGINNING_RECORDING_UUID]
+            ),
+            tissue_sampling_period_microseconds=_parse_sampling_period(
+                all_raw_values[TISSUE_SAMPLING_PERIOD_UUID]
+            ),
+            twitches_point_up="y"
+            in str(all_raw_values[TWITCHES_POINT_UP_UUID]).lower(),
+            interpolation_value_microseconds=_parse_interpolation_value(
+                all_raw_values[INTERPOLATION_VALUE_UUID]
+            ),
+        )
+
+    @property
+    def well_name(self) -> Optional[str]:
+        return self.raw_values[WELL_NAME_UUID]
+
+    @property
+    def plate_barcode(self) -> Optional[str]:
+        return self.raw_values[PLATE_BARCODE_UUID]
+
+    @property
+    def mantarray_serial_number(self) -> Optional[str]:
+        return self.raw_values[MANTARRAY_SERIAL_NUMBER_UUID]
+
+
+def _get_metadata_values(file_name: Union[str, IO[bytes]]) -> Dict[UUID, Optional[str]]:
+    """Read every metadata cell of the first sheet in a single pass."""
+    min_row = min(row for row, _ in METADATA_CELL_ROWS_AND_COLUMNS.values())
+    max_row = max(row for row, _ in METADATA_CELL_ROWS_AND_COLUMNS.values())
+    min_col = min(col for _, col in METADATA_CELL_ROWS_AND_COLUMNS.values())
+    max_col = max(col for _, col in METADATA_CELL_ROWS_AND_COLUMNS.values())
+    work_book = load_workbook(file_name, read_only=True)
+    try:
+        sheet = work_book[work_book.sheetnames[0]]
+        block = [
+            tuple(row) + (None,) * (max_col - min_col + 1)
+            for row in sheet.iter_rows(
+                min_row=min_row + 1,
+                max_row=max_row + 1,
+                min_col=min_col + 1,
+                max_col=max_col + 1,
+                values_only=True,
+            )
+        ]
+    finally:
+        work_book.close()
+    block += [(None,) * (max_col - min_col + 1)] * (max_row - min_row + 1 - len(block))
+    metadata_values: Dict[UUID, Optional[str]] = dict()
+    for metadata_uuid, (row, col) in METADATA_CELL_ROWS_AND_COLUMNS.items():
+        value = block[row - min_row][col - min_col]
+        metadata_values[metadata_uuid] = None if value is None else str(value)
+    return metadata_values
+
 
 def _get_col_as_array(
     sheet: Worksheet,
@@ -45,7 +209,37 @@ def _get_col_as_array(
     return np.array(col_array)
 
 
-def _get_single_sheet(file_name: str) -> Any:
+def _is_empty_cell_value(value: Any) -> bool:
+    return value is None or value == ""
+
+
+def _get_tissue_columns_in_bulk(
+    file_name: Union[str, IO[bytes]]
+) -> NDArray[(2, Any), float]:
+    """Stream the time and displacement columns in a single pass.
+
+    The workbook is opened in read-only mode so that rows are parsed
+    lazily from the sheet XML instead of building a cell object for
+    every value in the file. Reading stops at the first row with an
+    empty cell in either column.
+    """
+    work_book = load_workbook(file_name, read_only=True, data_only=True)
+    try:
+        sheet = work_book[work_book.sheetnames[0]]
+        times: List[float] = []
+        readings: List[float] = []
+        for row in sheet.iter_rows(min_row=2, max_col=2, values_only=True):
+            time_value, reading_value = (tuple(row) + (None, None))[:2]
+            if _is_empty_cell_value(time_value) or _is_empty_cell_value(reading_value):
+                break
+            times.append(float(time_value))
+            readings.append(float(reading_value))
+    finally:
+        work_book.close()
+    return np.array((times, readings), dtype=np.float64)
+
+
+def _get_single_sheet(file_name: Union[str, IO[bytes]]) -> Any:
     work_book = load_workbook(file_name)
     return work_book[work_book.sheetnames[0]]
 
@@ -66,35 +260,91 @@ class ExcelWellFile(WellFile):
 
     Args:
         file_name: The path of the excel file to open.
+        lazy: If True, only the path is recorded on construction. The
+            metadata is read the first time it is requested and the tissue
+            data is parsed the first time it is requested.
+        file_obj: An open binary file to read the workbook from instead of
+            the path, such as a member read out of a zip archive. The
+            file_name is still used to identify the well file.
+        cache_dir: If given, the parsed contents of the workbook are cached
+            in binary sidecar files in this directory, and later loads
+            memory-map the sidecar instead of parsing the workbook again.
+            Ignored if file_obj is given.
 
     Attributes:
-        _excel_sheet: The opened excel sheet.
+        _excel_sheet: The opened excel sheet, only loaded if the streaming reader fails.
+        _metadata: Snapshot of all metadata values, or None if not read yet.
+        _is_sidecar_checked: Whether or not a sidecar has been looked for yet.
     """
 
-    def __init__(self, file_name: str) -> None:
+    def __init__(
+        self,
+        file_name: str,
+        lazy: bool = False,
+        file_obj: Optional[IO[bytes]] = None,
+        cache_dir: Optional[str] = None,
+    ) -> None:
         # pylint: disable=super-init-not-called
-        self._excel_sheet = _get_single_sheet(file_name)
+        self._excel_sheet: Optional[Worksheet] = None
         self._file_name = file_name
+        self._file_obj = file_obj
         self._file_version = "0.1.1"
-        self._raw_tissue_reading: Optional[NDArray[(2, Any), int]] = None
-        self._raw_ref_reading: Optional[NDArray[(2, Any), int]] = np.zeros(
-            self.get_raw_tissue_reading().shape
-        )
+        self._raw_tissue_reading: Optional[NDArray[(2, Any), float]] = None
+        self._raw_ref_reading: Optional[NDArray[(2, Any), float]] = None
+        self._metadata: Optional[OpticalWellMetadata] = None
+        self._cache_dir = None if file_obj is not None else cache_dir
+        self._is_sidecar_checked = False
+        if not lazy:
+            self.get_metadata()
+            self.get_raw_tissue_reading()
+
+    def __getstate__(self) -> Dict[str, Any]:
+        state = self.__dict__.copy()
+        state["_excel_sheet"] = None  # the open workbook can't be pickled
+        if self._metadata is not None and self._raw_tissue_reading is not None:
+            # nothing else is read from the file, so don't send a copy of its contents along with the parsed data
+            state["_file_obj"] = None
+        return state
+
+    def _get_file_source(self) -> Union[str, IO[bytes]]:
+        return self._file_name if self._file_obj is None else self._file_obj
+
+    def _get_excel_sheet(self) -> Worksheet:
+        if self._excel_sheet is None:
+            self._excel_sheet = _get_single_sheet(self._get_file_source())
+        return self._excel_sheet
+
+    def _load_sidecar(self) -> None:
+        if self._cache_dir is None or self._is_sidecar_checked:
+            return
+        self._is_sidecar_checked = True
+        sidecar_contents = load_sidecar(self._file_name, self._cache_dir)
+        if sidecar_contents is None:
+            return
+        self._raw_tissue_reading, raw_values = sidecar_contents
+        self._metadata = OpticalWellMetadata.from_raw_values(raw_values)
+
+    def _read_metadata_values(self) -> Dict[UUID, Optional[str]]:
+        return _get_metadata_values(self._get_file_source())
+
+    def get_metadata(self) -> OpticalWellMetadata:
+        """Return the snapshot of all metadata values, reading it if needed."""
+        self._load_sidecar()
+        if self._metadata is None:
+            self._metadata = OpticalWellMetadata.from_raw_values(
+                self._read_metadata_values()
+            )
+        return self._metadata
 
     def get_excel_metadata_value(self, metadata_uuid: UUID) -> Optional[str]:
         """Return a user-entered metadata value."""
-        metadata_description = METADATA_UUID_DESCRIPTIONS[metadata_uuid]
-        cell_name = EXCEL_OPTICAL_METADATA_CELLS.get(metadata_uuid, None)
-        if cell_name is None:
+        if metadata_uuid not in EXCEL_OPTICAL_METADATA_CELLS:
             raise NotImplementedError(
-                f"Metadata value for {metadata_description} is not contained in excel files of well data"
+                f"Metadata value for {METADATA_UUID_DESCRIPTIONS[metadata_uuid]} is not contained in excel files of well data"
             )
-        row, col = xl_cell_to_rowcol(cell_name)
-        result = _get_cell_value(self._excel_sheet, row, col)
+        result = self.get_metadata().raw_values[metadata_uuid]
         if result is None and metadata_uuid != INTERPOLATION_VALUE_UUID:
-            raise MetadataNotFoundError(
-                f"Metadata entry not found for {metadata_description}"
-            )
+            _raise_metadata_not_found(metadata_uuid)
         return result
 
     def get_h5_file(self) -> None:
@@ -106,14 +356,22 @@ class ExcelWellFile(WellFile):
         )
 
     def get_well_name(self) -> str:
-        return str(self.get_excel_metadata_value(WELL_NAME_UUID))
+        well_name = self.get_metadata().well_name
+        if well_name is None:
+            _raise_metadata_not_found(WELL_NAME_UUID)
+        return well_name
 
     def get_well_index(self) -> int:
-        twenty_four_well = LabwareDefinition(row_count=4, column_count=6)
-        return int(twenty_four_well.get_well_index_from_well_name(self.get_well_name()))
+        well_index = self.get_metadata().well_index
+        if well_index is None:
+            _raise_metadata_not_found(WELL_NAME_UUID)
+        return well_index
 
     def get_plate_barcode(self) -> str:
-        return str(self.get_excel_metadata_value(PLATE_BARCODE_UUID))
+        plate_barcode = self.get_metadata().plate_barcode
+        if plate_barcode is None:
+            _raise_metadata_not_found(PLATE_BARCODE_UUID)
+        return plate_barcode
 
     def get_user_account(self) -> UUID:
         if not isinstance(CURI_BIO_USER_ACCOUNT_ID, UUID):
@@ -133,12 +391,16 @@ class ExcelWellFile(WellFile):
         return CURI_BIO_ACCOUNT_UUID
 
     def get_mantarray_serial_number(self) -> str:
-        return str(self.get_excel_metadata_value(MANTARRAY_SERIAL_NUMBER_UUID))
+        serial_number = self.get_metadata().mantarray_serial_number
+        if serial_number is None:
+            _raise_metadata_not_found(MANTARRAY_SERIAL_NUMBER_UUID)
+        return serial_number
 
     def get_begin_recording(self) -> datetime.datetime:
-        timestamp_str = str(self.get_excel_metadata_value(UTC_BEGINNING_RECORDING_UUID))
-        timestamp = datetime.datetime.strptime(timestamp_str, "%Y-%m-%d %H:%M:%S")
-        return timestamp
+        begin_recording = self.get_metadata().begin_recording
+        if begin_recording is None:
+            _raise_metadata_not_found(UTC_BEGINNING_RECORDING_UUID)
+        return begin_recording
 
     def get_timestamp_of_first_tissue_data_point(self) -> datetime.datetime:
         return self.get_begin_recording()
@@ -147,13 +409,10 @@ class ExcelWellFile(WellFile):
         return self.get_begin_recording()
 
     def get_tissue_sampling_period_microseconds(self) -> int:
-        value = self.get_excel_metadata_value(TISSUE_SAMPLING_PERIOD_UUID)
-        if value is None:
-            raise NotImplementedError(
-                "Tissue Sampling Period should never be None here. A MetadataNotFoundError should have been raised by get_excel_metadata_value"
-            )
-        sampling_period_seconds = 1 / float(value)
-        return int(round(sampling_period_seconds, 6) * 1e6)
+        sampling_period = self.get_metadata().tissue_sampling_period_microseconds
+        if sampling_period is None:
+            _raise_metadata_not_found(TISSUE_SAMPLING_PERIOD_UUID)
+        return sampling_period
 
     def get_reference_sampling_period_microseconds(self) -> int:
         return 0
@@ -162,23 +421,47 @@ class ExcelWellFile(WellFile):
         return 0
 
     def get_twitches_point_up(self) -> bool:
-        return "y" in str(self.get_excel_metadata_value(TWITCHES_POINT_UP_UUID)).lower()
+        return self.get_metadata().twitches_point_up
 
-    def get_raw_tissue_reading(self) -> NDArray[(2, Any), float]:
-        if self._raw_tissue_reading is None:
-            self._raw_tissue_reading = np.array(
+    def _read_raw_tissue_reading(self) -> NDArray[(2, Any), float]:
+        try:
+            return _get_tissue_columns_in_bulk(self._get_file_source())
+        except Exception:  # pylint: disable=broad-except # the cell-by-cell reader below is slower but tolerates workbooks that the streaming reader cannot parse
+            return np.array(
                 (
-                    _get_col_as_array(self._excel_sheet, 1, 0),
-                    _get_col_as_array(self._excel_sheet, 1, 1),
+                    _get_col_as_array(self._get_excel_sheet(), 1, 0),
+                    _get_col_as_array(self._get_excel_sheet(), 1, 1),
                 )
             )
+
+    def get_raw_tissue_reading(self) -> NDArray[(2, Any), float]:
+        self._load_sidecar()
+        if self._raw_tissue_reading is None:
+            self._raw_tissue_reading = self._read_raw_tissue_reading()
+            if self._cache_dir is not None:
+                write_sidecar(
+                    self._file_name,
+                    self._cache_dir,
+                    self._raw_tissue_reading,
+                    self.get_metadata().raw_values,
+                )
         return self._raw_tissue_reading
 
     def get_raw_reference_reading(self) -> NDArray[(2, Any), float]:
+        """Get an all-zero reference reading, since optical wells have none.
+
+        The array is a read-only view that broadcasts a single zero to
+        the shape of the tissue reading, so it does not allocate memory
+        proportional to the length of the recording.
+        """
+        if self._raw_ref_reading is None:
+            self._raw_ref_reading = np.broadcast_to(
+                np.float64(0), self.get_raw_tissue_reading().shape
+            )
         return self._raw_ref_reading
 
     def get_interpolation_value(self) -> float:
-        result = self.get_excel_metadata_value(INTERPOLATION_VALUE_UUID)
-        if result is None:
+        interpolation_value = self.get_metadata().interpolation_value_microseconds
+        if interpolation_value is None:
             return self.get_tissue_sampling_period_microseconds()
-        return float(result) * 1e6
+        return interpolation_value
@@ -1,6 +1,22 @@
 # -*- coding: utf-8 -*-
 """Docstring."""
+from typing import Dict
 
 
 class MetadataNotFoundError(Exception):
     pass
+
+
+class WellFileLoadingError(Exception):
+    """Raised when one or more well files of a recording could not be loaded.
+
+    Attributes:
+        errors: the exception raised by each file that failed, keyed by file path.
+    """
+
+    def __init__(self, errors: Dict[str, Exception]) -> None:
+        self.errors = errors
+        details = "\n".join(
+            f"{file_path}: {error!r}" for file_path, error in errors.items()
+        )
+        super().__init__(f"Unable to load {len(errors)} well file(s):\n{details}")
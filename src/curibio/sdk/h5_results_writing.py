@@ -0,0 +1,126 @@
+# -*- coding: utf-8 -*-
+"""Writing the analysis results of a plate to an HDF5 file.
+
+The file has this layout:
+
+- Attributes of the file: ``"File Format Version"``, ``"SDK Version"`` and the metadata of the recording, named by the string of its UUID in ``METADATA_UUID_DESCRIPTIONS`` (as in Mantarray H5 files). Times are written in ISO 8601 format.
+- ``well_indices`` and ``well_names``: the index and name of each well. The datasets with a row for each well are in this order.
+- ``resampled_times``: the times (in seconds) that the waveforms are resampled at.
+- ``resampled_waveforms``: a row of the resampled filtered data of each well, which is NaN outside the range of the well's data.
+- ``twitch_counts`` and ``aggregate_statistics``: the number of twitches and the statistics of each well from ``get_aggregate_statistics``. The names of the metrics and statistics are attributes of ``aggregate_statistics``.
+- ``wells/<well name>``: a group for each well, with ``filtered_data`` (a row of times in centimilliseconds and a row of values), ``peak_indices``, ``valley_indices``, and a dataset of each column of the well's per-twitch table in ``per_twitch_metrics`` (left empty if the metrics could not be computed). The group has ``"Well Index"`` and ``"Error Message"`` attributes.
+
+The waveforms are split into chunks of ``H5_RESULTS_CHUNK_NUM_SAMPLES``
+samples of a single well and compressed, so reading a window of time of a
+well only reads and decompresses the chunks that overlap it.
+"""
+from __future__ import annotations
+
+import datetime
+from typing import Any
+from typing import Mapping
+from typing import Optional
+import uuid
+
+import h5py
+from labware_domain_models import LabwareDefinition
+from nptyping import NDArray
+import numpy as np
+
+from .constants import AGGREGATE_STATISTIC_NAMES
+from .constants import CALCULATED_METRIC_DISPLAY_NAMES
+from .constants import H5_RESULTS_CHUNK_NUM_SAMPLES
+from .constants import H5_RESULTS_FILE_FORMAT_VERSION
+from .constants import PACKAGE_VERSION
+from .plate_analysis import PlateAnalysisResult
+
+
+def _create_waveform_dataset(
+    group: h5py.Group,
+    name: str,
+    data: NDArray[(Any, Any), Any],
+    compression: Optional[str],
+) -> None:
+    """Create a dataset chunked along its last (time) axis."""
+    chunk_num_samples = max(1, min(data.shape[-1], H5_RESULTS_CHUNK_NUM_SAMPLES))
+    group.create_dataset(
+        name,
+        data=data,
+        chunks=(1,) * (data.ndim - 1) + (chunk_num_samples,),
+        compression=compression,
+        shuffle=compression is not None,
+    )
+
+
+def write_h5_results(
+    file_path: str,
+    analysis_result: PlateAnalysisResult,
+    metadata: Mapping[uuid.UUID, Any],
+    labware_definition: LabwareDefinition,
+    compression: Optional[str] = "gzip",
+) -> None:
+    """Write the analysis results of a plate to an HDF5 file.
+
+    Args:
+        file_path: the path of the file to create. An existing file is overwritten.
+        analysis_result: the results of all the wells of the plate.
+        metadata: the metadata of the recording, by UUID.
+        labware_definition: the layout of the plate, used to name the wells.
+        compression: the compression filter of the datasets ("gzip" or "lzf"), or None to not compress them.
+    """
+    well_names = [
+        labware_definition.get_well_name_from_well_index(well_index)
+        for well_index in analysis_result.well_indices
+    ]
+    with h5py.File(file_path, "w") as h5_file:
+        h5_file.attrs["File Format Version"] = H5_RESULTS_FILE_FORMAT_VERSION
+        h5_file.attrs["SDK Version"] = PACKAGE_VERSION
+        for metadata_uuid, value in metadata.items():
+            if isinstance(value, datetime.datetime):
+                value = value.isoformat()
+            h5_file.attrs[str(metadata_uuid)] = value
+
+        h5_file.create_dataset(
+            "well_indices", data=np.array(analysis_result.well_indices, dtype=np.int64)
+        )
+        h5_file.create_dataset("well_names", data=well_names, dtype=h5py.string_dtype())
+        _create_waveform_dataset(
+            h5_file, "resampled_times", analysis_result.resampled_times, compression
+        )
+        _create_waveform_dataset(
+            h5_file,
+            "resampled_waveforms",
+            np.ascontiguousarray(analysis_result.resampled_waveforms.T),
+            compression,
+        )
+        h5_file.create_dataset("twitch_counts", data=analysis_result.twitch_counts)
+        aggregate_statistics = h5_file.create_dataset(
+            "aggregate_statistics", data=analysis_result.aggregate_statistics
+        )
+        aggregate_statistics.attrs["Metric Names"] = [
+            metric_name[1] if isinstance(metric_name, tuple) else metric_name
+            for metric_name in CALCULATED_METRIC_DISPLAY_NAMES.values()
+        ]
+        aggregate_statistics.attrs["Statistic Names"] = list(AGGREGATE_STATISTIC_NAMES)
+
+        wells_group = h5_file.create_group("wells")
+        for well_position, well_name in enumerate(well_names):
+            well_result = analysis_result.well_results[well_position]
+            well_group = wells_group.create_group(well_name)
+            well_group.attrs["Well Index"] = well_result.well_index
+            well_group.attrs["Error Message"] = well_result.error_message or ""
+            _create_waveform_dataset(
+                well_group, "filtered_data", well_result.filtered_data, compression
+            )
+            for name, indices in zip(
+                ("peak_indices", "valley_indices"), well_result.peak_and_valley_indices
+            ):
+                well_group.create_dataset(
+                    name, data=np.asarray(indices, dtype=np.int64)
+                )
+            per_twitch_group = well_group.create_group("per_twitch_metrics")
+            per_twitch_table = analysis_result.per_twitch_tables[well_position]
+            if per_twitch_table is None:
+                continue
+            for column_name, values in per_twitch_table.items():
+                per_twitch_group.create_dataset(column_name, data=values)
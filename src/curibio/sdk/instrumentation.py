@@ -0,0 +1,206 @@
+# -*- coding: utf-8 -*-
+"""Timing and memory use of the stages of writing a file.
+
+A ``StageRecorder`` measures named stages, which may be nested and may be
+of a single well, with ``time.perf_counter``. If it traces memory, the
+outermost stage starts ``tracemalloc`` (unless it is already tracing) and
+each stage records the most memory allocated above what was allocated when
+it began. Tracing memory slows down the code being measured a lot, so the
+times of a recorder tracing memory should not be compared to those of one
+that isn't.
+
+``tracemalloc.reset_peak`` was added in Python 3.9. On earlier versions the
+traces are cleared at the start and end of each stage instead, so memory
+allocated before a stage and freed during it is not subtracted from what the
+stage allocated, and the traces of anything else using ``tracemalloc`` are
+lost.
+"""
+from contextlib import contextmanager
+from dataclasses import asdict
+from dataclasses import dataclass
+import json
+import time
+import tracemalloc
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import Iterator
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+
+@dataclass(frozen=True)
+class StageMeasurement:
+    """How long a stage took and how much memory it used.
+
+    Attributes:
+        name: the name of the stage.
+        well_index: the index on the plate of the well the stage is of, or None for stages of the whole plate.
+        depth: the number of stages this stage is nested in.
+        start_seconds: when the stage began, in seconds since the outermost stage began.
+        duration_seconds: how long the stage took.
+        peak_memory_bytes: the most memory allocated during the stage, above what was allocated when it began, or None if memory was not traced.
+        memory_change_bytes: how much more memory was allocated when the stage ended than when it began, or None if memory was not traced.
+    """
+
+    name: str
+    well_index: Optional[int]
+    depth: int
+    start_seconds: float
+    duration_seconds: float
+    peak_memory_bytes: Optional[int]
+    memory_change_bytes: Optional[int]
+
+
+@dataclass(frozen=True)
+class StageReport:
+    """The measurements of all the stages, in the order they began."""
+
+    stages: Tuple[StageMeasurement, ...]
+    traced_memory: bool
+
+    def get_stages(
+        self, name: str, well_index: Optional[int] = None
+    ) -> List[StageMeasurement]:
+        """Get the measurements of a stage, optionally of a single well."""
+        return [
+            stage
+            for stage in self.stages
+            if stage.name == name
+            and (well_index is None or stage.well_index == well_index)
+        ]
+
+    def get_total_seconds(self, name: str) -> float:
+        """Get the total time of every measurement of a stage."""
+        return sum(stage.duration_seconds for stage in self.get_stages(name))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "traced_memory": self.traced_memory,
+            "stages": [asdict(stage) for stage in self.stages],
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """Get the report as JSON.
+
+        Any keyword arguments are passed to ``json.dumps``.
+        """
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def write_json(self, file_path: str) -> None:
+        with open(file_path, "w", encoding="utf-8") as json_file:
+            json_file.write(self.to_json(indent=2))
+
+
+@dataclass
+class _OpenStage:
+    position: int
+    name: str
+    well_index: Optional[int]
+    start_time: float
+    start_memory_bytes: int = 0
+    peak_memory_bytes: int = 0
+
+
+class StageRecorder:
+    """Measures the time (and optionally the memory use) of stages.
+
+    Args:
+        enabled: if False, stages are not measured, so that code can always be instrumented at no cost.
+        trace_memory: whether to trace the memory allocated during each stage with tracemalloc.
+    """
+
+    def __init__(self, enabled: bool = True, trace_memory: bool = False) -> None:
+        self._enabled = enabled
+        self._trace_memory = trace_memory
+        self._stopping_tracing = False
+        self._start_time = 0.0
+        self._open_stages: List[_OpenStage] = list()
+        self._stages: List[Optional[StageMeasurement]] = list()
+        self._reset_peak: Callable[[], None] = getattr(
+            tracemalloc, "reset_peak", self._clear_traces
+        )
+        # the memory that was traced when the traces were last cleared
+        self._cleared_memory_bytes = 0
+
+    @contextmanager
+    def measure(self, name: str, well_index: Optional[int] = None) -> Iterator[None]:
+        """Measure the stage run in the body of the with statement."""
+        if not self._enabled:
+            yield
+            return
+        self._begin_stage(name, well_index)
+        try:
+            yield
+        finally:
+            self._end_stage()
+
+    def _clear_traces(self) -> None:
+        current_bytes, _ = tracemalloc.get_traced_memory()
+        tracemalloc.clear_traces()
+        self._cleared_memory_bytes += current_bytes
+
+    def _get_traced_memory(self) -> Tuple[int, int]:
+        current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+        return (
+            current_bytes + self._cleared_memory_bytes,
+            peak_bytes + self._cleared_memory_bytes,
+        )
+
+    def _begin_stage(self, name: str, well_index: Optional[int]) -> None:
+        if not self._open_stages and self._trace_memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+                self._stopping_tracing = True
+            self._cleared_memory_bytes = 0
+        stage = _OpenStage(len(self._stages), name, well_index, time.perf_counter())
+        if not self._open_stages:
+            self._start_time = stage.start_time
+        if self._trace_memory:
+            current_bytes, peak_bytes = self._get_traced_memory()
+            if self._open_stages:
+                parent = self._open_stages[-1]
+                parent.peak_memory_bytes = max(parent.peak_memory_bytes, peak_bytes)
+            # the peak is reset at the start and end of each stage, so the peaks of enclosing stages are kept track of separately
+            self._reset_peak()
+            stage.start_memory_bytes = current_bytes
+            stage.peak_memory_bytes = current_bytes
+        self._open_stages.append(stage)
+        self._stages.append(None)
+
+    def _end_stage(self) -> None:
+        end_time = time.perf_counter()
+        stage = self._open_stages.pop()
+        peak_memory_bytes: Optional[int] = None
+        memory_change_bytes: Optional[int] = None
+        if self._trace_memory:
+            current_bytes, peak_bytes = self._get_traced_memory()
+            stage.peak_memory_bytes = max(stage.peak_memory_bytes, peak_bytes)
+            self._reset_peak()
+            if self._open_stages:
+                parent = self._open_stages[-1]
+                parent.peak_memory_bytes = max(
+                    parent.peak_memory_bytes, stage.peak_memory_bytes
+                )
+            peak_memory_bytes = stage.peak_memory_bytes - stage.start_memory_bytes
+            memory_change_bytes = current_bytes - stage.start_memory_bytes
+        self._stages[stage.position] = StageMeasurement(
+            name=stage.name,
+            well_index=stage.well_index,
+            depth=len(self._open_stages),
+            start_seconds=stage.start_time - self._start_time,
+            duration_seconds=end_time - stage.start_time,
+            peak_memory_bytes=peak_memory_bytes,
+            memory_change_bytes=memory_change_bytes,
+        )
+        if not self._open_stages and self._stopping_tracing:
+            tracemalloc.stop()
+            self._stopping_tracing = False
+
+    def get_report(self) -> StageReport:
+        """Get the measurements of the stages that have ended."""
+        return StageReport(
+            stages=tuple(stage for stage in self._stages if stage is not None),
+            traced_memory=self._trace_memory,
+        )
@@ -1,17 +1,49 @@
 # -*- coding: utf-8 -*-
-"""Small helper functions for the Jupyter Notebook."""
+"""Small helper functions for the Jupyter Notebook.
+
+The latest version of the SDK on PyPI is cached in a file in the user's
+cache directory (``$XDG_CACHE_HOME/curibio.sdk``, or
+``~/.cache/curibio.sdk``), so PyPI is asked at most once per
+``VERSION_CHECK_CACHE_TTL_SECONDS``. The cached version is only used by
+the version of the SDK that cached it, so it is checked again as soon as
+the SDK is upgraded. Setting the environment variable named by
+``OFFLINE_ENV_VAR`` (to anything other than ``0`` or an empty string)
+stops the version check from connecting to PyPI at all, for computers
+without internet access.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Optional
+
 import requests
 
 from .constants import PACKAGE_VERSION
 
+logger = logging.getLogger(__name__)
+
+PYPI_JSON_URL = "https://pypi.org/pypi/curibio.sdk/json"
+VERSION_CHECK_TIMEOUT_SECONDS = 3
+VERSION_CHECK_CACHE_TTL_SECONDS = 24 * 60 * 60
+VERSION_CHECK_CACHE_FILE_NAME = "latest-version.json"
+OFFLINE_ENV_VAR = "CURIBIO_SDK_OFFLINE"
+
 
-def get_latest_version_from_pypi() -> str:
+def get_latest_version_from_pypi(
+    timeout: float = VERSION_CHECK_TIMEOUT_SECONDS, url: str = PYPI_JSON_URL
+) -> str:
     """Get the latest version of this package from PyPI.
 
     Based on https://stackoverflow.com/questions/17069428/how-to-get-the-latest-version-number-of-a-package-on-pypi?noredirect=1&lq=1
+
+    Args:
+        timeout: the number of seconds to wait to connect to PyPI, and then for each read of the response.
+        url: the URL of the JSON description of the package.
     """
     response_json = requests.get(
-        "https://pypi.org/pypi/curibio.sdk/json"
+        url, timeout=timeout
     ).json()  # Eli (1/18/21): if the URL is invalid, then decoding the JSON raises an error, so no need to explicitly check for HTTP failure
     extracted_version = response_json["info"]["version"]
     if not isinstance(extracted_version, str):
@@ -21,14 +53,134 @@ def get_latest_version_from_pypi() -> str:
     return extracted_version
 
 
-def check_if_latest_version() -> None:
-    """Check to see if the version running locally is the latest from PyPi.
+def is_offline() -> bool:
+    """Whether the version check is not allowed to connect to PyPI."""
+    return os.environ.get(OFFLINE_ENV_VAR, "") not in ("", "0")
 
-    There appears to be possible edge cases if someone leaves a window
-    open where the Notebook won't update to the latest release.
+
+def get_version_cache_file_path() -> str:
+    """Get the path of the file caching the latest version from PyPI."""
+    cache_dir = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+        os.path.expanduser("~"), ".cache"
+    )
+    return os.path.join(cache_dir, "curibio.sdk", VERSION_CHECK_CACHE_FILE_NAME)
+
+
+def _load_cached_version(cache_file_path: str, ttl_seconds: float) -> Optional[str]:
+    """Load the cached latest version, if it is still valid.
+
+    That is, if this version of the SDK cached it within the TTL.
     """
-    latest_version = get_latest_version_from_pypi()
-    if latest_version != PACKAGE_VERSION:
+    try:
+        with open(cache_file_path, "r", encoding="utf-8") as cache_file:
+            cached = json.load(cache_file)
+        latest_version = cached["latest_version"]
+        installed_version = cached["installed_version"]
+        age_seconds = time.time() - float(cached["checked_at"])
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+    if not isinstance(latest_version, str) or not 0 <= age_seconds <= ttl_seconds:
+        return None
+    if installed_version != PACKAGE_VERSION:
+        return None
+    return latest_version
+
+
+def _store_cached_version(cache_file_path: str, latest_version: str) -> None:
+    """Cache the latest version, doing nothing if the file can't be written."""
+    temp_file_path = f"{cache_file_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        os.makedirs(os.path.dirname(cache_file_path), exist_ok=True)
+        with open(temp_file_path, "w", encoding="utf-8") as cache_file:
+            json.dump(
+                {
+                    "latest_version": latest_version,
+                    "installed_version": PACKAGE_VERSION,
+                    "checked_at": time.time(),
+                },
+                cache_file,
+            )
+        # replacing the file means concurrent checks never read a partially written one
+        os.replace(temp_file_path, cache_file_path)
+    except OSError:
+        msg = f"Could not cache the latest version in {cache_file_path}"
+        logger.debug(msg)
+        try:
+            os.remove(temp_file_path)
+        except OSError:  # the file was never created
+            pass
+
+
+def get_latest_version(
+    timeout: float = VERSION_CHECK_TIMEOUT_SECONDS,
+    ttl_seconds: float = VERSION_CHECK_CACHE_TTL_SECONDS,
+    url: str = PYPI_JSON_URL,
+) -> Optional[str]:
+    """Get the latest version of this package, from the cache if it's recent.
+
+    Args:
+        timeout: the number of seconds to wait for PyPI. See ``get_latest_version_from_pypi``.
+        ttl_seconds: how long (in seconds) a cached version is used for before PyPI is asked again.
+        url: the URL of the JSON description of the package.
+
+    Returns:
+        The latest version, or None if it isn't cached and PyPI can't be reached (or connecting to it is switched off by ``OFFLINE_ENV_VAR``).
+    """
+    cache_file_path = get_version_cache_file_path()
+    latest_version = _load_cached_version(cache_file_path, ttl_seconds)
+    if latest_version is not None or is_offline():
+        return latest_version
+    try:
+        latest_version = get_latest_version_from_pypi(timeout=timeout, url=url)
+    except (requests.RequestException, ValueError, KeyError, NotImplementedError):
+        msg = f"Could not get the latest version from {url}"
+        logger.debug(msg, exc_info=True)
+        return None
+    _store_cached_version(cache_file_path, latest_version)
+    return latest_version
+
+
+def _check_if_latest_version(timeout: float, ttl_seconds: float, url: str) -> None:
+    latest_version = get_latest_version(
+        timeout=timeout, ttl_seconds=ttl_seconds, url=url
+    )
+    if latest_version is not None and latest_version != PACKAGE_VERSION:
         print(  # allow-print
             f"WARNING! You are not running the latest version of the SDK. You are running {PACKAGE_VERSION}, but {latest_version} is available. It is strongly recommended to close this window and re-open a new Jupyter Notebook to ensure you are using the latest version."
         )
+
+
+def check_if_latest_version(
+    timeout: float = VERSION_CHECK_TIMEOUT_SECONDS,
+    ttl_seconds: float = VERSION_CHECK_CACHE_TTL_SECONDS,
+    background: bool = False,
+    url: str = PYPI_JSON_URL,
+) -> Optional[threading.Thread]:
+    """Check to see if the version running locally is the latest from PyPi.
+
+    There appears to be possible edge cases if someone leaves a window
+    open where the Notebook won't update to the latest release.
+
+    Nothing is printed if the latest version can't be found, so the check
+    never fails on computers without internet access.
+
+    Args:
+        timeout: the number of seconds to wait for PyPI. See ``get_latest_version_from_pypi``.
+        ttl_seconds: how long (in seconds) a cached version is used for before PyPI is asked again.
+        background: whether to check in a daemon thread, which is returned instead of waiting for the check to finish.
+        url: the URL of the JSON description of the package.
+
+    Returns:
+        The thread checking the version if ``background`` is True, otherwise None.
+    """
+    if not background:
+        _check_if_latest_version(timeout, ttl_seconds, url)
+        return None
+    thread = threading.Thread(
+        target=_check_if_latest_version,
+        args=(timeout, ttl_seconds, url),
+        name="curibio-sdk-version-check",
+        daemon=True,
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,302 @@
+# -*- coding: utf-8 -*-
+"""Columnar tables of the analysis results of a plate.
+
+Each table has a row per data point (or per twitch, event or metric) of
+each well, along with the plate barcode, the time the recording began and
+the name of the well, so that the tables of many recordings can be
+combined. Columns are built directly from the arrays of a
+``PlateAnalysisResult``, without converting each value to a Python object.
+
+pyarrow is an optional dependency, installed with the ``parquet`` extra
+(``pip install curibio.sdk[parquet]``).
+"""
+from __future__ import annotations
+
+import datetime
+import os
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Sequence
+
+from labware_domain_models import LabwareDefinition
+from mantarray_waveform_analysis import CENTIMILLISECONDS_PER_SECOND
+from nptyping import NDArray
+import numpy as np
+
+from .constants import AGGREGATE_METRICS_SHEET_NAME
+from .constants import AGGREGATE_STATISTIC_NAMES
+from .constants import CALCULATED_METRIC_DISPLAY_NAMES
+from .constants import CONTINUOUS_WAVEFORM_SHEET_NAME
+from .constants import PEAKS_AND_VALLEYS_TABLE_NAME
+from .constants import PER_TWITCH_METRICS_SHEET_NAME
+from .constants import PER_TWITCH_TIMEPOINT_COLUMN_NAME
+from .plate_analysis import PlateAnalysisResult
+
+
+def import_pyarrow() -> None:
+    """Import pyarrow, and its parquet module, to check they are installed.
+
+    Raises:
+        ImportError: if pyarrow is not installed.
+    """
+    try:
+        import pyarrow.parquet  # noqa: F401 # pylint: disable=import-outside-toplevel,unused-import # pyarrow is an optional dependency, imported where it is used
+    except ImportError as e:
+        raise ImportError(
+            "pyarrow is required to write parquet files. Install it with: pip install curibio.sdk[parquet]"
+        ) from e
+
+
+def _get_plate_columns(
+    plate_barcode: str,
+    begin_recording: datetime.datetime,
+    well_names: Sequence[str],
+    rows_per_well: Sequence[int],
+) -> Dict[str, Any]:
+    """Get the columns identifying the recording and the well of each row.
+
+    The rows of each well are assumed to be together, in the order of
+    the well names.
+    """
+    import pyarrow  # pylint: disable=import-outside-toplevel # pyarrow is an optional dependency, checked by import_pyarrow
+
+    num_rows = int(np.sum(rows_per_well, dtype=np.int64))
+    return {
+        "Plate Barcode": pyarrow.repeat(plate_barcode, num_rows).dictionary_encode(),
+        "Recording Start Time (UTC)": pyarrow.repeat(
+            pyarrow.scalar(begin_recording, type=pyarrow.timestamp("us", tz="UTC")),
+            num_rows,
+        ),
+        "Well Name": pyarrow.DictionaryArray.from_arrays(
+            np.repeat(np.arange(len(well_names), dtype=np.int32), rows_per_well),
+            pyarrow.array(well_names, type=pyarrow.string()),
+        ),
+    }
+
+
+def _get_waveforms_table(
+    analysis_result: PlateAnalysisResult,
+    plate_columns: Dict[str, Any],
+) -> Any:
+    import pyarrow  # pylint: disable=import-outside-toplevel # pyarrow is an optional dependency, checked by import_pyarrow
+
+    well_slices = [
+        slice(*bounds) for bounds in analysis_result.resampling_bounds
+    ]  # only the times in the range of each well's data
+    return pyarrow.table(
+        {
+            **plate_columns,
+            "Time (seconds)": np.concatenate(
+                [
+                    analysis_result.resampled_times[well_slice]
+                    for well_slice in well_slices
+                ]
+            ),
+            "Waveform": np.concatenate(
+                [
+                    analysis_result.resampled_waveforms[well_slice, well_position]
+                    for well_position, well_slice in enumerate(well_slices)
+                ]
+            ),
+        }
+    )
+
+
+def _get_peaks_and_valleys_table(
+    analysis_result: PlateAnalysisResult,
+    plate_columns: Dict[str, Any],
+) -> Any:
+    import pyarrow  # pylint: disable=import-outside-toplevel # pyarrow is an optional dependency, checked by import_pyarrow
+
+    event_types: List[NDArray[(1, Any), np.int8]] = list()
+    event_indices: List[NDArray[(1, Any), int]] = list()
+    for peak_indices, valley_indices in analysis_result.peak_and_valley_indices:
+        indices = np.concatenate(
+            (
+                np.asarray(peak_indices, dtype=np.int64),
+                np.asarray(valley_indices, dtype=np.int64),
+            )
+        )
+        types = np.repeat(
+            np.array([0, 1], dtype=np.int8), (len(peak_indices), len(valley_indices))
+        )
+        # events in order of time, with peaks before valleys at the same index
+        order = np.lexsort((types, indices))
+        event_types.append(types[order])
+        event_indices.append(indices[order])
+    times = list()
+    values = list()
+    for well_result, indices in zip(analysis_result.well_results, event_indices):
+        times.append(
+            well_result.filtered_data[0][indices] / CENTIMILLISECONDS_PER_SECOND
+        )
+        values.append(well_result.filtered_data[1][indices].astype(np.float64))
+    return pyarrow.table(
+        {
+            **plate_columns,
+            "Event": pyarrow.DictionaryArray.from_arrays(
+                np.concatenate(event_types), pyarrow.array(["Peak", "Valley"])
+            ),
+            "Index": np.concatenate(event_indices),
+            "Time (seconds)": np.concatenate(times),
+            "Waveform": np.concatenate(values),
+        }
+    )
+
+
+def _get_per_twitch_metrics_table(
+    analysis_result: PlateAnalysisResult,
+    plate_columns: Dict[str, Any],
+) -> Any:
+    import pyarrow  # pylint: disable=import-outside-toplevel # pyarrow is an optional dependency, checked by import_pyarrow
+
+    column_names = [PER_TWITCH_TIMEPOINT_COLUMN_NAME] + [
+        metric_name[1] if isinstance(metric_name, tuple) else metric_name
+        for metric_name in CALCULATED_METRIC_DISPLAY_NAMES.values()
+    ]
+    tables = [table for table in analysis_result.per_twitch_tables if table is not None]
+    return pyarrow.table(
+        {
+            **plate_columns,
+            **{
+                column_name: np.concatenate(
+                    [table[column_name] for table in tables]
+                    or [np.empty(0, dtype=np.float64)]
+                )
+                for column_name in column_names
+            },
+        }
+    )
+
+
+def _get_aggregate_metrics_table(
+    analysis_result: PlateAnalysisResult,
+    plate_columns: Dict[str, Any],
+) -> Any:
+    import pyarrow  # pylint: disable=import-outside-toplevel # pyarrow is an optional dependency, checked by import_pyarrow
+
+    num_wells, num_metrics, _ = analysis_result.aggregate_statistics.shape
+    metric_names = [
+        metric_name[1] if isinstance(metric_name, tuple) else metric_name
+        for metric_name in CALCULATED_METRIC_DISPLAY_NAMES.values()
+    ]
+    # a row for each metric of each well
+    statistics = analysis_result.aggregate_statistics.reshape(
+        num_wells * num_metrics, len(AGGREGATE_STATISTIC_NAMES)
+    )
+    return pyarrow.table(
+        {
+            **plate_columns,
+            "Metric": pyarrow.DictionaryArray.from_arrays(
+                np.tile(np.arange(num_metrics, dtype=np.int32), num_wells),
+                pyarrow.array(metric_names),
+            ),
+            "n (twitches)": np.repeat(analysis_result.twitch_counts, num_metrics),
+            "Error Message": pyarrow.array(
+                np.repeat(
+                    np.array(analysis_result.error_messages, dtype=object), num_metrics
+                ),
+                type=pyarrow.string(),
+            ),
+            **{
+                statistic_name: statistics[:, statistic_idx]
+                for statistic_idx, statistic_name in enumerate(
+                    AGGREGATE_STATISTIC_NAMES
+                )
+            },
+        }
+    )
+
+
+def get_arrow_tables(
+    analysis_result: PlateAnalysisResult,
+    plate_barcode: str,
+    begin_recording: datetime.datetime,
+    labware_definition: LabwareDefinition,
+) -> Dict[str, Any]:
+    """Get the analysis results of a plate as Arrow tables.
+
+    Args:
+        analysis_result: the results of all the wells of the plate.
+        plate_barcode: the barcode of the plate.
+        begin_recording: when the recording began. Times without a time zone are assumed to be UTC.
+        labware_definition: the layout of the plate, used to name the wells.
+
+    Returns:
+        The tables by name: the resampled waveforms (``CONTINUOUS_WAVEFORM_SHEET_NAME``), the peaks and valleys (``PEAKS_AND_VALLEYS_TABLE_NAME``), the per-twitch metrics (``PER_TWITCH_METRICS_SHEET_NAME``) and the aggregate metrics (``AGGREGATE_METRICS_SHEET_NAME``).
+
+    Raises:
+        ImportError: if pyarrow is not installed.
+    """
+    import_pyarrow()
+    well_names = [
+        labware_definition.get_well_name_from_well_index(well_index)
+        for well_index in analysis_result.well_indices
+    ]
+
+    def get_plate_columns(rows_per_well: Sequence[int]) -> Dict[str, Any]:
+        return _get_plate_columns(
+            plate_barcode, begin_recording, well_names, rows_per_well
+        )
+
+    num_metrics = len(CALCULATED_METRIC_DISPLAY_NAMES)
+    return {
+        CONTINUOUS_WAVEFORM_SHEET_NAME: _get_waveforms_table(
+            analysis_result,
+            get_plate_columns(
+                [
+                    last_index - first_index
+                    for first_index, last_index in analysis_result.resampling_bounds
+                ]
+            ),
+        ),
+        PEAKS_AND_VALLEYS_TABLE_NAME: _get_peaks_and_valleys_table(
+            analysis_result,
+            get_plate_columns(
+                [
+                    len(peak_indices) + len(valley_indices)
+                    for peak_indices, valley_indices in analysis_result.peak_and_valley_indices
+                ]
+            ),
+        ),
+        PER_TWITCH_METRICS_SHEET_NAME: _get_per_twitch_metrics_table(
+            analysis_result,
+            get_plate_columns(analysis_result.twitch_counts),
+        ),
+        AGGREGATE_METRICS_SHEET_NAME: _get_aggregate_metrics_table(
+            analysis_result,
+            get_plate_columns([num_metrics] * len(well_names)),
+        ),
+    }
+
+
+def write_parquet_tables(
+    tables: Dict[str, Any],
+    file_dir: str,
+    file_name_prefix: str,
+    compression: str = "zstd",
+) -> List[str]:
+    """Write each table to a parquet file named after it.
+
+    Args:
+        tables: the tables by name, such as from ``get_arrow_tables``.
+        file_dir: the directory to write the files in.
+        file_name_prefix: the start of the name of each file, which is followed by two underscores and the name of the table.
+        compression: the compression codec of the columns, or "none".
+
+    Returns:
+        The path of each file written.
+
+    Raises:
+        ImportError: if pyarrow is not installed.
+    """
+    import_pyarrow()
+    import pyarrow.parquet  # pylint: disable=import-outside-toplevel # pyarrow is an optional dependency, checked by import_pyarrow
+
+    file_paths: List[str] = list()
+    for table_name, table in tables.items():
+        file_path = os.path.join(file_dir, f"{file_name_prefix}__{table_name}.parquet")
+        pyarrow.parquet.write_table(table, file_path, compression=compression)
+        file_paths.append(file_path)
+    return file_paths
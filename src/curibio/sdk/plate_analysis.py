@@ -0,0 +1,61 @@
+# -*- coding: utf-8 -*-
+"""The results of analyzing all the wells of a plate recording."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+
+from nptyping import NDArray
+
+from .well_analysis import WellAnalysisResult
+
+
+@dataclass(frozen=True)
+class PlateAnalysisResult:
+    """Everything computed from the data of the wells of a plate.
+
+    Instances only hold plain data, so they can be pickled and sent between
+    processes. Each attribute with a value for each well has them in the
+    order of ``well_indices``.
+
+    Attributes:
+        well_indices: the index on the plate of each well.
+        well_results: the analysis result of each well, which include the noise filtered data and the indices of the peaks and valleys in it.
+        resampled_times: the evenly spaced times (in seconds) that the filtered data of the wells is resampled at.
+        resampled_waveforms: a matrix with a row for each resampled time and a column of the resampled filtered data of each well, which is NaN outside the range of the well's data.
+        resampling_bounds: the first index and the index after the last of the resampled times in the range of each well's data.
+        per_twitch_tables: the metrics of each twitch of each well, as described in ``get_per_twitch_table``, or None for wells whose metrics could not be computed.
+        twitch_counts: the number of twitches of each well.
+        aggregate_statistics: the statistics of the per-twitch metrics of each well, as described in ``get_aggregate_statistics``.
+    """
+
+    well_indices: Tuple[int, ...]
+    well_results: List[WellAnalysisResult]
+    resampled_times: NDArray[(1, Any), float]
+    resampled_waveforms: NDArray[(Any, Any), float]
+    resampling_bounds: List[Tuple[int, int]]
+    per_twitch_tables: List[Optional[Dict[str, NDArray[(1, Any), float]]]]
+    twitch_counts: NDArray[(Any,), int]
+    aggregate_statistics: NDArray[(Any, Any, Any), float]
+
+    @property
+    def peak_and_valley_indices(
+        self,
+    ) -> List[Tuple[List[int], List[int]]]:
+        """Get the indices of the peaks and valleys of each well.
+
+        The indices are of the filtered data of the well.
+        """
+        return [result.peak_and_valley_indices for result in self.well_results]
+
+    @property
+    def error_messages(self) -> List[Optional[str]]:
+        """Get why the metrics of each well could not be computed.
+
+        None for each well whose metrics were computed.
+        """
+        return [result.error_message for result in self.well_results]
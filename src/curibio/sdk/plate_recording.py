@@ -1,15 +1,30 @@
 # -*- coding: utf-8 -*-
 """Docstring."""
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures import ThreadPoolExecutor
+import copy
+from dataclasses import dataclass
+from dataclasses import field
 import datetime
+import functools
+from glob import glob
+import io
 import logging
 import os
+import posixpath
 from typing import Any
+from typing import Callable
 from typing import Dict
+from typing import IO
+from typing import List
 from typing import Optional
 from typing import Tuple
+from typing import Type
+from typing import TYPE_CHECKING
 from typing import Union
 import uuid
-from uuid import UUID
 import zipfile
 
 from mantarray_file_manager import MAIN_FIRMWARE_VERSION_UUID
@@ -25,35 +40,34 @@ from mantarray_waveform_analysis import AMPLITUDE_UUID
 from mantarray_waveform_analysis import CENTIMILLISECONDS_PER_SECOND
 from mantarray_waveform_analysis import Pipeline
 from mantarray_waveform_analysis import PipelineTemplate
-from mantarray_waveform_analysis import TooFewPeaksDetectedError
 from mantarray_waveform_analysis import TWITCH_FREQUENCY_UUID
-from mantarray_waveform_analysis import TWITCH_PERIOD_UUID
-from mantarray_waveform_analysis import TwoPeaksInARowError
-from mantarray_waveform_analysis import TwoValleysInARowError
-from mantarray_waveform_analysis import WIDTH_UUID
-from mantarray_waveform_analysis import WIDTH_VALUE_UUID
-from mantarray_waveform_analysis.exceptions import PeakDetectionError
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
 from nptyping import NDArray
 import numpy as np
-from scipy import interpolate
-from stdlib_utils import configure_logging
 import xlsxwriter
 from xlsxwriter import Workbook
 from xlsxwriter.format import Format
 from xlsxwriter.utility import xl_col_to_name
 
+from .aggregate_statistics import get_aggregate_statistics
+from .analysis_cache import get_analysis_cache_key
+from .analysis_cache import load_cached_analysis
+from .analysis_cache import store_cached_analysis
+from .chart_data import get_min_max_decimation_indices
 from .constants import AGGREGATE_METRICS_SHEET_NAME
+from .constants import AGGREGATE_STATISTIC_NAMES
 from .constants import ALL_FORMATS
 from .constants import CALCULATED_METRIC_DISPLAY_NAMES
+from .constants import CHART_DATA_COLUMNS_PER_WELL
+from .constants import CHART_DATA_SHEET_NAME
 from .constants import CHART_FIXED_WIDTH
 from .constants import CHART_FIXED_WIDTH_CELLS
 from .constants import CHART_HEIGHT
 from .constants import CHART_HEIGHT_CELLS
 from .constants import CHART_WINDOW_NUM_SECONDS
 from .constants import CONTINUOUS_WAVEFORM_SHEET_NAME
+from .constants import DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES
 from .constants import DEFAULT_CELL_WIDTH
+from .constants import DEFAULT_CHART_MAX_POINTS
 from .constants import FORCE_FREQUENCY_RELATIONSHIP_SHEET
 from .constants import FULL_CHART_SHEET_NAME
 from .constants import INTERPOLATED_DATA_PERIOD_CMS
@@ -67,90 +81,439 @@ from .constants import NUMBER_OF_PER_TWITCH_METRICS
 from .constants import PACKAGE_VERSION
 from .constants import PEAK_VALLEY_COLUMN_START
 from .constants import PER_TWITCH_METRICS_SHEET_NAME
+from .constants import PER_TWITCH_TIMEPOINT_COLUMN_NAME
 from .constants import SECONDS_PER_CELL
 from .constants import SNAPSHOT_CHART_SHEET_NAME
 from .constants import TSP_TO_DEFAULT_FILTER_UUID
 from .constants import TWENTY_FOUR_WELL_PLATE
 from .constants import TWITCH_FREQUENCIES_CHART_SHEET_NAME
+from .csv_well_file import CsvWellFile
 from .excel_well_file import ExcelWellFile
+from .exceptions import WellFileLoadingError
+from .h5_results_writing import write_h5_results
+from .instrumentation import StageRecorder
+from .instrumentation import StageReport
+from .parquet_writing import get_arrow_tables
+from .parquet_writing import import_pyarrow
+from .parquet_writing import write_parquet_tables
+from .plate_analysis import PlateAnalysisResult
+from .resampling import interpolate_waveforms
+from .resampling import resample_waveforms
+from .well_analysis import analyze_raw_well_data
+from .well_analysis import analyze_well
+from .well_analysis import get_per_twitch_table
+from .well_analysis import WellAnalysisResult
+from .xlsx_writing import write_columns_by_row
+from .xlsx_writing import write_values_to_column
+from .xlsx_writing import write_values_to_row
+from .xlsx_writing import XlsxWritingOptions
+
+if TYPE_CHECKING:  # pragma: no cover
+    from matplotlib.figure import Figure
 
 logger = logging.getLogger(__name__)
-configure_logging(logging_format="notebook")
+
+OPTICAL_WELL_FILE_EXTENSIONS = (".xlsx", ".csv", ".tsv")
+
+
+class _ZipMemberWellFile(WellFile):
+    """An H5 well file read from an in-memory copy of a zip archive member."""
+
+    def __init__(self, file_name: str, file_obj: IO[bytes]) -> None:
+        super().__init__(file_obj)  # h5py can open file-like objects as well as paths
+        self._file_name = file_name
+
+
+def _open_h5_well_file(
+    file_name: str, file_obj: Optional[IO[bytes]] = None, read_data: bool = False
+) -> WellFile:
+    well_file = (
+        WellFile(file_name)
+        if file_obj is None
+        else _ZipMemberWellFile(file_name, file_obj)
+    )
+    if read_data:
+        well_file.get_raw_tissue_reading()
+        well_file.get_raw_reference_reading()
+    return well_file
+
+
+def _open_optical_well_file(
+    file_name: str,
+    file_obj: Optional[IO[bytes]] = None,
+    read_data: bool = False,
+    cache_dir: Optional[str] = None,
+) -> ExcelWellFile:
+    well_file_type = (
+        ExcelWellFile
+        if os.path.splitext(file_name)[1].lower() == ".xlsx"
+        else CsvWellFile
+    )
+    well_file = well_file_type(
+        file_name, lazy=True, file_obj=file_obj, cache_dir=cache_dir
+    )
+    well_file.get_metadata()  # surface unreadable files here so they are reported with the others
+    if read_data:
+        well_file.get_raw_tissue_reading()
+    return well_file
+
+
+def _get_well_index(well_file: WellFile) -> int:
+    well_index: int = well_file.get_well_index()
+    return well_index
+
+
+def _load_well_files(
+    well_files_to_load: Dict[str, Optional[IO[bytes]]],
+    open_well_file: Callable[..., WellFile],
+    max_workers: int,
+    executor_type: Union[Type[ProcessPoolExecutor], Type[ThreadPoolExecutor]],
+) -> List[WellFile]:
+    """Load the given well files, concurrently if more than one worker is used.
+
+    Args:
+        well_files_to_load: the name of each well file, mapped to an open binary file to read it from or None to read it from the path given by the name.
+        open_well_file: called with each name, file object and whether or not to read the data up front. Must be picklable if executor_type is a process pool.
+        max_workers: the number of files to load at once. If 1, files are loaded lazily one after another in this process.
+        executor_type: the kind of executor to load files with when max_workers is more than 1.
+
+    Returns:
+        The well files, ordered by well index.
+
+    Raises:
+        WellFileLoadingError: if any of the files failed to load, with the error of each one.
+    """
+    read_data = max_workers > 1
+    well_files: List[WellFile] = list()
+    errors: Dict[str, Exception] = dict()
+    if max_workers > 1:
+        with executor_type(max_workers=max_workers) as executor:
+            futures = {
+                file_name: executor.submit(
+                    open_well_file, file_name, file_obj, read_data=read_data
+                )
+                for file_name, file_obj in well_files_to_load.items()
+            }
+            for file_name, future in futures.items():
+                try:
+                    well_files.append(future.result())
+                except Exception as e:  # pylint: disable=broad-except # all errors are reported together below
+                    errors[file_name] = e
+    else:
+        for file_name, file_obj in well_files_to_load.items():
+            try:
+                well_files.append(
+                    open_well_file(file_name, file_obj, read_data=read_data)
+                )
+            except Exception as e:  # pylint: disable=broad-except # all errors are reported together below
+                errors[file_name] = e
+    if errors:
+        raise WellFileLoadingError(errors)
+    return sorted(well_files, key=_get_well_index)
+
+
+def _load_optical_well_files(
+    well_files_to_load: Dict[str, Optional[IO[bytes]]],
+    max_workers: int,
+    cache_dir: Optional[str] = None,
+) -> List[WellFile]:
+    # parsing the files is CPU-bound, so use separate processes to avoid the GIL
+    return _load_well_files(
+        well_files_to_load,
+        functools.partial(_open_optical_well_file, cache_dir=cache_dir),
+        max_workers,
+        ProcessPoolExecutor,
+    )
+
+
+def _load_h5_well_files(
+    well_files_to_load: Dict[str, Optional[IO[bytes]]], max_workers: int
+) -> List[WellFile]:
+    # reading H5 files is I/O-bound and open h5py files can't be pickled, so use threads
+    return _load_well_files(
+        well_files_to_load, _open_h5_well_file, max_workers, ThreadPoolExecutor
+    )
+
+
+def _get_per_twitch_metric_labels() -> List[str]:
+    labels: List[str] = list()
+    for iter_metric_name in CALCULATED_METRIC_DISPLAY_NAMES.values():
+        if isinstance(iter_metric_name, tuple):
+            _, iter_metric_name = iter_metric_name
+        labels.append(iter_metric_name)
+    return labels
 
 
 def _write_per_twitch_metric_labels(
     curr_sheet: xlsxwriter.worksheet.Worksheet,
     curr_row: int,
-) -> int:
-    for (
-        _,
-        iter_metric_name,
-    ) in CALCULATED_METRIC_DISPLAY_NAMES.items():
-        if isinstance(iter_metric_name, tuple):
-            _, iter_metric_name = iter_metric_name
-        curr_sheet.write(curr_row, 0, iter_metric_name)
-        curr_row += 1
-    return curr_row
+    error_message: Optional[str] = None,
+) -> None:
+    curr_sheet.write(curr_row, 0, PER_TWITCH_TIMEPOINT_COLUMN_NAME)
+    if error_message is not None:
+        curr_sheet.write(curr_row, 1, error_message)
+    write_values_to_column(curr_sheet, curr_row + 1, 0, _get_per_twitch_metric_labels())
 
 
 def _write_per_twitch_metric_values(
     curr_sheet: xlsxwriter.worksheet.Worksheet,
     curr_row: int,
-    per_twitch_dict: Dict[
-        int,
-        Dict[
-            UUID,
-            Union[
-                Dict[int, Dict[UUID, Union[Tuple[int, int], int]]],
-                Union[float, int],
-            ],
+    per_twitch_table: Dict[str, NDArray[(1, Any), float]],
+    nan_inf_policy: str = "blank",
+) -> None:
+    """Write the per-twitch metrics of a well along with their labels.
+
+    Each row is written completely before the next one, so that this
+    works in constant memory mode.
+    """
+    number_twitches = len(per_twitch_table[PER_TWITCH_TIMEPOINT_COLUMN_NAME])
+    write_values_to_row(
+        curr_sheet,
+        curr_row,
+        1,
+        [
+            f"Twitch {iter_twitch_index + 1}"
+            for iter_twitch_index in range(number_twitches)
         ],
-    ],
-    number_twitches: int,
-) -> int:
-    for iter_twitch_index in range(number_twitches):
-        curr_sheet.write(
-            curr_row, iter_twitch_index + 1, f"Twitch {iter_twitch_index + 1}"
-        )
+    )
+    for iter_metric_label, iter_metric_values in per_twitch_table.items():
+        curr_row += 1
+        curr_sheet.write(curr_row, 0, iter_metric_label)
+        write_values_to_row(curr_sheet, curr_row, 1, iter_metric_values, nan_inf_policy)
 
-    curr_row += 1
 
-    twitch_timepoints = list(per_twitch_dict)
+def _group_adjacent_wells(
+    values_by_well: Dict[int, Any]
+) -> List[Tuple[int, List[Any]]]:
+    """Group the values of wells with consecutive indices together.
 
-    for iter_twitch_index in range(number_twitches):
-        curr_sheet.write(
-            curr_row,
-            iter_twitch_index + 1,
-            twitch_timepoints[iter_twitch_index] / CENTIMILLISECONDS_PER_SECOND,
+    Returns:
+        The first well index and the values of each group, in order of well index.
+    """
+    groups: List[Tuple[int, List[Any]]] = list()
+    for well_index in sorted(values_by_well):
+        if groups and groups[-1][0] + len(groups[-1][1]) == well_index:
+            groups[-1][1].append(values_by_well[well_index])
+        else:
+            groups.append((well_index, [values_by_well[well_index]]))
+    return groups
+
+
+def _get_peak_detection_column(well_index: int, detector_type: str) -> int:
+    offset = 1 if detector_type == "Valley" else 0
+    return PEAK_VALLEY_COLUMN_START + (well_index * 2) + offset
+
+
+def _get_column_range(sheet_name: str, col: int, first_row: int, last_row: int) -> str:
+    """Get a reference to cells of a column.
+
+    The rows are one indexed, as in Excel.
+    """
+    col_name = xl_col_to_name(col)
+    return f"='{sheet_name}'!${col_name}${first_row}:${col_name}${last_row}"
+
+
+def _get_snapshot_window(recording_stop_time: int) -> Tuple[int, int]:
+    """Get the times (in seconds) shown by the snapshot chart of a well."""
+    if recording_stop_time <= CHART_WINDOW_NUM_SECONDS:
+        return 0, recording_stop_time
+    return (
+        int((recording_stop_time - CHART_WINDOW_NUM_SECONDS) // 2),
+        int((recording_stop_time + CHART_WINDOW_NUM_SECONDS) // 2),
+    )
+
+
+def _get_snapshot_window_indices(
+    times: NDArray[(1, Any), float], snapshot_window: Tuple[int, int]
+) -> Tuple[int, int]:
+    """Get the first and stop indices of the points shown by a snapshot chart.
+
+    The points just outside the window are included, so that the line
+    reaches the edges of the chart.
+    """
+    lower_time, upper_time = snapshot_window
+    window_start = max(int(np.searchsorted(times, lower_time, side="right")) - 1, 0)
+    window_stop = min(
+        int(np.searchsorted(times, upper_time, side="left")) + 1, len(times)
+    )
+    return window_start, window_stop
+
+
+def _get_chart_data_columns(
+    times: NDArray[(1, Any), float],
+    values: NDArray[(1, Any), float],
+    snapshot_indices: Tuple[int, int],
+    markers: Dict[
+        str,
+        Tuple[
+            NDArray[(1, Any), int], NDArray[(1, Any), float], NDArray[(1, Any), float]
+        ],
+    ],
+    max_points: int,
+) -> Dict[str, Tuple[NDArray[(1, Any), float], NDArray[(1, Any), float]]]:
+    """Get the downsampled data plotted by the charts of a well.
+
+    Only the waveforms with more than ``max_points`` points are
+    downsampled. The markers are only included with a downsampled full
+    waveform, so that its chart doesn't read the markers from the long
+    columns of the continuous-waveforms sheet.
+
+    Args:
+        times: the times (in seconds) of the interpolated waveform.
+        values: the values of the interpolated waveform.
+        snapshot_indices: the indices of the points shown by the snapshot chart, from ``_get_snapshot_window_indices``.
+        markers: the peak and valley markers, from ``_get_peak_detection_markers``.
+        max_points: the most points of the waveform to plot in each chart.
+
+    Returns:
+        The times and values of each downsampled series of the charts, by series name.
+    """
+    columns: Dict[
+        str, Tuple[NDArray[(1, Any), float], NDArray[(1, Any), float]]
+    ] = dict()
+    full_indices = get_min_max_decimation_indices(values, max_points)
+    if len(full_indices) < len(values):
+        columns["Full"] = (times[full_indices], values[full_indices])
+        for detector_type in ("Peak", "Valley"):
+            _, marker_times, marker_values = markers[detector_type]
+            columns[detector_type] = (marker_times, marker_values)
+    window_start, window_stop = snapshot_indices
+    window_indices = get_min_max_decimation_indices(
+        values[window_start:window_stop], max_points
+    )
+    if len(window_indices) < window_stop - window_start:
+        window_indices += window_start
+        columns["Snapshot"] = (times[window_indices], values[window_indices])
+    return columns
+
+
+def _add_chart_data(
+    chart_data_columns: Dict[int, NDArray[(1, Any), float]],
+    iter_well_idx: int,
+    well_index: int,
+    times: NDArray[(1, Any), float],
+    values: NDArray[(1, Any), float],
+    snapshot_window: Tuple[int, int],
+    markers: Dict[
+        str,
+        Tuple[
+            NDArray[(1, Any), int],
+            NDArray[(1, Any), float],
+            NDArray[(1, Any), float],
+        ],
+    ],
+    max_points: int,
+) -> Dict[str, Tuple[str, str]]:
+    """Add the downsampled data plotted by the charts of a well.
+
+    A snapshot chart that isn't downsampled plots the rows of its window
+    in the continuous-waveforms sheet.
+
+    Args:
+        chart_data_columns: the columns of the chart-data sheet by column index, which the columns of the well are added to.
+        iter_well_idx: the position of the well among the wells of the recording, which sets the columns of the well.
+        well_index: the index of the well in the plate.
+        times: the times (in seconds) of the interpolated waveform.
+        values: the values of the interpolated waveform.
+        snapshot_window: the times shown by the snapshot chart, from ``_get_snapshot_window``.
+        markers: the peak and valley markers, from ``_get_peak_detection_markers``.
+        max_points: the most points of the waveform to plot in each chart.
+
+    Returns:
+        The ranges plotted by the snapshot series and by each downsampled series of the charts.
+    """
+    first_col = iter_well_idx * CHART_DATA_COLUMNS_PER_WELL
+    window_start, window_stop = _get_snapshot_window_indices(times, snapshot_window)
+    columns = _get_chart_data_columns(
+        times, values, (window_start, window_stop), markers, max_points
+    )
+    series_ranges: Dict[str, Tuple[str, str]] = {
+        "Snapshot": (
+            _get_column_range(
+                CONTINUOUS_WAVEFORM_SHEET_NAME, 0, window_start + 2, window_stop + 1
+            ),
+            _get_column_range(
+                CONTINUOUS_WAVEFORM_SHEET_NAME,
+                well_index + 1,
+                window_start + 2,
+                window_stop + 1,
+            ),
         )
+    }
+    for col_offset, series_name in zip(
+        range(0, CHART_DATA_COLUMNS_PER_WELL, 2),
+        ("Full", "Snapshot", "Peak", "Valley"),
+    ):
+        if series_name not in columns:
+            continue
+        series_times, series_values = columns[series_name]
+        chart_data_columns[first_col + col_offset] = series_times
+        chart_data_columns[first_col + col_offset + 1] = series_values
+        # a range needs at least one cell, even if there are no peaks or valleys
+        last_row = max(len(series_times), 1) + 1
+        series_ranges[series_name] = (
+            _get_column_range(
+                CHART_DATA_SHEET_NAME, first_col + col_offset, 2, last_row
+            ),
+            _get_column_range(
+                CHART_DATA_SHEET_NAME, first_col + col_offset + 1, 2, last_row
+            ),
+        )
+    return series_ranges
 
-    curr_row += 1
-    for (
-        iter_metric_uuid,
-        iter_metric_name,
-    ) in CALCULATED_METRIC_DISPLAY_NAMES.items():
-        if isinstance(iter_metric_name, tuple):
-            iter_width_percent, iter_metric_name = iter_metric_name
-        for iter_twitch_index in range(number_twitches):
-            timepoint = twitch_timepoints[iter_twitch_index]
-            value_to_write = per_twitch_dict[timepoint][iter_metric_uuid]
-            if iter_metric_uuid == WIDTH_UUID:
-                if not isinstance(value_to_write, dict):
-                    raise NotImplementedError(
-                        f"The width value under key {WIDTH_VALUE_UUID} must be a dictionary."
-                    )
-                value_to_write = (
-                    value_to_write[iter_width_percent][WIDTH_VALUE_UUID]
-                    / CENTIMILLISECONDS_PER_SECOND
-                )
-            if iter_metric_uuid == TWITCH_PERIOD_UUID:
-                value_to_write /= CENTIMILLISECONDS_PER_SECOND
-            curr_sheet.write(curr_row, iter_twitch_index + 1, value_to_write)
 
-        curr_row += 1
+def _add_peak_detection_series(
+    waveform_chart: xlsxwriter.chart_scatter.ChartScatter,
+    detector_type: str,
+    categories: str,
+    values: str,
+) -> None:
+    label = "Relaxation" if detector_type == "Valley" else "Contraction"
+    marker_color = "#D95F02" if detector_type == "Valley" else "#7570B3"
+    waveform_chart.add_series(
+        {
+            "name": label,
+            "categories": categories,
+            "values": values,
+            "marker": {
+                "type": "circle",
+                "size": 8,
+                "border": {"color": marker_color, "width": 1.5},
+                "fill": {"none": True},
+            },
+            "line": {"none": True},
+        }
+    )
 
-    curr_row -= 7  # revert back to initial row (number of metrics + 1)
-    return curr_row
+
+def _get_full_resolution_series_ranges(
+    well_index: int, num_data_points: int
+) -> Dict[str, Tuple[str, str]]:
+    """Get the ranges of the continuous-waveforms sheet plotted for a well.
+
+    Each range is keyed by the chart series of the well that plots it.
+    """
+    time_range = _get_column_range(
+        CONTINUOUS_WAVEFORM_SHEET_NAME, 0, 2, num_data_points
+    )
+    waveform_range = (
+        time_range,
+        _get_column_range(
+            CONTINUOUS_WAVEFORM_SHEET_NAME, well_index + 1, 2, num_data_points
+        ),
+    )
+    series_ranges = {"Snapshot": waveform_range, "Full": waveform_range}
+    for detector_type in ("Peak", "Valley"):
+        series_ranges[detector_type] = (
+            time_range,
+            _get_column_range(
+                CONTINUOUS_WAVEFORM_SHEET_NAME,
+                _get_peak_detection_column(well_index, detector_type),
+                2,
+                num_data_points,
+            ),
+        )
+    return series_ranges
 
 
 def _write_xlsx_device_metadata(
@@ -236,6 +599,27 @@ def _write_xlsx_recording_metadata(
         )
 
 
+def _get_recording_metadata(first_well_file: WellFile) -> Dict[uuid.UUID, Any]:
+    """Get the metadata of a recording written to results files, by UUID."""
+    metadata: Dict[uuid.UUID, Any] = {
+        PLATE_BARCODE_UUID: first_well_file.get_plate_barcode(),
+        UTC_BEGINNING_RECORDING_UUID: first_well_file.get_begin_recording(),
+    }
+    if not isinstance(first_well_file, ExcelWellFile):
+        metadata[
+            MANTARRAY_SERIAL_NUMBER_UUID
+        ] = first_well_file.get_mantarray_serial_number()
+        for iter_metadata_uuid in (
+            SOFTWARE_RELEASE_VERSION_UUID,
+            SOFTWARE_BUILD_NUMBER_UUID,
+            MAIN_FIRMWARE_VERSION_UUID,
+        ):
+            metadata[iter_metadata_uuid] = first_well_file.get_h5_attribute(
+                str(iter_metadata_uuid)
+            )
+    return metadata
+
+
 def _write_xlsx_metadata(
     workbook: xlsxwriter.workbook.Workbook, first_well_file: WellFile
 ) -> None:
@@ -251,16 +635,43 @@ def _write_xlsx_metadata(
         curr_sheet.set_column(iter_column_idx, iter_column_idx, iter_column_width)
 
 
+@dataclass
+class _XlsxWritingContext:
+    """The options and state of writing a single XLSX file.
+
+    Attributes:
+        nan_inf_policy: how to write values that are NaN or infinite, as described in ``PlateRecording.write_xlsx``.
+        chart_max_points: the most points of each waveform to plot in each chart, or None to plot the full waveforms.
+        chart_data_columns: the columns of the chart-data sheet gathered while the charts are created, by column index.
+    """
+
+    nan_inf_policy: str = "blank"
+    chart_max_points: Optional[int] = DEFAULT_CHART_MAX_POINTS
+    chart_data_columns: Dict[int, NDArray[(1, Any), float]] = field(
+        default_factory=dict
+    )
+
+
 class PlateRecording(FileManagerPlateRecording):
-    """Manages aspects of analyzing a plate recording session."""
+    """Manages aspects of analyzing a plate recording session.
+
+    Args:
+        pipeline_template: how to analyze the wells. By default it is based on the sampling period of the recording.
+        analysis_cache_dir: a directory to cache the analysis results of each well in, so that wells with unchanged data and pipeline template are not analyzed again, even by a later PlateRecording.
+        analysis_cache_max_size_bytes: the total size the analysis cache directory is kept under by removing the least recently used results.
+    """
 
     def __init__(
         self,
         *args: Any,
         pipeline_template: Optional[PipelineTemplate] = None,
+        analysis_cache_dir: Optional[str] = None,
+        analysis_cache_max_size_bytes: int = DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES,
         **kwargs: Dict[str, Any],
     ) -> None:
         super().__init__(*args, **kwargs)
+        self._analysis_cache_dir = analysis_cache_dir
+        self._analysis_cache_max_size_bytes = analysis_cache_max_size_bytes
         self._is_optical_recording = isinstance(self._files[0], ExcelWellFile)
         self._workbook: xlsxwriter.workbook.Workbook
         self._workbook_formats: Dict[str, Format] = dict()
@@ -287,45 +698,128 @@ class PlateRecording(FileManagerPlateRecording):
             )
         self._pipeline_template = pipeline_template
         self._pipelines: Dict[int, Pipeline]
-        self._interpolated_data_period: float
+        # results are shared by all the sheet writers and only valid for the template they were computed with
+        self._well_analysis_results: Dict[int, WellAnalysisResult] = dict()
+        self._analyzed_pipeline_template = copy.copy(pipeline_template)
+        # replaced while writing a file, so that its stages are measured
+        self._stage_recorder = StageRecorder(enabled=False)
 
     @classmethod
-    def from_directory(cls, dir_to_load_files_from: str) -> "PlateRecording":
+    def from_directory(  # pylint: disable=arguments-differ # the extra options all have defaults, so calls matching the parent's signature still work
+        cls,
+        dir_to_load_files_from: str,
+        max_workers: int = 1,
+        cache_dir: Optional[str] = None,
+        analysis_cache_dir: Optional[str] = None,
+    ) -> "PlateRecording":
+        """Create a PlateRecording from all the well files in a directory.
+
+        Args:
+            dir_to_load_files_from: a directory of .h5 well files or optical (.xlsx, .csv or .tsv) well files, or one containing a single zip file of them.
+            max_workers: the number of well files to load at once. Optical files are parsed in separate processes and H5 files are read in separate threads. If 1, the data of each well file is only read when first needed, but if more than 1 the data of every well file is read up front and held in memory.
+            cache_dir: a directory (outside of dir_to_load_files_from) to cache the parsed contents of optical well files in, so that loading them again is much faster. Not used for H5 files or zipped recordings.
+            analysis_cache_dir: a directory to cache the analysis results of each well in. See PlateRecording.
+        """
         first_item = os.listdir(dir_to_load_files_from)[0]
         if first_item.endswith(".zip"):
-            path_to_zip_file = os.path.join(dir_to_load_files_from, first_item)
-            with zipfile.ZipFile(path_to_zip_file, "r") as zip_ref:
-                members = [
-                    member
-                    for member in zip_ref.namelist()
-                    if (member.endswith(".h5") or member.endswith(".xlsx"))
-                    and "__MACOSX" not in member
-                    # Tanner (10/1/20): "__MACOSX" is an artifact of zipping a file on MacOS that is not needed by the SDK. This is likely not a typical use case, but this prevents problems in case a user does zip their files on Mac
-                ]
-                path_sep = "/"  # Tanner (10/7/20): When zipfile unzips files, it always uses the unix style separator in the names of members
-                zip_contains_folder = all(path_sep in member for member in members)
-                zip_ref.extractall(dir_to_load_files_from, members=members)
-            if zip_contains_folder:
-                unzipped_dir_to_load_files_from = os.path.join(
-                    dir_to_load_files_from, os.path.dirname(members[0])
-                )
-                return cls.from_directory(unzipped_dir_to_load_files_from)
-            if members[0].endswith(".xlsx"):
-                optical_well_files = [
-                    ExcelWellFile(os.path.join(dir_to_load_files_from, member))
-                    for member in members
-                ]
-                return cls(optical_well_files)
-        if first_item.endswith(".xlsx"):
-            optical_well_files = [
-                ExcelWellFile(os.path.join(dir_to_load_files_from, item))
-                for item in os.listdir(dir_to_load_files_from)
-                if item.endswith(".xlsx")
+            return cls.from_zip(
+                os.path.join(dir_to_load_files_from, first_item),
+                max_workers=max_workers,
+                analysis_cache_dir=analysis_cache_dir,
+            )
+        file_extension = os.path.splitext(first_item)[1]
+        if file_extension in OPTICAL_WELL_FILE_EXTENSIONS:
+            return cls(
+                _load_optical_well_files(
+                    {
+                        os.path.join(dir_to_load_files_from, item): None
+                        for item in os.listdir(dir_to_load_files_from)
+                        if item.endswith(file_extension)
+                    },
+                    max_workers,
+                    cache_dir=cache_dir,
+                ),
+                analysis_cache_dir=analysis_cache_dir,
+            )
+        # same files as FileManagerPlateRecording.from_directory, which can't be called here because it opens them one at a time itself
+        return cls(
+            _load_h5_well_files(
+                {
+                    file_path: None
+                    for file_path in glob(os.path.join(dir_to_load_files_from, "*.h5"))
+                },
+                max_workers,
+            ),
+            analysis_cache_dir=analysis_cache_dir,
+        )
+
+    @classmethod
+    def from_zip(
+        cls,
+        zip_file: Union[str, IO[bytes]],
+        max_workers: int = 1,
+        analysis_cache_dir: Optional[str] = None,
+    ) -> "PlateRecording":
+        """Create a PlateRecording from a zip file of well files.
+
+        The well files are read straight from the archive into memory, so
+        nothing is extracted to disk. If every well file in the archive is
+        inside a folder, the well files in the folder of the first one are
+        loaded.
+
+        Args:
+            zip_file: the path of the zip file, or an open binary file of it.
+            max_workers: the number of well files to load at once. Optical files are parsed in separate processes and H5 files are read in separate threads. If 1, the data of each well file is only read when first needed, but if more than 1 the data of every well file is read up front and held in memory.
+            analysis_cache_dir: a directory to cache the analysis results of each well in. See PlateRecording.
+        """
+        with zipfile.ZipFile(zip_file, "r") as zip_ref:
+            members = [
+                member
+                for member in zip_ref.namelist()
+                if member.endswith((".h5",) + OPTICAL_WELL_FILE_EXTENSIONS)
+                and "__MACOSX" not in member
+                # Tanner (10/1/20): "__MACOSX" is an artifact of zipping a file on MacOS that is not needed by the SDK. This is likely not a typical use case, but this prevents problems in case a user does zip their files on Mac
             ]
-            return cls(optical_well_files)
-        return super().from_directory(dir_to_load_files_from)  # type: ignore # Tanner (10/1/20): Not sure why mypy doesn't see the super class method's return type
+            path_sep = "/"  # Tanner (10/7/20): When zipfile unzips files, it always uses the unix style separator in the names of members
+            zip_contains_folder = all(path_sep in member for member in members)
+            folder_to_load = (
+                posixpath.dirname(members[0]) if zip_contains_folder else ""
+            )
+            file_extension = os.path.splitext(members[0])[1]
+            well_files_to_load: Dict[str, Optional[IO[bytes]]] = {
+                member: io.BytesIO(zip_ref.read(member))
+                for member in members
+                if posixpath.dirname(member) == folder_to_load
+                and member.endswith(file_extension)
+            }
+        if file_extension in OPTICAL_WELL_FILE_EXTENSIONS:
+            return cls(
+                _load_optical_well_files(well_files_to_load, max_workers),
+                analysis_cache_dir=analysis_cache_dir,
+            )
+        return cls(
+            _load_h5_well_files(well_files_to_load, max_workers),
+            analysis_cache_dir=analysis_cache_dir,
+        )
+
+    def _discard_stale_analysis(self) -> None:
+        """Discard the pipelines and results if the pipeline template changed.
+
+        The template is compared to a copy of how it was when the
+        analysis was done, so changes made to the template object itself
+        are also detected.
+        """
+        if self.get_pipeline_template() == self._analyzed_pipeline_template:
+            return
+        self._well_analysis_results = dict()
+        try:
+            del self._pipelines
+        except AttributeError:
+            pass
+        self._analyzed_pipeline_template = copy.copy(self.get_pipeline_template())
 
     def _init_pipelines(self) -> None:
+        self._discard_stale_analysis()
         try:
             self._pipelines  # pylint:disable=pointless-statement # Eli (9/11/20): this will cause the attribute error to be raised if the pipelines haven't yet been initialized
             return
@@ -341,18 +835,237 @@ class PlateRecording(FileManagerPlateRecording):
             )
             msg = f"Loading tissue and reference data... {int(round(i / num_wells, 2) * 100)}% (Well {well_name}, {i + 1} out of {num_wells})"
             logger.info(msg)
-            raw_tissue_reading = well.get_raw_tissue_reading()
-            if self._is_optical_recording:
-                raw_tissue_reading[0] *= CENTIMILLISECONDS_PER_SECOND
-            iter_pipeline.load_raw_magnetic_data(
-                raw_tissue_reading,
+            with self._stage_recorder.measure("load_well_data", iter_well_idx):
+                iter_pipeline.load_raw_magnetic_data(
+                    self._get_raw_tissue_reading_for_pipeline(well),
+                    well.get_raw_reference_reading(),
+                )
+            self._pipelines[iter_well_idx] = iter_pipeline
+
+    def _get_raw_tissue_reading_for_pipeline(
+        self, well: WellFile
+    ) -> NDArray[(2, Any), float]:
+        raw_tissue_reading = well.get_raw_tissue_reading()
+        if self._is_optical_recording:
+            # the reading may be a read-only memory map, so convert the times on a copy
+            raw_tissue_reading = np.array(
+                (
+                    raw_tissue_reading[0] * CENTIMILLISECONDS_PER_SECOND,
+                    raw_tissue_reading[1],
+                )
+            )
+        return raw_tissue_reading
+
+    def _get_raw_readings_for_analysis(
+        self, well_idx: int
+    ) -> Tuple[NDArray[(2, Any), float], NDArray[(2, Any), float]]:
+        try:
+            pipeline = self._pipelines[well_idx]
+        except AttributeError:
+            well = self.get_well_by_index(well_idx)
+            return (
+                self._get_raw_tissue_reading_for_pipeline(well),
                 well.get_raw_reference_reading(),
             )
-            self._pipelines[iter_well_idx] = iter_pipeline
+        return (
+            pipeline.get_raw_tissue_magnetic_data(),
+            pipeline.get_raw_reference_magnetic_data(),
+        )
+
+    def _store_well_analysis_result(
+        self, result: WellAnalysisResult, cache_key: Optional[str]
+    ) -> None:
+        self._well_analysis_results[result.well_index] = result
+        if cache_key is not None and self._analysis_cache_dir is not None:
+            with self._stage_recorder.measure(
+                "store_cached_analysis", result.well_index
+            ):
+                store_cached_analysis(
+                    self._analysis_cache_dir,
+                    cache_key,
+                    result,
+                    self._analysis_cache_max_size_bytes,
+                )
+
+    def _analyze_wells(self, max_workers: int = 1) -> None:
+        """Analyze every well that hasn't been analyzed yet.
+
+        Wells with results in the analysis cache are loaded from it instead,
+        and the results of the other wells are added to it.
+
+        Args:
+            max_workers: the number of wells to analyze at once. If more than 1, each well is filtered, has its peaks detected and has its metrics computed in a separate process.
+        """
+        self._discard_stale_analysis()
+        if max_workers <= 1:
+            self._init_pipelines()
+        raw_readings: Dict[
+            int, Tuple[NDArray[(2, Any), float], NDArray[(2, Any), float]]
+        ] = dict()
+        cache_keys: Dict[int, Optional[str]] = dict()
+        for well_idx in self.get_well_indices():
+            if well_idx in self._well_analysis_results:
+                continue
+            raw_readings[well_idx] = self._get_raw_readings_for_analysis(well_idx)
+            cache_keys[well_idx] = None
+            if self._analysis_cache_dir is None:
+                continue
+            with self._stage_recorder.measure("load_cached_analysis", well_idx):
+                cache_key = get_analysis_cache_key(
+                    *raw_readings[well_idx], self.get_pipeline_template()
+                )
+                cached_result = load_cached_analysis(
+                    self._analysis_cache_dir, cache_key, well_idx
+                )
+            if cached_result is None:
+                cache_keys[well_idx] = cache_key
+                continue
+            self._well_analysis_results[well_idx] = cached_result
+            del raw_readings[well_idx]
+        if max_workers <= 1:
+            for well_idx in raw_readings:
+                self._store_well_analysis_result(
+                    analyze_well(
+                        well_idx, self._pipelines[well_idx], self._stage_recorder
+                    ),
+                    cache_keys[well_idx],
+                )
+            return
+        with ProcessPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                well_idx: executor.submit(
+                    analyze_raw_well_data,
+                    well_idx,
+                    self.get_pipeline_template(),
+                    raw_tissue,
+                    raw_reference,
+                )
+                for well_idx, (raw_tissue, raw_reference) in raw_readings.items()
+            }
+            for i, (well_idx, future) in enumerate(futures.items()):
+                self._store_well_analysis_result(future.result(), cache_keys[well_idx])
+                well_name = TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(
+                    well_idx
+                )
+                msg = f"Analyzed well {well_name} ({i + 1} out of {len(futures)})"
+                logger.info(msg)
+
+    def _get_well_analysis_result(self, well_idx: int) -> WellAnalysisResult:
+        self._discard_stale_analysis()
+        if well_idx not in self._well_analysis_results:
+            self._analyze_wells()
+        return self._well_analysis_results[well_idx]
+
+    def get_per_twitch_table(
+        self, well_idx: int
+    ) -> Optional[Dict[str, NDArray[(1, Any), float]]]:
+        """Get the metrics of each twitch of a well.
+
+        The well is analyzed if it hasn't been already.
+
+        Args:
+            well_idx: the index of the well on the plate.
+
+        Returns:
+            A column of values for the timepoint of the twitches and for each metric, as described in ``get_per_twitch_table``, or None if the metrics of the well could not be computed.
+        """
+        per_twitch_metrics = self._get_well_analysis_result(well_idx).per_twitch_metrics
+        if per_twitch_metrics is None:
+            return None
+        return get_per_twitch_table(per_twitch_metrics)
+
+    def get_aggregate_statistics(
+        self,
+    ) -> Tuple[NDArray[(Any,), int], NDArray[(Any, Any, Any), float]]:
+        """Get the statistics of the per-twitch metrics of every well.
+
+        The wells are analyzed if they haven't been already.
+
+        Returns:
+            The number of twitches and the statistics of each well, in the order of ``get_well_indices``, as described in ``get_aggregate_statistics``.
+        """
+        return get_aggregate_statistics(
+            [
+                self.get_per_twitch_table(well_idx)
+                for well_idx in self.get_well_indices()
+            ]
+        )
+
+    def _get_interpolated_data_period(self) -> float:
+        """Get the time between resampled data points, in centimilliseconds."""
+        if self._is_optical_recording:
+            return int(
+                self._files[0].get_interpolation_value()
+                / MICROSECONDS_PER_CENTIMILLISECOND
+            )
+        return float(INTERPOLATED_DATA_PERIOD_CMS)
+
+    def analyze(self, max_workers: int = 1) -> PlateAnalysisResult:
+        """Analyze every well and gather the results, without writing a file.
+
+        Wells that have already been analyzed (or whose results are in the
+        analysis cache) are not analyzed again.
+
+        Args:
+            max_workers: the number of wells to analyze at once. If more than 1, the wells are analyzed in separate processes.
+
+        Returns:
+            The results of all the wells, which ``write_xlsx`` can write without analyzing the wells again.
+        """
+        with self._stage_recorder.measure("analyze"):
+            return self._analyze(max_workers)
+
+    def _analyze(self, max_workers: int) -> PlateAnalysisResult:
+        self._analyze_wells(max_workers)
+        well_indices = self.get_well_indices()
+        well_results = [
+            self._get_well_analysis_result(well_index) for well_index in well_indices
+        ]
+        # resample up to the end of the longest data
+        interpolated_data_period = self._get_interpolated_data_period()
+        interpolated_data_indices = np.arange(
+            interpolated_data_period,  # don't start at time zero, because some wells don't have data at exactly zero (causing interpolation to fail), so just start at the next timepoint
+            max(result.last_raw_timepoint for result in well_results),
+            interpolated_data_period,
+        )
+        with self._stage_recorder.measure("resample"):
+            resampled_waveforms, resampling_bounds = resample_waveforms(
+                [result.filtered_data for result in well_results],
+                interpolated_data_indices,
+            )
+        with self._stage_recorder.measure("per_twitch_tables"):
+            per_twitch_tables = [
+                None
+                if result.per_twitch_metrics is None
+                else get_per_twitch_table(result.per_twitch_metrics)
+                for result in well_results
+            ]
+        with self._stage_recorder.measure("aggregate_statistics"):
+            twitch_counts, aggregate_statistics = get_aggregate_statistics(
+                per_twitch_tables
+            )
+        return PlateAnalysisResult(
+            well_indices=well_indices,
+            well_results=well_results,
+            resampled_times=interpolated_data_indices / CENTIMILLISECONDS_PER_SECOND,
+            resampled_waveforms=resampled_waveforms,
+            resampling_bounds=resampling_bounds,
+            per_twitch_tables=per_twitch_tables,
+            twitch_counts=twitch_counts,
+            aggregate_statistics=aggregate_statistics,
+        )
 
     def get_pipeline_template(self) -> PipelineTemplate:
         return self._pipeline_template
 
+    def set_pipeline_template(self, pipeline_template: PipelineTemplate) -> None:
+        """Change how the wells are analyzed.
+
+        Any wells already analyzed with a different template will be
+        analyzed again the next time their results are needed.
+        """
+        self._pipeline_template = pipeline_template
+
     def get_reference_magnetic_data(self, well_idx: int) -> NDArray[(2, Any), int]:
         self._init_pipelines()
         return self._pipelines[well_idx].get_raw_reference_magnetic_data()
@@ -360,6 +1073,8 @@ class PlateRecording(FileManagerPlateRecording):
     def create_stacked_plot(self) -> Figure:
         """Create a stacked plot of all wells in the recording."""
         # Note Eli (9/11/20): this is hardcoded for a very specific use case at the moment and just visually tested using the newly evolving visual regression tool
+        import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel # pyplot is slow to import and only needed here
+
         self._init_pipelines()
         factor = 0.25
         plt.figure(figsize=(15 * factor, 35 * 1), dpi=300)
@@ -395,44 +1110,212 @@ class PlateRecording(FileManagerPlateRecording):
         file_name: Optional[str] = None,
         create_continuous_waveforms: bool = True,
         create_waveform_charts: bool = True,
-    ) -> None:
+        max_workers: int = 1,
+        options: Optional[XlsxWritingOptions] = None,
+        analysis_result: Optional[PlateAnalysisResult] = None,
+        trace_memory: bool = False,
+        stage_report_file: Optional[str] = None,
+    ) -> StageReport:
         """Create an XLSX file.
 
+        The time taken by each stage of writing the file (and of each well in
+        it) is measured and returned, with the stages (in the order they
+        began) named:
+
+        - ``write_xlsx``: all the stages below.
+        - ``analyze``: analyzing the wells and gathering the results, unless ``analysis_result`` is given. Includes ``load_well_data``, ``load_cached_analysis``, ``filter``, ``peak_detection``, ``metrics`` and ``store_cached_analysis`` of each well analyzed in this process (wells analyzed in separate processes are not measured separately), then ``resample``, ``per_twitch_tables`` and ``aggregate_statistics``.
+        - ``open_workbook``, ``metadata_sheet``.
+        - ``continuous_waveforms_sheet``: includes ``peak_and_valley_markers`` of each well, ``write_waveform_rows``, then ``chart_data`` and ``waveform_charts`` of each well.
+        - ``aggregate_metrics_sheet``.
+        - ``per_twitch_metrics_sheet``: includes ``twitch_charts`` of each well with metrics.
+        - ``chart_data_sheet``.
+        - ``close_workbook``: compressing and saving the file.
+
         Args:
             file_dir: the directory in which to create the file.
             file_name: By default an automatic name is generated based on barcode and recording date. Extension will always be xlsx---if user provides something else then it is stripped
             create_continuous_waveforms: typically used in unit testing, if set to True, the continuous-waveforms sheet and continuous-waveform-plots sheet will be created with no content
             create_waveform_charts: typically used in unit testing, if set to True, only the continuous-waveform-plots sheet will be created with no content
+            max_workers: the number of wells to analyze at once. If more than 1, the wells are analyzed in separate processes before any sheets are written.
+            options: how to write NaN and infinity, whether to write in constant memory mode and the most points to plot in each chart. See ``XlsxWritingOptions`` for the defaults.
+            analysis_result: the results to write, from ``analyze`` of this PlateRecording. By default the wells are analyzed (if they haven't been already) when the file is written.
+            trace_memory: whether to also measure the memory allocated by each stage, with tracemalloc. This makes writing the file a lot slower.
+            stage_report_file: the path of a JSON file to write the measurements of the stages to, as well as returning them.
+
+        Returns:
+            The measurements of the stages of writing the file.
         """
+        if options is None:
+            options = XlsxWritingOptions()
+        context = _XlsxWritingContext(
+            nan_inf_policy=options.nan_inf_policy,
+            chart_max_points=options.chart_max_points,
+        )
+        stage_recorder = StageRecorder(trace_memory=trace_memory)
+        self._stage_recorder = stage_recorder
+        try:
+            with stage_recorder.measure("write_xlsx"):
+                self._write_xlsx(
+                    file_dir,
+                    file_name,
+                    create_continuous_waveforms,
+                    create_waveform_charts,
+                    max_workers,
+                    options.constant_memory,
+                    analysis_result,
+                    context,
+                )
+        finally:
+            self._stage_recorder = StageRecorder(enabled=False)
+        stage_report = stage_recorder.get_report()
+        if stage_report_file is not None:
+            stage_report.write_json(stage_report_file)
+        return stage_report
+
+    def _write_xlsx(
+        self,
+        file_dir: str,
+        file_name: Optional[str],
+        create_continuous_waveforms: bool,
+        create_waveform_charts: bool,
+        max_workers: int,
+        constant_memory: bool,
+        analysis_result: Optional[PlateAnalysisResult],
+        context: _XlsxWritingContext,
+    ) -> None:
         first_well_index = self.get_well_indices()[0]
         # this file is used to get general information applicable across the recording
         first_well_file = self.get_well_by_index(first_well_index)
         logger.info("Loading data from H5 file(s)")
-        self._init_pipelines()
+        if analysis_result is None:
+            analysis_result = self.analyze(max_workers)
         if file_name is None:
-            file_name = f"{first_well_file.get_plate_barcode()}__{first_well_file.get_begin_recording().strftime('%Y_%m_%d_%H%M%S')}.xlsx"
+            file_name = f"{self._get_default_file_name()}.xlsx"
         file_path = os.path.join(file_dir, file_name)
         logger.info("Opening .xlsx file")
-        self._workbook = Workbook(
-            file_path, {"default_date_format": "YYYY-MM-DD hh:mm:ss UTC"}
-        )
-        for iter_format_name, iter_format in ALL_FORMATS.items():
-            self._workbook_formats[iter_format_name] = self._workbook.add_format(
-                iter_format
+        with self._stage_recorder.measure("open_workbook"):
+            self._workbook = Workbook(
+                file_path,
+                {
+                    "default_date_format": "YYYY-MM-DD hh:mm:ss UTC",
+                    "constant_memory": constant_memory,
+                },
             )
-        _write_xlsx_metadata(self._workbook, first_well_file)
-        self._write_xlsx_continuous_waveforms(
-            skip_content=(not create_continuous_waveforms),
-            skip_charts=(not create_waveform_charts),
-        )
-        self._write_xlsx_aggregate_metrics()
-        self._write_xlsx_per_twitch_metrics()
+            for iter_format_name, iter_format in ALL_FORMATS.items():
+                self._workbook_formats[iter_format_name] = self._workbook.add_format(
+                    iter_format
+                )
+        with self._stage_recorder.measure("metadata_sheet"):
+            _write_xlsx_metadata(self._workbook, first_well_file)
+        with self._stage_recorder.measure("continuous_waveforms_sheet"):
+            self._write_xlsx_continuous_waveforms(
+                analysis_result,
+                context,
+                skip_content=(not create_continuous_waveforms),
+                skip_charts=(not create_waveform_charts),
+            )
+        with self._stage_recorder.measure("aggregate_metrics_sheet"):
+            self._write_xlsx_aggregate_metrics(analysis_result, context)
+        with self._stage_recorder.measure("per_twitch_metrics_sheet"):
+            self._write_xlsx_per_twitch_metrics(analysis_result, context)
+        with self._stage_recorder.measure("chart_data_sheet"):
+            self._write_xlsx_chart_data(context)
         logger.info("Saving .xlsx file")
-        self._workbook.close()  # This is actually when the file gets written to d
+        with self._stage_recorder.measure("close_workbook"):
+            self._workbook.close()  # This is actually when the file gets written to d
         logger.info("Done writing to .xlsx")
 
+    def _get_default_file_name(self) -> str:
+        """Get a file name based on the barcode and recording date.
+
+        The name has no extension.
+        """
+        # this file is used to get general information applicable across the recording
+        first_well_file = self.get_well_by_index(self.get_well_indices()[0])
+        return f"{first_well_file.get_plate_barcode()}__{first_well_file.get_begin_recording().strftime('%Y_%m_%d_%H%M%S')}"
+
+    def write_parquet(
+        self,
+        file_dir: str,
+        file_name_prefix: Optional[str] = None,
+        max_workers: int = 1,
+        analysis_result: Optional[PlateAnalysisResult] = None,
+        compression: str = "zstd",
+    ) -> List[str]:
+        """Create a parquet file for each table of analysis results.
+
+        The resampled waveforms, the peaks and valleys, the per-twitch
+        metrics and the aggregate metrics are each written to a separate
+        file, with a row for each data point (or event, twitch or metric) of
+        each well, as described in ``get_arrow_tables``. Requires pyarrow.
+
+        Args:
+            file_dir: the directory in which to create the files.
+            file_name_prefix: the start of the name of each file, which is followed by two underscores and the name of the table. By default it is based on barcode and recording date.
+            max_workers: the number of wells to analyze at once. If more than 1, the wells are analyzed in separate processes.
+            analysis_result: the results to write, from ``analyze`` of this PlateRecording. By default the wells are analyzed (if they haven't been already) when the files are written.
+            compression: the compression codec of the columns, or "none".
+
+        Returns:
+            The path of each file created.
+
+        Raises:
+            ImportError: if pyarrow is not installed.
+        """
+        import_pyarrow()
+        if analysis_result is None:
+            analysis_result = self.analyze(max_workers)
+        if file_name_prefix is None:
+            file_name_prefix = self._get_default_file_name()
+        first_well_file = self.get_well_by_index(analysis_result.well_indices[0])
+        tables = get_arrow_tables(
+            analysis_result,
+            first_well_file.get_plate_barcode(),
+            first_well_file.get_begin_recording(),
+            TWENTY_FOUR_WELL_PLATE,
+        )
+        logger.info("Writing parquet files")
+        return write_parquet_tables(tables, file_dir, file_name_prefix, compression)
+
+    def write_h5_results(
+        self,
+        file_path: str,
+        max_workers: int = 1,
+        analysis_result: Optional[PlateAnalysisResult] = None,
+        compression: Optional[str] = "gzip",
+    ) -> None:
+        """Create an HDF5 file of the analysis results.
+
+        The filtered and resampled waveforms, the indices of the peaks and
+        valleys, the per-twitch metrics and the aggregate statistics of each
+        well are written as datasets, with the metadata of the recording as
+        attributes named by the string of its UUID, as described in
+        ``write_h5_results``. The waveforms are chunked along time, so a
+        window of time can later be read without reading the whole
+        waveform.
+
+        Args:
+            file_path: the path of the file to create. An existing file is overwritten.
+            max_workers: the number of wells to analyze at once. If more than 1, the wells are analyzed in separate processes.
+            analysis_result: the results to write, from ``analyze`` of this PlateRecording. By default the wells are analyzed (if they haven't been already) when the file is written.
+            compression: the compression filter of the datasets ("gzip" or "lzf"), or None to not compress them.
+        """
+        if analysis_result is None:
+            analysis_result = self.analyze(max_workers)
+        first_well_file = self.get_well_by_index(analysis_result.well_indices[0])
+        logger.info("Writing H5 results file")
+        write_h5_results(
+            file_path,
+            analysis_result,
+            _get_recording_metadata(first_well_file),
+            TWENTY_FOUR_WELL_PLATE,
+            compression=compression,
+        )
+
     def _write_xlsx_continuous_waveforms(
         self,
+        analysis_result: PlateAnalysisResult,
+        context: _XlsxWritingContext,
         skip_content: bool = False,
         skip_charts: bool = False,
     ) -> None:
@@ -448,112 +1331,167 @@ class PlateRecording(FileManagerPlateRecording):
         curr_sheet = continuous_waveform_sheet
 
         # create headings
-        curr_sheet.write(0, 0, "Time (seconds)")
-        for i in range(
-            TWENTY_FOUR_WELL_PLATE.row_count * TWENTY_FOUR_WELL_PLATE.column_count
-        ):
-            curr_sheet.write(
-                0, 1 + i, TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(i)
-            )
-
-        # initialize time values (use longest data)
-        max_time_index = 0
-        for well_index in self.get_well_indices():
-            well_pipeline = self._pipelines[well_index]
-            last_time_index = well_pipeline.get_raw_tissue_magnetic_data()[0][-1]
-            if last_time_index > max_time_index:
-                max_time_index = last_time_index
-        self._interpolated_data_period = (
-            int(
-                self._files[0].get_interpolation_value()
-                / MICROSECONDS_PER_CENTIMILLISECOND
-            )
-            if self._is_optical_recording
-            else INTERPOLATED_DATA_PERIOD_CMS
+        write_values_to_row(
+            curr_sheet,
+            0,
+            0,
+            ["Time (seconds)"]
+            + [
+                TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(i)
+                for i in range(
+                    TWENTY_FOUR_WELL_PLATE.row_count
+                    * TWENTY_FOUR_WELL_PLATE.column_count
+                )
+            ],
         )
-        interpolated_data_indices = np.arange(
-            self._interpolated_data_period,  # don't start at time zero, because some wells don't have data at exactly zero (causing interpolation to fail), so just start at the next timepoint
-            max_time_index,
-            self._interpolated_data_period,
+        well_markers = self._write_xlsx_waveform_rows(
+            curr_sheet, analysis_result, context
+        )
+        self._write_xlsx_waveform_charts(
+            analysis_result, context, well_markers, skip_charts
         )
-
-        for i, data_index in enumerate(interpolated_data_indices):
-            curr_sheet.write(
-                i + 1,
-                0,
-                data_index
-                / CENTIMILLISECONDS_PER_SECOND,  # display in seconds in the Excel sheet
-            )
-
-        # add data for valid wells
-        well_indices = self.get_well_indices()
-        num_wells = len(well_indices)
-        for iter_well_idx, well_index in enumerate(well_indices):
-            filtered_data = self._pipelines[
-                well_index
-            ].get_noise_filtered_magnetic_data()
-            # interpolate data (at 100 Hz for H5) to max valid interpolated data point
-            interpolated_data_function = interpolate.interp1d(
-                filtered_data[0], filtered_data[1]
-            )
-            well_name = TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(well_index)
-            msg = f"Writing waveform data of well {well_name} ({iter_well_idx + 1} out of {num_wells})"
-            logger.info(msg)
-
-            # finding last index in interpolated data indices
-            last_index = len(interpolated_data_indices) - 1
-            first_index = 0
-
-            # decrementing the last index marker until the last time point in filtered_data is greater than the value of interpolated_data_indices at the last index
-            while filtered_data[0][-1] < interpolated_data_indices[last_index]:
-                last_index -= 1
-
-            # incrementing last_index so the previously found index value less than the last filtered_data timepoint is included in the interpolate function and represnts the correct number of data points
-            last_index += 1
-
-            while filtered_data[0][0] > interpolated_data_indices[first_index]:
-                first_index += 1
-
-            interpolated_data = interpolated_data_function(
-                interpolated_data_indices[first_index:last_index]
-            )
-
-            # write to sheet
-            for i, data_point in enumerate(interpolated_data):
-                curr_sheet.write(i + 1, well_index + 1, data_point)
-            self._create_waveform_charts(
-                skip_charts,
-                iter_well_idx,
-                last_index,
-                well_index,
-                well_name,
-                filtered_data[0],
-                interpolated_data_function,
-            )
 
         # The formatting items below are not explicitly unit-tested...not sure the best way to do this
         # Adjust the column widths to be able to see the data
         curr_sheet.set_column(0, 0, 18)
-        well_indices = self.get_well_indices()
         for iter_well_idx in range(24):
             curr_sheet.set_column(
                 iter_well_idx + 1,
                 iter_well_idx + 1,
                 13,
-                options={"hidden": iter_well_idx not in well_indices},
+                options={"hidden": iter_well_idx not in analysis_result.well_indices},
             )
         curr_sheet.freeze_panes(1, 1)
 
+    def _write_xlsx_waveform_rows(
+        self,
+        curr_sheet: xlsxwriter.worksheet.Worksheet,
+        analysis_result: PlateAnalysisResult,
+        context: _XlsxWritingContext,
+    ) -> List[
+        Dict[
+            str,
+            Tuple[
+                NDArray[(1, Any), int],
+                NDArray[(1, Any), float],
+                NDArray[(1, Any), float],
+            ],
+        ]
+    ]:
+        """Write the resampled waveforms and their peak and valley markers.
+
+        The data of the valid wells and their markers are gathered first, so
+        that the sheet can be written one row at a time.
+
+        Returns:
+            The peak and valley markers of each well, from ``_get_peak_detection_markers``.
+        """
+        well_indices = analysis_result.well_indices
+        num_wells = len(well_indices)
+        sheet_columns: Dict[int, NDArray[(1, Any), float]] = {
+            0: analysis_result.resampled_times
+        }
+        marker_cells: Dict[int, Dict[int, Union[str, float]]] = {0: dict()}
+        well_markers: List[
+            Dict[
+                str,
+                Tuple[
+                    NDArray[(1, Any), int],
+                    NDArray[(1, Any), float],
+                    NDArray[(1, Any), float],
+                ],
+            ]
+        ] = list()
+        for iter_well_idx, well_index in enumerate(well_indices):
+            well_name = TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(well_index)
+            msg = f"Writing waveform data of well {well_name} ({iter_well_idx + 1} out of {num_wells})"
+            logger.info(msg)
+            first_index, last_index = analysis_result.resampling_bounds[iter_well_idx]
+            sheet_columns[well_index + 1] = analysis_result.resampled_waveforms[
+                first_index:last_index, iter_well_idx
+            ]
+            well_markers.append(dict())
+            with self._stage_recorder.measure("peak_and_valley_markers", well_index):
+                for detector_type, indices in zip(
+                    ("Peak", "Valley"),
+                    analysis_result.peak_and_valley_indices[iter_well_idx],
+                ):
+                    result_col = _get_peak_detection_column(well_index, detector_type)
+                    marker_cells[0][result_col] = f"{well_name} {detector_type} Values"
+                    markers = self._get_peak_detection_markers(
+                        indices,
+                        analysis_result.well_results[iter_well_idx].filtered_data,
+                    )
+                    marker_rows, _, marker_values = markers
+                    for row, value in zip(marker_rows.tolist(), marker_values.tolist()):
+                        marker_cells.setdefault(row, dict())[result_col] = value
+                    well_markers[iter_well_idx][detector_type] = markers
+        with self._stage_recorder.measure("write_waveform_rows"):
+            write_columns_by_row(
+                curr_sheet, 1, sheet_columns, context.nan_inf_policy, marker_cells
+            )
+        return well_markers
+
+    def _write_xlsx_waveform_charts(
+        self,
+        analysis_result: PlateAnalysisResult,
+        context: _XlsxWritingContext,
+        well_markers: List[
+            Dict[
+                str,
+                Tuple[
+                    NDArray[(1, Any), int],
+                    NDArray[(1, Any), float],
+                    NDArray[(1, Any), float],
+                ],
+            ]
+        ],
+        skip_charts: bool,
+    ) -> None:
+        for iter_well_idx, well_index in enumerate(analysis_result.well_indices):
+            first_index, last_index = analysis_result.resampling_bounds[iter_well_idx]
+            filtered_data = analysis_result.well_results[iter_well_idx].filtered_data
+            snapshot_window = _get_snapshot_window(
+                filtered_data[0][-1] // CENTIMILLISECONDS_PER_SECOND
+            )
+            with self._stage_recorder.measure("chart_data", well_index):
+                series_ranges = _get_full_resolution_series_ranges(
+                    well_index, last_index
+                )
+                if not skip_charts and context.chart_max_points is not None:
+                    series_ranges.update(
+                        _add_chart_data(
+                            context.chart_data_columns,
+                            iter_well_idx,
+                            well_index,
+                            analysis_result.resampled_times[first_index:last_index],
+                            analysis_result.resampled_waveforms[
+                                first_index:last_index, iter_well_idx
+                            ],
+                            snapshot_window,
+                            well_markers[iter_well_idx],
+                            context.chart_max_points,
+                        )
+                    )
+            with self._stage_recorder.measure("waveform_charts", well_index):
+                self._create_waveform_charts(
+                    skip_charts,
+                    iter_well_idx,
+                    series_ranges,
+                    well_index,
+                    TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(well_index),
+                    filtered_data,
+                )
+
     # pylint: disable=too-many-locals
     def _create_waveform_charts(
         self,
         skip_charts: bool,
         iter_well_idx: int,
-        num_data_points: int,
+        series_ranges: Dict[str, Tuple[str, str]],
         well_index: int,
         well_name: str,
-        time_values: NDArray[(2, Any), int],
-        interpolated_data_function: interpolate.interpolate.interp1d,
+        filtered_data: NDArray[(2, Any), int],
     ) -> None:
         snapshot_chart_sheet = self._workbook.get_worksheet_by_name(
             SNAPSHOT_CHART_SHEET_NAME
@@ -571,65 +1509,37 @@ class PlateRecording(FileManagerPlateRecording):
             full_chart = self._workbook.add_chart(
                 {"type": "scatter", "subtype": "straight"}
             )
-        well_column = xl_col_to_name(well_index + 1)
-        recording_stop_time = time_values[-1] // CENTIMILLISECONDS_PER_SECOND
-        lower_x_bound = (
-            0
-            if recording_stop_time <= CHART_WINDOW_NUM_SECONDS
-            else int((recording_stop_time - CHART_WINDOW_NUM_SECONDS) // 2)
-        )
-        upper_x_bound = (
-            recording_stop_time
-            if recording_stop_time <= CHART_WINDOW_NUM_SECONDS
-            else int((recording_stop_time + CHART_WINDOW_NUM_SECONDS) // 2)
-        )
+        recording_stop_time = filtered_data[0][-1] // CENTIMILLISECONDS_PER_SECOND
+        lower_x_bound, upper_x_bound = _get_snapshot_window(recording_stop_time)
         msg = f"Adding peak and valley markers to chart of well {well_name}"
         logger.info(msg)
-        for chart, chart_sheet in (
-            (snapshot_chart, snapshot_chart_sheet),
-            (full_chart, full_chart_sheet),
+        for chart, chart_sheet, chart_type in (
+            (snapshot_chart, snapshot_chart_sheet, "Snapshot"),
+            (full_chart, full_chart_sheet, "Full"),
         ):
             if (
                 chart is not None
             ):  # Tanner (11/11/20): chart is None when skipping chart creation
+                categories, values = series_ranges[chart_type]
                 chart.add_series(
                     {
                         "name": "Waveform Data",
-                        "categories": f"='continuous-waveforms'!$A$2:$A${num_data_points}",
-                        "values": f"='continuous-waveforms'!${well_column}$2:${well_column}${num_data_points}",
+                        "categories": categories,
+                        "values": values,
                         "line": {"color": "#1B9E77"},
                     }
                 )
 
-            peak_indices, valley_indices = self._pipelines[
-                well_index
-            ].get_peak_detection_results()
-            self._add_peak_detection_series(
-                chart,
-                "Peak",
-                well_index,
-                well_name,
-                num_data_points,
-                peak_indices,
-                interpolated_data_function,
-                time_values,
-            )
-            self._add_peak_detection_series(
-                chart,
-                "Valley",
-                well_index,
-                well_name,
-                num_data_points,
-                valley_indices,
-                interpolated_data_function,
-                time_values,
-            )
-
             if (
                 chart is None
             ):  # Tanner (11/11/20): chart is None when skipping chart creation
                 continue
 
+            for detector_type in ("Peak", "Valley"):
+                _add_peak_detection_series(
+                    chart, detector_type, *series_ranges[detector_type]
+                )
+
             (
                 well_row,
                 well_col,
@@ -669,67 +1579,79 @@ class PlateRecording(FileManagerPlateRecording):
                     chart,
                 )
 
-    def _add_peak_detection_series(
+    def _write_xlsx_chart_data(self, context: _XlsxWritingContext) -> None:
+        if not context.chart_data_columns:
+            return
+        logger.info("Creating chart data sheet")
+        curr_sheet = self._workbook.add_worksheet(CHART_DATA_SHEET_NAME)
+        headers: Dict[int, str] = dict()
+        for iter_well_idx, well_index in enumerate(self.get_well_indices()):
+            well_name = TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(well_index)
+            first_col = iter_well_idx * CHART_DATA_COLUMNS_PER_WELL
+            for col_offset, header in enumerate(
+                (
+                    "Time (seconds)",
+                    "Waveform",
+                    "Snapshot Time (seconds)",
+                    "Snapshot Waveform",
+                    "Peak Time (seconds)",
+                    "Peak Values",
+                    "Valley Time (seconds)",
+                    "Valley Values",
+                )
+            ):
+                if first_col + col_offset in context.chart_data_columns:
+                    headers[first_col + col_offset] = f"{well_name} {header}"
+        write_columns_by_row(
+            curr_sheet,
+            1,
+            context.chart_data_columns,
+            context.nan_inf_policy,
+            {0: headers},
+        )
+        curr_sheet.hide()
+
+    def _get_peak_detection_markers(
         self,
-        waveform_chart: xlsxwriter.chart_scatter.ChartScatter,
-        detector_type: str,
-        well_index: int,
-        well_name: str,
-        upper_x_bound_cell: int,
         indices: NDArray[(1, Any), int],
-        interpolated_data_function: interpolate.interpolate.interp1d,
-        time_values: NDArray[(2, Any), int],
-    ) -> None:
-        label = "Relaxation" if detector_type == "Valley" else "Contraction"
-        offset = 1 if detector_type == "Valley" else 0
-        marker_color = "#D95F02" if detector_type == "Valley" else "#7570B3"
-        continuous_waveform_sheet = self._workbook.get_worksheet_by_name(
-            CONTINUOUS_WAVEFORM_SHEET_NAME
-        )
-        result_column = xl_col_to_name(
-            PEAK_VALLEY_COLUMN_START + (well_index * 2) + offset
-        )
-        continuous_waveform_sheet.write(
-            f"{result_column}1", f"{well_name} {detector_type} Values"
+        filtered_data: NDArray[(2, Any), int],
+    ) -> Tuple[
+        NDArray[(1, Any), int], NDArray[(1, Any), float], NDArray[(1, Any), float]
+    ]:
+        """Get the peak or valley markers of a well.
+
+        The time of each marker is rounded to the nearest hundredth of a
+        second, and the marker is placed in the row of the continuous-waveforms
+        sheet for that time.
+
+        Returns:
+            The row (zero indexed), time (in seconds) and value of each marker.
+        """
+        uninterpolated_times_seconds = np.round(
+            filtered_data[0][indices] / CENTIMILLISECONDS_PER_SECOND, 2
         )
-        for idx in indices:
-            uninterpolated_time_seconds = round(
-                time_values[idx] / CENTIMILLISECONDS_PER_SECOND, 2
-            )
-            row = (
-                int(
-                    uninterpolated_time_seconds
-                    * CENTIMILLISECONDS_PER_SECOND
-                    / self._interpolated_data_period
-                )
-                if self._is_optical_recording
-                else uninterpolated_time_seconds
-                * int(1 / INTERPOLATED_DATA_PERIOD_SECONDS)
+        rows = (
+            (
+                uninterpolated_times_seconds
+                * CENTIMILLISECONDS_PER_SECOND
+                / self._get_interpolated_data_period()
+            ).astype(np.int64)
+            if self._is_optical_recording
+            else (
+                uninterpolated_times_seconds * int(1 / INTERPOLATED_DATA_PERIOD_SECONDS)
                 + 1
-            )
-            value = interpolated_data_function(
-                uninterpolated_time_seconds * CENTIMILLISECONDS_PER_SECOND
-            )
-            continuous_waveform_sheet.write(f"{result_column}{row}", value)
-        if (
-            waveform_chart is not None
-        ):  # Tanner (11/11/20): chart is None when skipping chart creation
-            waveform_chart.add_series(
-                {
-                    "name": label,
-                    "categories": f"='continuous-waveforms'!$A$2:$A${upper_x_bound_cell}",
-                    "values": f"='continuous-waveforms'!${result_column}$2:${result_column}${upper_x_bound_cell}",
-                    "marker": {
-                        "type": "circle",
-                        "size": 8,
-                        "border": {"color": marker_color, "width": 1.5},
-                        "fill": {"none": True},
-                    },
-                    "line": {"none": True},
-                }
-            )
-
-    def _write_xlsx_per_twitch_metrics(self) -> None:
+            ).astype(np.int64)
+        )
+        values = interpolate_waveforms(
+            filtered_data[0],
+            filtered_data[1:2],
+            uninterpolated_times_seconds * CENTIMILLISECONDS_PER_SECOND,
+        )[0]
+        return rows - 1, uninterpolated_times_seconds, values
+
+    def _write_xlsx_per_twitch_metrics(
+        self, analysis_result: PlateAnalysisResult, context: _XlsxWritingContext
+    ) -> None:
         logger.info("Creating per-twitch metrics sheet")
         curr_sheet = self._workbook.add_worksheet(PER_TWITCH_METRICS_SHEET_NAME)
 
@@ -737,7 +1659,7 @@ class PlateRecording(FileManagerPlateRecording):
         self._workbook.add_worksheet(FORCE_FREQUENCY_RELATIONSHIP_SHEET)
 
         curr_row = 0
-        well_indices = self.get_well_indices()
+        well_indices = analysis_result.well_indices
 
         for iter_well_idx in range(
             TWENTY_FOUR_WELL_PLATE.row_count * TWENTY_FOUR_WELL_PLATE.column_count
@@ -750,59 +1672,47 @@ class PlateRecording(FileManagerPlateRecording):
                 0,
                 well_name,
             )
+            are_values_written = False
+            error_message: Optional[str] = None
             if iter_well_idx in well_indices:
-                iter_pipeline = self._pipelines[iter_well_idx]
-                error_msg = ""
-                try:
-                    (
-                        per_twitch_dict,
-                        aggregate_metrics_dict,
-                    ) = iter_pipeline.get_magnetic_data_metrics()
-                except PeakDetectionError as e:
-                    error_msg = "Error: "
-                    if isinstance(e, TwoPeaksInARowError):
-                        error_msg += "Two Contractions in a Row Detected"
-                    elif isinstance(e, TwoValleysInARowError):
-                        error_msg += "Two Relaxations in a Row Detected"
-                    elif isinstance(e, TooFewPeaksDetectedError):
-                        error_msg += "Not Enough Twitches Detected"
-                    else:
-                        raise NotImplementedError("Unknown PeakDetectionError") from e
+                well_position = well_indices.index(iter_well_idx)
+                per_twitch_table = analysis_result.per_twitch_tables[well_position]
+                if per_twitch_table is None:
                     curr_sheet.write(curr_row, 1, "N/A")
-                    curr_sheet.write(curr_row + 1, 1, error_msg)
+                    error_message = analysis_result.error_messages[well_position]
                 else:
-                    number_twitches = aggregate_metrics_dict[AMPLITUDE_UUID]["n"]
-
-                    curr_row = _write_per_twitch_metric_values(
-                        curr_sheet, curr_row, per_twitch_dict, number_twitches
-                    )
-
-                    twitch_timepoints = list(per_twitch_dict)
-
-                    self._create_frequency_vs_time_charts(
-                        iter_well_idx,
-                        well_name,
-                        number_twitches,
-                        twitch_timepoints,
+                    _write_per_twitch_metric_values(
+                        curr_sheet,
+                        curr_row,
+                        per_twitch_table,
+                        context.nan_inf_policy,
                     )
+                    are_values_written = True
+
+                    twitch_timepoints = per_twitch_table[
+                        PER_TWITCH_TIMEPOINT_COLUMN_NAME
+                    ]
+                    number_twitches = len(twitch_timepoints)
+
+                    with self._stage_recorder.measure("twitch_charts", iter_well_idx):
+                        self._create_frequency_vs_time_charts(
+                            iter_well_idx,
+                            well_name,
+                            number_twitches,
+                            twitch_timepoints,
+                        )
 
-                    self._create_force_frequency_relationship_charts(
-                        iter_well_idx,
-                        well_name,
-                        number_twitches,
-                    )
+                        self._create_force_frequency_relationship_charts(
+                            iter_well_idx,
+                            well_name,
+                            number_twitches,
+                        )
 
-            curr_row += 1
-            curr_sheet.write(
-                curr_row,
-                0,
-                "Timepoint of Twitch Contraction",
-            )
-            curr_row += 1
-            curr_row = _write_per_twitch_metric_labels(curr_sheet, curr_row)
+            if not are_values_written:
+                _write_per_twitch_metric_labels(curr_sheet, curr_row + 1, error_message)
 
             curr_row += (
-                NUMBER_OF_PER_TWITCH_METRICS + 1 - 6
+                NUMBER_OF_PER_TWITCH_METRICS + 2
             )  # include a single row gap in between the data for each well
 
     def _create_force_frequency_relationship_charts(
@@ -862,7 +1772,7 @@ class PlateRecording(FileManagerPlateRecording):
         well_index: int,
         well_name: str,
         num_data_points: int,
-        time_values: NDArray[(1, Any), int],
+        time_values: NDArray[(1, Any), float],
     ) -> None:
         frequency_chart_sheet = self._workbook.get_worksheet_by_name(
             TWITCH_FREQUENCIES_CHART_SHEET_NAME
@@ -887,7 +1797,7 @@ class PlateRecording(FileManagerPlateRecording):
 
         x_axis_settings: Dict[str, Any] = {"name": "Time (seconds)"}
         x_axis_settings["min"] = 0
-        x_axis_settings["max"] = time_values[-1] // CENTIMILLISECONDS_PER_SECOND
+        x_axis_settings["max"] = int(time_values[-1])
 
         frequency_chart.set_x_axis(x_axis_settings)
 
@@ -910,7 +1820,9 @@ class PlateRecording(FileManagerPlateRecording):
             frequency_chart,
         )
 
-    def _write_xlsx_aggregate_metrics(self) -> None:
+    def _write_xlsx_aggregate_metrics(
+        self, analysis_result: PlateAnalysisResult, context: _XlsxWritingContext
+    ) -> None:
         logger.info("Creating aggregate metrics sheet")
         curr_sheet = self._workbook.add_worksheet(AGGREGATE_METRICS_SHEET_NAME)
         curr_row = 0
@@ -926,45 +1838,40 @@ class PlateRecording(FileManagerPlateRecording):
         curr_sheet.write(curr_row, 1, "Treatment Description")
         curr_row += 1
         curr_sheet.write(curr_row, 1, "n (twitches)")
-        well_indices = self.get_well_indices()
-        for iter_well_idx in well_indices:
-            iter_pipeline = self._pipelines[iter_well_idx]
-            error_msg = ""
-            try:
-                _, aggregate_metrics_dict = iter_pipeline.get_magnetic_data_metrics()
-            except PeakDetectionError as e:
-                error_msg = "Error: "
-                if isinstance(e, TwoPeaksInARowError):
-                    error_msg += "Two Contractions in a Row Detected"
-                elif isinstance(e, TwoValleysInARowError):
-                    error_msg += "Two Relaxations in a Row Detected"
-                elif isinstance(e, TooFewPeaksDetectedError):
-                    error_msg += "Not Enough Twitches Detected"
-                else:
-                    raise NotImplementedError("Unknown PeakDetectionError") from e
-                curr_sheet.write(curr_row, 2 + iter_well_idx, "N/A")
-                curr_sheet.write(curr_row + 1, 2 + iter_well_idx, error_msg)
+        well_indices = analysis_result.well_indices
+        twitch_counts = analysis_result.twitch_counts
+        error_messages: Dict[int, Optional[str]] = dict()
+        values_to_write: Dict[int, Union[int, str]] = dict()
+        for iter_well_idx, iter_twitch_count, iter_error_message in zip(
+            well_indices, twitch_counts, analysis_result.error_messages
+        ):
+            if iter_twitch_count == 0:
+                values_to_write[iter_well_idx] = "N/A"
+                error_messages[iter_well_idx] = iter_error_message
             else:
-                curr_sheet.write(
-                    curr_row,
-                    2 + iter_well_idx,
-                    aggregate_metrics_dict[AMPLITUDE_UUID]["n"],
-                )
+                values_to_write[iter_well_idx] = int(iter_twitch_count)
+        for first_well_index, run_values in _group_adjacent_wells(values_to_write):
+            write_values_to_row(curr_sheet, curr_row, 2 + first_well_index, run_values)
 
         curr_row += 1
-        # row_where_data_starts=curr_row
-        for (
-            iter_metric_uuid,
-            iter_metric_name,
-        ) in CALCULATED_METRIC_DISPLAY_NAMES.items():
+        # the error messages go below the whole row of twitch counts, so that rows are written in order
+        for iter_well_idx, error_message in error_messages.items():
+            curr_sheet.write(curr_row, 2 + iter_well_idx, error_message)
+        for iter_metric_idx, iter_metric_name in enumerate(
+            CALCULATED_METRIC_DISPLAY_NAMES.values()
+        ):
             curr_row += 1
-            new_row = self._write_submetrics(
+            if isinstance(iter_metric_name, tuple):
+                _, iter_metric_name = iter_metric_name
+            curr_row = self._write_submetrics(
                 curr_sheet,
                 curr_row,
-                iter_metric_uuid,
                 iter_metric_name,
+                well_indices,
+                twitch_counts,
+                analysis_result.aggregate_statistics[:, iter_metric_idx, :],
+                context.nan_inf_policy,
             )
-            curr_row = new_row
 
         # The formatting items below are not explicitly unit-tested...not sure the best way to do this
         # Adjust the column widths to be able to see the data
@@ -984,61 +1891,54 @@ class PlateRecording(FileManagerPlateRecording):
         self,
         curr_sheet: xlsxwriter.worksheet.Worksheet,
         curr_row: int,
-        iter_metric_uuid: uuid.UUID,
-        iter_metric_name: Union[str, Tuple[int, str]],
+        iter_metric_name: str,
+        well_indices: Tuple[int, ...],
+        twitch_counts: NDArray[(Any,), int],
+        metric_statistics: NDArray[(Any, Any), float],
+        nan_inf_policy: str,
     ) -> int:
-        submetrics = ("Mean", "StDev", "CoV", "SEM")
-        if isinstance(iter_metric_name, tuple):
-            iter_width_percent, iter_metric_name = iter_metric_name
+        """Write a row for each statistic of a metric.
+
+        Args:
+            curr_sheet: the aggregate-metrics sheet.
+            curr_row: the row (zero indexed) to write the first statistic in.
+            iter_metric_name: the name of the metric, written in the first column.
+            well_indices: the index on the plate of each well.
+            twitch_counts: the number of twitches of each well, in the same order.
+            metric_statistics: the statistics of the metric for each well, in the same order, with a column for each statistic in ``AGGREGATE_STATISTIC_NAMES``.
+            nan_inf_policy: how to write statistics that are NaN or infinite, as described in ``write_xlsx``.
+
+        Returns:
+            The row after the last statistic written.
+        """
         curr_sheet.write(curr_row, 0, iter_metric_name)
-        for iter_sub_metric_name in submetrics:
+        for iter_statistic_idx, iter_sub_metric_name in enumerate(
+            AGGREGATE_STATISTIC_NAMES
+        ):
             msg = f"Writing {iter_sub_metric_name} of {iter_metric_name}"
             logger.info(msg)
             curr_sheet.write(curr_row, 1, iter_sub_metric_name)
-            well_indices = self.get_well_indices()
-            for well_index in well_indices:
-                value_to_write: Optional[Union[float, int, str]] = None
-                cell_format: Optional[Format] = None
-                iter_pipeline = self._pipelines[well_index]
-
-                try:
-                    (
-                        _,
-                        aggregate_metrics_dict,
-                    ) = iter_pipeline.get_magnetic_data_metrics()
-                except PeakDetectionError:
-                    value_to_write = "N/A"
-                else:
-                    metrics_dict = dict()
-                    if iter_metric_uuid == WIDTH_UUID:
-                        metrics_dict = aggregate_metrics_dict[iter_metric_uuid][
-                            iter_width_percent
-                        ]
-                    else:
-                        metrics_dict = aggregate_metrics_dict[iter_metric_uuid]
-                    if iter_sub_metric_name == "Mean":
-                        value_to_write = metrics_dict["mean"]
-                    elif iter_sub_metric_name == "StDev":
-                        value_to_write = metrics_dict["std"]
-                    elif iter_sub_metric_name == "CoV":
-                        value_to_write = metrics_dict["std"] / metrics_dict["mean"]
-                        cell_format = self._workbook_formats["CoV"]
-                    elif iter_sub_metric_name == "SEM":
-                        value_to_write = metrics_dict["std"] / metrics_dict["n"] ** 0.5
-                    else:
-                        raise NotImplementedError(
-                            f"Unrecognized submetric name: {iter_sub_metric_name}"
-                        )
-
-                    if iter_metric_uuid in (
-                        TWITCH_PERIOD_UUID,
-                        WIDTH_UUID,
-                    ):  # for time-based metrics, convert from centi-milliseconds to seconds before writing to Excel
-                        if (
-                            iter_sub_metric_name != "CoV"
-                        ):  # coefficients of variation are %, not a raw time unit
-                            value_to_write /= CENTIMILLISECONDS_PER_SECOND
-                curr_sheet.write(curr_row, 2 + well_index, value_to_write, cell_format)
+            cell_format: Optional[Format] = (
+                self._workbook_formats["CoV"] if iter_sub_metric_name == "CoV" else None
+            )
+            values_to_write: Dict[int, Union[float, str]] = {
+                well_index: "N/A" if twitch_count == 0 else value
+                for well_index, twitch_count, value in zip(
+                    well_indices,
+                    twitch_counts,
+                    metric_statistics[:, iter_statistic_idx].tolist(),
+                )
+            }
+            # write each run of adjacent wells at once, so the columns of wells that weren't recorded stay empty
+            for first_well_index, run_values in _group_adjacent_wells(values_to_write):
+                write_values_to_row(
+                    curr_sheet,
+                    curr_row,
+                    2 + first_well_index,
+                    run_values,
+                    nan_inf_policy,
+                    cell_format,
+                )
 
             curr_row += 1
         return curr_row
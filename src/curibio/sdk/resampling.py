@@ -0,0 +1,138 @@
+# -*- coding: utf-8 -*-
+"""Resampling of the waveforms of all wells onto a shared time grid."""
+from __future__ import annotations
+
+from typing import Any
+from typing import List
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+
+from nptyping import NDArray
+import numpy as np
+
+
+def get_resampling_bounds(
+    sample_times: NDArray[(1, Any), float], grid: NDArray[(1, Any), float]
+) -> Tuple[int, int]:
+    """Get the range of the grid that is covered by a waveform.
+
+    Args:
+        sample_times: the sorted times of the waveform.
+        grid: the sorted times to resample at.
+
+    Returns:
+        The index of the first point of the grid at or after the first sample time, and the index after the last point of the grid at or before the last sample time.
+    """
+    first_index = int(np.searchsorted(grid, sample_times[0], side="left"))
+    last_index = int(np.searchsorted(grid, sample_times[-1], side="right"))
+    return first_index, max(first_index, last_index)
+
+
+def _get_aligned_slice(
+    sample_times: NDArray[(1, Any), float], grid: NDArray[(1, Any), float]
+) -> Optional[slice]:
+    """Get the slice of samples at the grid times, if every one is a sample.
+
+    This is the case for uniformly sampled waveforms whose sampling
+    period evenly divides the period of a uniform grid, starting on a
+    sample time.
+    """
+    if len(sample_times) < 2 or len(grid) < 2:
+        return None
+    sampling_period = sample_times[1] - sample_times[0]
+    grid_period = grid[1] - grid[0]
+    if sampling_period <= 0 or grid_period % sampling_period != 0:
+        return None
+    start_offset = grid[0] - sample_times[0]
+    if start_offset % sampling_period != 0:
+        return None
+    if not np.all(np.diff(sample_times) == sampling_period):
+        return None
+    if not np.all(np.diff(grid) == grid_period):
+        return None
+    start = int(start_offset // sampling_period)
+    step = int(grid_period // sampling_period)
+    return slice(start, start + step * (len(grid) - 1) + 1, step)
+
+
+def interpolate_waveforms(
+    sample_times: NDArray[(1, Any), float],
+    sample_values: NDArray[(Any, Any), float],
+    new_times: NDArray[(1, Any), float],
+) -> NDArray[(Any, Any), float]:
+    """Linearly interpolate waveforms that share the same sample times.
+
+    The arithmetic matches ``scipy.interpolate.interp1d``, so the results are
+    identical to interpolating each waveform separately with it.
+
+    Args:
+        sample_times: the sorted times shared by the waveforms.
+        sample_values: the values of each waveform, one waveform per row.
+        new_times: the times to interpolate at, which should be within the range of the sample times.
+
+    Returns:
+        The interpolated values of each waveform, one waveform per row.
+    """
+    sample_times = np.asarray(sample_times, dtype=np.float64)
+    sample_values = np.asarray(sample_values, dtype=np.float64)
+    new_times = np.asarray(new_times, dtype=np.float64)
+    upper_indices = np.searchsorted(sample_times, new_times).clip(
+        1, len(sample_times) - 1
+    )
+    lower_indices = upper_indices - 1
+    lower_times = sample_times[lower_indices]
+    lower_values = sample_values[:, lower_indices]
+    slopes = (sample_values[:, upper_indices] - lower_values) / (
+        sample_times[upper_indices] - lower_times
+    )
+    interpolated_values: NDArray[(Any, Any), float] = (
+        slopes * (new_times - lower_times) + lower_values
+    )
+    return interpolated_values
+
+
+def resample_waveforms(
+    waveforms: Sequence[NDArray[(2, Any), float]], grid: NDArray[(1, Any), float]
+) -> Tuple[NDArray[(Any, Any), float], List[Tuple[int, int]]]:
+    """Resample waveforms onto a shared time grid.
+
+    Waveforms with identical sample times (such as all the wells of an H5
+    recording) are resampled together. If the grid times are all sample
+    times, the samples are sliced out instead of interpolated.
+
+    Args:
+        waveforms: the times and values of each waveform.
+        grid: the sorted times to resample at.
+
+    Returns:
+        A matrix with a row for each time in the grid and a column for each waveform, which is NaN outside the range of each waveform's sample times, along with the bounds of each waveform from ``get_resampling_bounds``.
+    """
+    resampled_data = np.full((len(grid), len(waveforms)), np.nan, dtype=np.float64)
+    bounds: List[Tuple[int, int]] = [(0, 0)] * len(waveforms)
+    groups: List[Tuple[NDArray[(1, Any), float], List[int]]] = list()
+    for waveform_idx, waveform in enumerate(waveforms):
+        for sample_times, waveform_indices in groups:
+            if np.array_equal(sample_times, waveform[0]):
+                waveform_indices.append(waveform_idx)
+                break
+        else:
+            groups.append((waveform[0], [waveform_idx]))
+    for sample_times, waveform_indices in groups:
+        first_index, last_index = get_resampling_bounds(sample_times, grid)
+        for waveform_idx in waveform_indices:
+            bounds[waveform_idx] = (first_index, last_index)
+        if first_index == last_index:
+            continue
+        new_times = grid[first_index:last_index]
+        sample_values = np.array(
+            [waveforms[waveform_idx][1] for waveform_idx in waveform_indices],
+            dtype=np.float64,
+        )
+        aligned_slice = _get_aligned_slice(sample_times, new_times)
+        resampled_data[first_index:last_index, waveform_indices] = (
+            sample_values[:, aligned_slice]
+            if aligned_slice is not None
+            else interpolate_waveforms(sample_times, sample_values, new_times)
+        ).T
+    return resampled_data, bounds
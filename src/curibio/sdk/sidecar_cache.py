@@ -0,0 +1,140 @@
+# -*- coding: utf-8 -*-
+"""Binary sidecar cache for the parsed contents of optical well files.
+
+Each cached well file has two sidecar files in the cache directory: a
+``.npy`` file of the tissue reading, which is memory-mapped when loaded,
+and a ``.json`` file of the metadata values along with the size,
+modification time and SHA-256 hash of the well file they were parsed
+from.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from typing import Any
+from typing import Dict
+from typing import Mapping
+from typing import Optional
+from typing import Tuple
+from uuid import UUID
+
+from nptyping import NDArray
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SIDECAR_FORMAT_VERSION = 1
+HASH_CHUNK_SIZE_BYTES = 1024 * 1024
+
+
+def _get_sidecar_base_path(file_name: str, cache_dir: str) -> str:
+    # well files of different recordings often share a name (e.g. A1.xlsx), so include a hash of the full path
+    path_hash = hashlib.sha1(os.path.abspath(file_name).encode("utf-8")).hexdigest()
+    return os.path.join(cache_dir, f"{os.path.basename(file_name)}.{path_hash[:16]}")
+
+
+def _get_file_hash(file_name: str) -> str:
+    file_hash = hashlib.sha256()
+    with open(file_name, "rb") as well_file:
+        for chunk in iter(lambda: well_file.read(HASH_CHUNK_SIZE_BYTES), b""):
+            file_hash.update(chunk)
+    return file_hash.hexdigest()
+
+
+def _write_json_atomically(file_path: str, contents: Dict[str, Any]) -> None:
+    tmp_file_path = f"{file_path}.tmp{os.getpid()}"
+    with open(tmp_file_path, "w") as json_file:
+        json.dump(contents, json_file)
+    os.replace(tmp_file_path, file_path)
+
+
+def load_sidecar(
+    file_name: str, cache_dir: str
+) -> Optional[Tuple[NDArray[(2, Any), float], Dict[UUID, Optional[str]]]]:
+    """Load the cached contents of a well file if they are still valid.
+
+    The sidecar is valid if the well file has the same size and modification
+    time as when it was cached. If only the modification time changed, the
+    contents are hashed and the sidecar is kept if they are unchanged.
+
+    Args:
+        file_name: the path of the well file.
+        cache_dir: the directory the sidecar files are stored in.
+
+    Returns:
+        The tissue reading as a read-only memory map and the raw metadata values, or None if there is no valid sidecar.
+    """
+    base_path = _get_sidecar_base_path(file_name, cache_dir)
+    try:
+        with open(f"{base_path}.json", "r") as json_file:
+            sidecar_info = json.load(json_file)
+    except (OSError, ValueError):
+        return None
+    if sidecar_info.get("format_version") != SIDECAR_FORMAT_VERSION:
+        return None
+    file_stat = os.stat(file_name)
+    if file_stat.st_size != sidecar_info["size"]:
+        return None
+    if file_stat.st_mtime_ns != sidecar_info["mtime_ns"]:
+        if _get_file_hash(file_name) != sidecar_info["sha256"]:
+            return None
+        # the contents are unchanged (e.g. the file was copied), so update the time to avoid hashing again next time
+        sidecar_info["mtime_ns"] = file_stat.st_mtime_ns
+        try:
+            _write_json_atomically(f"{base_path}.json", sidecar_info)
+        except OSError:
+            pass
+    try:
+        tissue_reading = np.load(f"{base_path}.npy", mmap_mode="r")
+    except (OSError, ValueError):
+        return None
+    if list(tissue_reading.shape) != sidecar_info["shape"]:
+        return None
+    raw_values = {
+        UUID(metadata_uuid): value
+        for metadata_uuid, value in sidecar_info["raw_values"].items()
+    }
+    return tissue_reading, raw_values
+
+
+def write_sidecar(
+    file_name: str,
+    cache_dir: str,
+    tissue_reading: NDArray[(2, Any), float],
+    raw_values: Mapping[UUID, Optional[str]],
+) -> None:
+    """Cache the parsed contents of a well file.
+
+    Failing to write the sidecar is logged instead of raised, since the well
+    file itself was still loaded.
+
+    Args:
+        file_name: the path of the well file.
+        cache_dir: the directory to store the sidecar files in. It is created if needed.
+        tissue_reading: the parsed tissue reading.
+        raw_values: the raw metadata values.
+    """
+    base_path = _get_sidecar_base_path(file_name, cache_dir)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        file_stat = os.stat(file_name)
+        sidecar_info = {
+            "format_version": SIDECAR_FORMAT_VERSION,
+            "size": file_stat.st_size,
+            "mtime_ns": file_stat.st_mtime_ns,
+            "sha256": _get_file_hash(file_name),
+            "shape": list(tissue_reading.shape),
+            "raw_values": {
+                str(metadata_uuid): value for metadata_uuid, value in raw_values.items()
+            },
+        }
+        # the .json file is written last so that it only ever describes a complete .npy file
+        tmp_npy_path = f"{base_path}.tmp{os.getpid()}.npy"
+        np.save(tmp_npy_path, np.asarray(tissue_reading, dtype=np.float64))
+        os.replace(tmp_npy_path, f"{base_path}.npy")
+        _write_json_atomically(f"{base_path}.json", sidecar_info)
+    except OSError as e:
+        msg = f"Unable to write sidecar cache for {file_name}: {e}"
+        logger.warning(msg)
@@ -0,0 +1,178 @@
+# -*- coding: utf-8 -*-
+"""Analysis of the data of a single well, separate from any output format."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+from uuid import UUID
+
+from mantarray_waveform_analysis import CENTIMILLISECONDS_PER_SECOND
+from mantarray_waveform_analysis import Pipeline
+from mantarray_waveform_analysis import PipelineTemplate
+from mantarray_waveform_analysis import TooFewPeaksDetectedError
+from mantarray_waveform_analysis import TWITCH_PERIOD_UUID
+from mantarray_waveform_analysis import TwoPeaksInARowError
+from mantarray_waveform_analysis import TwoValleysInARowError
+from mantarray_waveform_analysis import WIDTH_UUID
+from mantarray_waveform_analysis import WIDTH_VALUE_UUID
+from mantarray_waveform_analysis.exceptions import PeakDetectionError
+from nptyping import NDArray
+import numpy as np
+
+from .constants import CALCULATED_METRIC_DISPLAY_NAMES
+from .constants import PER_TWITCH_TIMEPOINT_COLUMN_NAME
+from .instrumentation import StageRecorder
+
+PerTwitchMetrics = Dict[int, Dict[UUID, Any]]
+AggregateMetrics = Dict[UUID, Any]
+
+
+def classify_peak_detection_error(error: PeakDetectionError) -> str:
+    """Get the message to display in place of metrics that failed to compute.
+
+    Raises:
+        NotImplementedError: if the type of error is not recognized.
+    """
+    error_msg = "Error: "
+    if isinstance(error, TwoPeaksInARowError):
+        error_msg += "Two Contractions in a Row Detected"
+    elif isinstance(error, TwoValleysInARowError):
+        error_msg += "Two Relaxations in a Row Detected"
+    elif isinstance(error, TooFewPeaksDetectedError):
+        error_msg += "Not Enough Twitches Detected"
+    else:
+        raise NotImplementedError("Unknown PeakDetectionError") from error
+    return error_msg
+
+
+def get_per_twitch_table(
+    per_twitch_metrics: PerTwitchMetrics,
+) -> Dict[str, NDArray[(1, Any), float]]:
+    """Get the metrics of each twitch as a column of values per metric.
+
+    Args:
+        per_twitch_metrics: the metrics of each twitch, by the timepoint of the twitch.
+
+    Returns:
+        The timepoint of each twitch under ``PER_TWITCH_TIMEPOINT_COLUMN_NAME``, followed by the values of each metric under its name in ``CALCULATED_METRIC_DISPLAY_NAMES``. Each column is a contiguous float array in the units of the name (times are in seconds).
+    """
+    num_twitches = len(per_twitch_metrics)
+    table = {
+        PER_TWITCH_TIMEPOINT_COLUMN_NAME: np.fromiter(
+            per_twitch_metrics, dtype=np.float64, count=num_twitches
+        )
+        / CENTIMILLISECONDS_PER_SECOND
+    }
+    for metric_uuid, metric_name in CALCULATED_METRIC_DISPLAY_NAMES.items():
+        if isinstance(metric_name, tuple):
+            width_percent, metric_name = metric_name
+            values = np.fromiter(  # pragma: no branch # stops at count
+                (
+                    twitch_metrics[metric_uuid][width_percent][WIDTH_VALUE_UUID]
+                    for twitch_metrics in per_twitch_metrics.values()
+                ),
+                dtype=np.float64,
+                count=num_twitches,
+            )
+        else:
+            values = np.fromiter(  # pragma: no branch # stops at count
+                (
+                    twitch_metrics[metric_uuid]
+                    for twitch_metrics in per_twitch_metrics.values()
+                ),
+                dtype=np.float64,
+                count=num_twitches,
+            )
+        if metric_uuid in (TWITCH_PERIOD_UUID, WIDTH_UUID):
+            values /= CENTIMILLISECONDS_PER_SECOND
+        table[metric_name] = values
+    return table
+
+
+@dataclass(frozen=True)
+class WellAnalysisResult:
+    """Everything computed from the data of a single well.
+
+    Instances only hold plain data, so they can be sent between processes.
+
+    Attributes:
+        well_index: the index of the well on the plate.
+        last_raw_timepoint: the time of the last raw data point, in centimilliseconds.
+        filtered_data: the noise filtered data.
+        peak_and_valley_indices: the indices of the peaks and of the valleys in the filtered data.
+        per_twitch_metrics: the metrics of each twitch, or None if they could not be computed.
+        aggregate_metrics: the metrics aggregated across all twitches, or None if they could not be computed.
+        error_message: why the metrics could not be computed, or None if they were.
+    """
+
+    well_index: int
+    last_raw_timepoint: float
+    filtered_data: NDArray[(2, Any), int]
+    peak_and_valley_indices: Tuple[List[int], List[int]]
+    per_twitch_metrics: Optional[PerTwitchMetrics]
+    aggregate_metrics: Optional[AggregateMetrics]
+    error_message: Optional[str]
+
+
+def analyze_well(
+    well_index: int,
+    pipeline: Pipeline,
+    stage_recorder: Optional[StageRecorder] = None,
+) -> WellAnalysisResult:
+    """Run every step of a pipeline that already has data loaded into it.
+
+    If peak detection errors prevent the metrics from being computed, the
+    error is classified and stored in the result instead of being raised.
+
+    Args:
+        well_index: the index of the well on the plate.
+        pipeline: the pipeline with the raw data of the well loaded.
+        stage_recorder: measures the filtering, peak detection and metrics of the well as separate stages.
+    """
+    if stage_recorder is None:
+        stage_recorder = StageRecorder(enabled=False)
+    # the pipeline keeps the result of each step, so the later steps don't redo the earlier ones
+    with stage_recorder.measure("filter", well_index):
+        filtered_data = pipeline.get_noise_filtered_magnetic_data()
+    with stage_recorder.measure("peak_detection", well_index):
+        peak_and_valley_indices = pipeline.get_peak_detection_results()
+    per_twitch_metrics: Optional[PerTwitchMetrics] = None
+    aggregate_metrics: Optional[AggregateMetrics] = None
+    error_message: Optional[str] = None
+    with stage_recorder.measure("metrics", well_index):
+        try:
+            (
+                per_twitch_metrics,
+                aggregate_metrics,
+            ) = pipeline.get_magnetic_data_metrics()
+        except PeakDetectionError as e:
+            error_message = classify_peak_detection_error(e)
+    return WellAnalysisResult(
+        well_index=well_index,
+        last_raw_timepoint=pipeline.get_raw_tissue_magnetic_data()[0][-1],
+        filtered_data=filtered_data,
+        peak_and_valley_indices=peak_and_valley_indices,
+        per_twitch_metrics=per_twitch_metrics,
+        aggregate_metrics=aggregate_metrics,
+        error_message=error_message,
+    )
+
+
+def analyze_raw_well_data(
+    well_index: int,
+    pipeline_template: PipelineTemplate,
+    raw_tissue_reading: NDArray[(2, Any), float],
+    raw_reference_reading: NDArray[(2, Any), float],
+) -> WellAnalysisResult:
+    """Create a pipeline for the raw data of a well and analyze it.
+
+    Used to analyze wells in worker processes, since pipelines
+    themselves are not sent between processes.
+    """
+    pipeline = pipeline_template.create_pipeline()
+    pipeline.load_raw_magnetic_data(raw_tissue_reading, raw_reference_reading)
+    return analyze_well(well_index, pipeline)
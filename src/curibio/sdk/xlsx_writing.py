@@ -0,0 +1,234 @@
+# -*- coding: utf-8 -*-
+"""Writing whole rows and columns of values to xlsx worksheets.
+
+Values are converted to native Python types all at once, and written with a
+single call per row or column, which is much faster than writing each value
+separately.
+
+Excel has no representation of NaN or infinity, so ``nan_inf_policy``
+determines how they are written:
+
+- ``"blank"``: leave the cell empty.
+- ``"error"``: write the Excel error that a formula giving that value would show (``#NUM!`` for NaN and ``#DIV/0!`` for infinity).
+- ``"raise"``: raise a ValueError.
+
+xlsxwriter's ``constant_memory`` mode writes each row to disk as soon as a
+later row is written to, so ``write_columns_by_row`` writes columns of values
+one whole row at a time.
+
+``XlsxWritingOptions`` groups the options of ``PlateRecording.write_xlsx``
+that determine how the workbook is written.
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import itertools
+import math
+from typing import Any
+from typing import Dict
+from typing import Iterable
+from typing import List
+from typing import Mapping
+from typing import Optional
+from typing import Sequence
+from typing import Tuple
+from typing import Union
+
+from nptyping import NDArray
+import numpy as np
+from xlsxwriter.format import Format
+from xlsxwriter.worksheet import Worksheet
+
+from .chart_data import check_max_points
+from .constants import DEFAULT_CHART_MAX_POINTS
+
+NAN_INF_POLICIES = ("blank", "error", "raise")
+
+
+def check_nan_inf_policy(nan_inf_policy: str) -> None:
+    """Make sure a NaN/infinity policy is one of ``NAN_INF_POLICIES``.
+
+    Raises:
+        ValueError: if the policy is not recognized.
+    """
+    if nan_inf_policy not in NAN_INF_POLICIES:
+        raise ValueError(
+            f"Unrecognized nan_inf_policy: {nan_inf_policy}. Must be one of {NAN_INF_POLICIES}"
+        )
+
+
+@dataclass(frozen=True)
+class XlsxWritingOptions:
+    """How to write an XLSX file of the analysis results of a plate.
+
+    Attributes:
+        nan_inf_policy: how to write values that are NaN or infinite, which Excel can't represent. One of ``NAN_INF_POLICIES``, described in the module docstring.
+        constant_memory: if set to True, each row of a sheet is written to disk as soon as the next row is started, instead of holding the whole workbook in memory until it is closed. This keeps memory use low for long recordings.
+        chart_max_points: the most points of each waveform to plot in each chart. The charts plot downsampled copies of the waveforms in the hidden chart-data sheet, which keeps the smallest and largest values of short stretches of each waveform, so that workbooks of long recordings open quickly. Waveforms with no more points than this are plotted from the continuous-waveforms sheet, as are all waveforms if set to None.
+
+    Raises:
+        ValueError: if the NaN/infinity policy is not recognized, or fewer than 4 points would be plotted.
+    """
+
+    nan_inf_policy: str = "blank"
+    constant_memory: bool = False
+    chart_max_points: Optional[int] = DEFAULT_CHART_MAX_POINTS
+
+    def __post_init__(self) -> None:
+        check_nan_inf_policy(self.nan_inf_policy)
+        if self.chart_max_points is not None:
+            check_max_points(self.chart_max_points)
+
+
+def _get_non_finite_indices(
+    values: Union[NDArray[(Any,), Any], Sequence[Any]], tokens: List[Any]
+) -> List[int]:
+    if isinstance(values, np.ndarray):
+        if values.dtype.kind not in "fc":
+            return list()
+        non_finite_indices: List[int] = np.flatnonzero(~np.isfinite(values)).tolist()
+        return non_finite_indices
+    return [
+        idx
+        for idx, token in enumerate(tokens)
+        if isinstance(token, float) and not math.isfinite(token)
+    ]
+
+
+def _get_error_formula(value: float) -> Tuple[str, str]:
+    if math.isnan(value):
+        return "#NUM!", "#NUM!"
+    return ("1/0" if value > 0 else "-1/0"), "#DIV/0!"
+
+
+def _write_error_value(
+    worksheet: Worksheet,
+    row: int,
+    col: int,
+    value: float,
+    cell_format: Optional[Format],
+) -> None:
+    formula, error_value = _get_error_formula(value)
+    worksheet.write_formula(row, col, formula, cell_format, error_value)
+
+
+def _get_cell_tokens(
+    values: Union[NDArray[(Any,), Any], Sequence[Any]], nan_inf_policy: str
+) -> Tuple[List[Any], List[Tuple[int, float]]]:
+    """Get the values to write, and the non-finite values to write separately.
+
+    Returns:
+        The values as native Python types, with each non-finite value replaced by None, and the index and value of each non-finite value if they should be written as errors.
+    """
+    tokens = values.tolist() if isinstance(values, np.ndarray) else list(values)
+    non_finite_indices = _get_non_finite_indices(values, tokens)
+    if not non_finite_indices:
+        return tokens, list()
+    if nan_inf_policy == "raise":
+        first_idx = non_finite_indices[0]
+        raise ValueError(
+            f"Unable to write {tokens[first_idx]} (at position {first_idx}) with nan_inf_policy 'raise'"
+        )
+    errors: List[Tuple[int, float]] = list()
+    for idx in non_finite_indices:
+        if nan_inf_policy == "error":
+            errors.append((idx, tokens[idx]))
+        tokens[idx] = None
+    return tokens, errors
+
+
+def write_values_to_column(
+    worksheet: Worksheet,
+    first_row: int,
+    col: int,
+    values: Union[NDArray[(Any,), Any], Sequence[Any]],
+    nan_inf_policy: str = "blank",
+    cell_format: Optional[Format] = None,
+) -> None:
+    """Write values down a column, starting at the given cell.
+
+    Args:
+        worksheet: the worksheet to write to.
+        first_row: the row of the first value (zero indexed).
+        col: the column to write to (zero indexed).
+        values: a 1D array, or a sequence of any values that xlsxwriter can write. None leaves a cell empty.
+        nan_inf_policy: how to write NaN and infinity. See the module docstring.
+        cell_format: the format of every cell written.
+    """
+    check_nan_inf_policy(nan_inf_policy)
+    tokens, errors = _get_cell_tokens(values, nan_inf_policy)
+    worksheet.write_column(first_row, col, tokens, cell_format)
+    for idx, value in errors:
+        _write_error_value(worksheet, first_row + idx, col, value, cell_format)
+
+
+def write_values_to_row(
+    worksheet: Worksheet,
+    row: int,
+    first_col: int,
+    values: Union[NDArray[(Any,), Any], Sequence[Any]],
+    nan_inf_policy: str = "blank",
+    cell_format: Optional[Format] = None,
+) -> None:
+    """Write values across a row, starting at the given cell.
+
+    Args:
+        worksheet: the worksheet to write to.
+        row: the row to write to (zero indexed).
+        first_col: the column of the first value (zero indexed).
+        values: a 1D array, or a sequence of any values that xlsxwriter can write. None leaves a cell empty.
+        nan_inf_policy: how to write NaN and infinity. See the module docstring.
+        cell_format: the format of every cell written.
+    """
+    check_nan_inf_policy(nan_inf_policy)
+    tokens, errors = _get_cell_tokens(values, nan_inf_policy)
+    worksheet.write_row(row, first_col, tokens, cell_format)
+    for idx, value in errors:
+        _write_error_value(worksheet, row, first_col + idx, value, cell_format)
+
+
+def write_columns_by_row(
+    worksheet: Worksheet,
+    first_row: int,
+    columns: Mapping[int, Union[NDArray[(Any,), Any], Sequence[Any]]],
+    nan_inf_policy: str = "blank",
+    single_cells: Optional[Mapping[int, Mapping[int, Any]]] = None,
+) -> None:
+    """Write columns of values one whole row at a time, in order of row.
+
+    Args:
+        worksheet: the worksheet to write to.
+        first_row: the row of the first value of each column (zero indexed).
+        columns: the values of each column, by column index (zero indexed). Columns can have different lengths, and the cells below the shorter ones are left empty.
+        nan_inf_policy: how to write NaN and infinity. See the module docstring.
+        single_cells: other values to write, by row index and then column index (both zero indexed). They are written after the values of the columns in the same row, and can be in rows before the first row.
+    """
+    check_nan_inf_policy(nan_inf_policy)
+    if single_cells is None:
+        single_cells = dict()
+    column_tokens: Dict[int, List[Any]] = dict()
+    errors_by_row: Dict[int, List[Tuple[int, float]]] = dict()
+    for col, values in columns.items():
+        column_tokens[col], column_errors = _get_cell_tokens(values, nan_inf_policy)
+        for idx, value in column_errors:
+            errors_by_row.setdefault(first_row + idx, list()).append((col, value))
+    num_rows = max((len(tokens) for tokens in column_tokens.values()), default=0)
+    first_col = min(column_tokens, default=0)
+    padded_columns: List[Iterable[Any]] = [
+        column_tokens[col] + [None] * (num_rows - len(column_tokens[col]))
+        if col in column_tokens
+        else itertools.repeat(None, num_rows)
+        for col in range(first_col, max(column_tokens, default=-1) + 1)
+    ]
+    rows_of_tokens = zip(*padded_columns)
+    start_row = min(itertools.chain((first_row,), single_cells))
+    end_row = max(
+        itertools.chain((first_row + num_rows,), (row + 1 for row in single_cells))
+    )
+    for row in range(start_row, end_row):
+        if first_row <= row < first_row + num_rows:
+            worksheet.write_row(row, first_col, next(rows_of_tokens))
+        for col, value in errors_by_row.get(row, list()):
+            _write_error_value(worksheet, row, col, value, None)
+        for col, value in sorted(single_cells.get(row, dict()).items()):
+            write_values_to_row(worksheet, row, col, [value], nan_inf_policy)
@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""Measuring benchmarks and comparing them to the stored baselines.
+
+Each benchmark is run a few times to time it, keeping the fastest time, and
+then once more with ``tracemalloc`` tracing to find its peak memory (which
+is much slower, so that run is not timed). A benchmark fails if it takes
+longer or uses more memory than its baseline by more than the tolerance,
+plus a little slack so that very quick benchmarks don't fail from noise.
+
+Baselines are measured on one machine, so they should be updated (with
+``--update-benchmark-baselines``) whenever the benchmarks are run on a
+different kind of machine or version of Python (before Python 3.9,
+``StageRecorder`` clears the traces instead of resetting the peak, which
+changes the peak memory measured), or after a change that is meant to make the SDK
+slower or use more memory.
+"""
+from dataclasses import asdict
+from dataclasses import dataclass
+import json
+import os
+import platform
+from typing import Any
+from typing import Callable
+from typing import Dict
+from typing import List
+from typing import Optional
+from typing import Tuple
+import warnings
+
+from curibio.sdk import StageRecorder
+from stdlib_utils import get_current_file_abs_directory
+
+PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
+
+BASELINES_FILE_PATH = os.path.join(PATH_OF_CURRENT_FILE, "baselines.json")
+DEFAULT_ROUNDS = 3
+DEFAULT_TOLERANCE = 0.5
+MIN_SECONDS_SLACK = 0.05
+MIN_MEMORY_SLACK_BYTES = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class BenchmarkMeasurement:
+    seconds: float
+    peak_memory_bytes: int
+
+
+def measure(
+    function: Callable[..., Any],
+    setup: Optional[Callable[[], Tuple[Any, ...]]] = None,
+    rounds: int = DEFAULT_ROUNDS,
+) -> BenchmarkMeasurement:
+    """Measure the fastest time and the peak memory of calling a function.
+
+    Args:
+        function: the code to measure.
+        setup: called before each call of the function, without being measured, to create the arguments of the function.
+        rounds: how many times to time the function.
+    """
+    fastest_seconds = float("inf")
+    for trace_memory in [False] * rounds + [True]:
+        args = tuple() if setup is None else setup()
+        recorder = StageRecorder(trace_memory=trace_memory)
+        with recorder.measure("benchmark"):
+            function(*args)
+        (stage,) = recorder.get_report().stages
+        if not trace_memory:
+            fastest_seconds = min(fastest_seconds, stage.duration_seconds)
+    assert stage.peak_memory_bytes is not None
+    return BenchmarkMeasurement(fastest_seconds, stage.peak_memory_bytes)
+
+
+def _exceeds(value: float, baseline: float, tolerance: float, slack: float) -> bool:
+    return value > baseline * (1 + tolerance) + slack
+
+
+class BenchmarkBaselines:
+    """The stored baselines, and the measurements of this session.
+
+    Args:
+        baselines: the baseline measurement of each benchmark, by name.
+        tolerance: the fraction of its baseline a measurement may exceed the baseline by.
+        updating: whether the measurements replace the baselines instead of being compared to them.
+    """
+
+    def __init__(
+        self,
+        baselines: Dict[str, BenchmarkMeasurement],
+        tolerance: float = DEFAULT_TOLERANCE,
+        updating: bool = False,
+    ) -> None:
+        self._baselines = baselines
+        self._tolerance = tolerance
+        self._updating = updating
+        self.measurements: Dict[str, BenchmarkMeasurement] = dict()
+
+    @classmethod
+    def load(
+        cls,
+        file_path: str = BASELINES_FILE_PATH,
+        tolerance: float = DEFAULT_TOLERANCE,
+        updating: bool = False,
+    ) -> "BenchmarkBaselines":
+        baselines: Dict[str, BenchmarkMeasurement] = dict()
+        if os.path.exists(file_path):
+            with open(file_path, "r", encoding="utf-8") as baselines_file:
+                stored = json.load(baselines_file)
+            baselines = {
+                name: BenchmarkMeasurement(**measurement)
+                for name, measurement in stored["benchmarks"].items()
+            }
+        return cls(baselines, tolerance=tolerance, updating=updating)
+
+    def check(self, name: str, measurement: BenchmarkMeasurement) -> List[str]:
+        """Record a measurement and find how it is slower or larger than its baseline.
+
+        Returns:
+            A description of each way the measurement exceeds its baseline, which is empty if it doesn't (or if there is no baseline, or the baselines are being updated).
+        """
+        self.measurements[name] = measurement
+        if self._updating:
+            return list()
+        baseline = self._baselines.get(name, None)
+        if baseline is None:
+            warnings.warn(
+                f"There is no baseline for {name}, run the benchmarks with --update-benchmark-baselines to store one"
+            )
+            return list()
+        regressions = list()
+        if _exceeds(
+            measurement.seconds, baseline.seconds, self._tolerance, MIN_SECONDS_SLACK
+        ):
+            regressions.append(
+                f"{name} took {measurement.seconds:.3f} s, but its baseline is {baseline.seconds:.3f} s"
+            )
+        if _exceeds(
+            measurement.peak_memory_bytes,
+            baseline.peak_memory_bytes,
+            self._tolerance,
+            MIN_MEMORY_SLACK_BYTES,
+        ):
+            regressions.append(
+                f"{name} used {measurement.peak_memory_bytes} bytes, but its baseline is {baseline.peak_memory_bytes} bytes"
+            )
+        return regressions
+
+    def write(self, file_path: str = BASELINES_FILE_PATH) -> None:
+        """Store the measurements of this session as the new baselines.
+
+        Baselines of benchmarks that were not run this session are kept.
+        """
+        baselines = dict(self._baselines)
+        baselines.update(self.measurements)
+        with open(file_path, "w", encoding="utf-8") as baselines_file:
+            json.dump(
+                {
+                    "machine": platform.platform(),
+                    "python_version": platform.python_version(),
+                    "benchmarks": {
+                        name: asdict(baselines[name]) for name in sorted(baselines)
+                    },
+                },
+                baselines_file,
+                indent=2,
+            )
+            baselines_file.write("\n")
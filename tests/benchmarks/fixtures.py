@@ -0,0 +1,54 @@
+# -*- coding: utf-8 -*-
+from typing import Dict
+
+import pytest
+
+from .baselines import BenchmarkBaselines
+from .baselines import DEFAULT_TOLERANCE
+from .synthetic_plate import write_synthetic_h5_plate
+from .synthetic_plate import write_synthetic_optical_plate
+
+# the size of the plates is part of the name of each baseline, so changing it doesn't compare against baselines of a different size
+BENCHMARK_PLATE_NUM_WELLS = 24
+BENCHMARK_PLATE_DURATION_SECONDS = 30
+BENCHMARK_PLATE_TWITCH_FREQUENCY_HZ = 1
+BENCHMARK_H5_SAMPLING_PERIOD_MICROSECONDS = 9600
+BENCHMARK_OPTICAL_SAMPLING_PERIOD_MICROSECONDS = 10000
+
+
+def get_benchmark_name(plate_kind: str, benchmark: str) -> str:
+    return f"{plate_kind}-{BENCHMARK_PLATE_NUM_WELLS}wells-{BENCHMARK_PLATE_DURATION_SECONDS}s.{benchmark}"
+
+
+@pytest.fixture(scope="session", name="benchmark_baselines")
+def fixture_benchmark_baselines(request):
+    updating = request.config.getoption("--update-benchmark-baselines")
+    tolerance = request.config.getoption("--benchmark-baseline-tolerance")
+    baselines = BenchmarkBaselines.load(
+        tolerance=DEFAULT_TOLERANCE if tolerance is None else tolerance,
+        updating=updating,
+    )
+    yield baselines
+    if updating:
+        baselines.write()
+
+
+@pytest.fixture(scope="session", name="synthetic_plate_dirs")
+def fixture_synthetic_plate_dirs(tmp_path_factory) -> Dict[str, str]:
+    h5_dir = str(tmp_path_factory.mktemp("synthetic_h5_plate"))
+    write_synthetic_h5_plate(
+        h5_dir,
+        num_wells=BENCHMARK_PLATE_NUM_WELLS,
+        duration_seconds=BENCHMARK_PLATE_DURATION_SECONDS,
+        sampling_period_microseconds=BENCHMARK_H5_SAMPLING_PERIOD_MICROSECONDS,
+        twitch_frequency_hz=BENCHMARK_PLATE_TWITCH_FREQUENCY_HZ,
+    )
+    optical_dir = str(tmp_path_factory.mktemp("synthetic_optical_plate"))
+    write_synthetic_optical_plate(
+        optical_dir,
+        num_wells=BENCHMARK_PLATE_NUM_WELLS,
+        duration_seconds=BENCHMARK_PLATE_DURATION_SECONDS,
+        sampling_period_microseconds=BENCHMARK_OPTICAL_SAMPLING_PERIOD_MICROSECONDS,
+        twitch_frequency_hz=BENCHMARK_PLATE_TWITCH_FREQUENCY_HZ,
+    )
+    return {"h5": h5_dir, "optical": optical_dir}
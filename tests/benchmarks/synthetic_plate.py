@@ -0,0 +1,219 @@
+# -*- coding: utf-8 -*-
+"""Synthetic plate recordings of any size for the benchmarks.
+
+The H5 well files copy the metadata of a real v0.3.1 recording, so they are
+read exactly like the files a Mantarray writes, and the optical well files
+are filled in like the optical data template. The waveforms are a train of
+twitches (a quick contraction and slower relaxation) of slightly different
+heights at a fixed frequency, so that every well has peaks and valleys to
+analyze.
+"""
+import datetime
+import os
+from typing import List
+
+from curibio.sdk.constants import TWENTY_FOUR_WELL_PLATE
+import h5py
+from mantarray_file_manager import PLATE_BARCODE_UUID
+from mantarray_file_manager import REF_SAMPLING_PERIOD_UUID
+from mantarray_file_manager import TISSUE_SAMPLING_PERIOD_UUID
+from mantarray_file_manager import TOTAL_WELL_COUNT_UUID
+from mantarray_file_manager import WELL_COLUMN_UUID
+from mantarray_file_manager import WELL_INDEX_UUID
+from mantarray_file_manager import WELL_NAME_UUID
+from mantarray_file_manager import WELL_ROW_UUID
+import numpy as np
+from stdlib_utils import get_current_file_abs_directory
+import xlsxwriter
+
+PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
+
+TEMPLATE_H5_FILE_PATH = os.path.join(
+    os.path.dirname(PATH_OF_CURRENT_FILE),
+    "h5",
+    "v0.3.1",
+    "MA201110001__2020_09_03_213024__A3.h5",
+)
+SYNTHETIC_PLATE_BARCODE = "MA200000000"
+SYNTHETIC_BEGIN_RECORDING = datetime.datetime(2020, 9, 3, 21, 30, 44)
+
+# the reference sensor is sampled this many times as often as the tissue sensor, like in a Mantarray
+REFERENCE_SAMPLES_PER_TISSUE_SAMPLE = 4
+# roughly the range of the raw readings of the template recording
+H5_TISSUE_BASELINE = -430000
+H5_TISSUE_TWITCH_AMPLITUDE = 120000
+H5_REFERENCE_BASELINE = 183000
+H5_REFERENCE_NOISE_AMPLITUDE = 1000
+OPTICAL_TWITCH_AMPLITUDE_MICRONS = 3.0
+# the H5 waveforms are filtered before peak detection, but noise in them can still make it find two contractions in a row, whereas the unfiltered optical waveforms need noise so that their valleys are not all exactly the same height, which the peak detection can't handle
+OPTICAL_NOISE_AMPLITUDE = 0.01
+
+
+def create_twitch_waveform(
+    num_samples: int,
+    sampling_period_seconds: float,
+    twitch_frequency_hz: float,
+    noise_amplitude: float = 0,
+    seed: int = 0,
+) -> np.ndarray:
+    """Create a waveform of twitches with peaks from 0.9 to 1.
+
+    Each twitch rises to its peak in a tenth of the time between twitches
+    and then relaxes exponentially. The height of each twitch and the noise
+    are random, but the same for the same seed.
+
+    Args:
+        num_samples: the length of the waveform.
+        sampling_period_seconds: the time between samples.
+        twitch_frequency_hz: how many times per second the tissue twitches.
+        noise_amplitude: the standard deviation of the normally distributed noise added to each sample.
+        seed: the seed of the random heights and noise.
+    """
+    rng = np.random.default_rng(seed)
+    times = np.arange(num_samples) * sampling_period_seconds
+    twitch_period_seconds = 1 / twitch_frequency_hz
+    time_to_peak = twitch_period_seconds / 10
+    # starting halfway between twitches means the recording never starts or ends in the middle of a contraction
+    twitch_numbers, time_since_twitch = np.divmod(
+        times + twitch_period_seconds / 2, twitch_period_seconds
+    )
+    scaled_time = time_since_twitch / time_to_peak
+    twitch_heights = rng.uniform(0.9, 1, int(twitch_numbers[-1]) + 1)
+    waveform = (
+        twitch_heights[twitch_numbers.astype(int)]
+        * scaled_time ** 2
+        * np.exp(2 * (1 - scaled_time))
+    )
+    if noise_amplitude:
+        waveform += rng.normal(0, noise_amplitude, num_samples)
+    return waveform
+
+
+def _get_num_samples(duration_seconds: float, sampling_period_seconds: float) -> int:
+    return int(round(duration_seconds / sampling_period_seconds))
+
+
+def write_synthetic_h5_plate(
+    dir_path: str,
+    num_wells: int = 24,
+    duration_seconds: float = 30,
+    sampling_period_microseconds: int = 9600,
+    twitch_frequency_hz: float = 1,
+) -> List[str]:
+    """Write an H5 file for each of the first wells of a 24 well plate.
+
+    Args:
+        dir_path: the directory to write the well files to.
+        num_wells: how many wells have a file, from A1 down each column.
+        duration_seconds: the length of the recording.
+        sampling_period_microseconds: the tissue sampling period. The reference sensor is sampled 4 times as often.
+        twitch_frequency_hz: how many times per second the tissues twitch.
+
+    Returns:
+        The paths of the well files.
+    """
+    sampling_period_seconds = sampling_period_microseconds / 1e6
+    num_tissue_samples = _get_num_samples(duration_seconds, sampling_period_seconds)
+    num_ref_samples = num_tissue_samples * REFERENCE_SAMPLES_PER_TISSUE_SAMPLE
+    with h5py.File(TEMPLATE_H5_FILE_PATH, "r") as template_file:
+        template_attrs = dict(template_file.attrs)
+
+    file_paths = list()
+    for well_idx in range(num_wells):
+        well_name = TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(well_idx)
+        row, column = TWENTY_FOUR_WELL_PLATE.get_row_and_column_from_well_index(
+            well_idx
+        )
+        file_path = os.path.join(
+            dir_path,
+            f"{SYNTHETIC_PLATE_BARCODE}__2020_09_03_213024__{well_name}.h5",
+        )
+        tissue_reading = H5_TISSUE_BASELINE + H5_TISSUE_TWITCH_AMPLITUDE * (
+            create_twitch_waveform(
+                num_tissue_samples,
+                sampling_period_seconds,
+                twitch_frequency_hz,
+                seed=well_idx,
+            )
+        )
+        ref_reading = H5_REFERENCE_BASELINE + np.random.default_rng(well_idx).normal(
+            0, H5_REFERENCE_NOISE_AMPLITUDE, num_ref_samples
+        )
+        with h5py.File(file_path, "w") as well_file:
+            well_file.attrs.update(template_attrs)
+            well_file.attrs[str(PLATE_BARCODE_UUID)] = SYNTHETIC_PLATE_BARCODE
+            well_file.attrs[str(WELL_NAME_UUID)] = well_name
+            well_file.attrs[str(WELL_INDEX_UUID)] = well_idx
+            well_file.attrs[str(WELL_ROW_UUID)] = row
+            well_file.attrs[str(WELL_COLUMN_UUID)] = column
+            well_file.attrs[str(TOTAL_WELL_COUNT_UUID)] = 24
+            well_file.attrs[
+                str(TISSUE_SAMPLING_PERIOD_UUID)
+            ] = sampling_period_microseconds
+            well_file.attrs[str(REF_SAMPLING_PERIOD_UUID)] = (
+                sampling_period_microseconds // REFERENCE_SAMPLES_PER_TISSUE_SAMPLE
+            )
+            well_file.create_dataset(
+                "tissue_sensor_readings", data=tissue_reading.astype(np.int32)
+            )
+            well_file.create_dataset(
+                "reference_sensor_readings", data=ref_reading.astype(np.int32)
+            )
+        file_paths.append(file_path)
+    return file_paths
+
+
+def write_synthetic_optical_plate(
+    dir_path: str,
+    num_wells: int = 24,
+    duration_seconds: float = 30,
+    sampling_period_microseconds: int = 10000,
+    twitch_frequency_hz: float = 1,
+) -> List[str]:
+    """Write an optical xlsx file for each of the first wells of a 24 well plate.
+
+    The arguments are the same as ``write_synthetic_h5_plate``, except that the sampling period should be a whole number of microseconds per frame of the camera.
+
+    Returns:
+        The paths of the well files.
+    """
+    sampling_period_seconds = sampling_period_microseconds / 1e6
+    num_samples = _get_num_samples(duration_seconds, sampling_period_seconds)
+    times = (np.arange(num_samples) + 1) * sampling_period_seconds
+
+    file_paths = list()
+    for well_idx in range(num_wells):
+        well_name = TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(well_idx)
+        file_path = os.path.join(dir_path, f"{well_name}.xlsx")
+        displacement = OPTICAL_TWITCH_AMPLITUDE_MICRONS * create_twitch_waveform(
+            num_samples,
+            sampling_period_seconds,
+            twitch_frequency_hz,
+            noise_amplitude=OPTICAL_NOISE_AMPLITUDE,
+            seed=well_idx,
+        )
+        workbook = xlsxwriter.Workbook(file_path, {"constant_memory": True})
+        sheet = workbook.add_worksheet()
+        date_format = workbook.add_format({"num_format": "yyyy-mm-dd hh:mm"})
+        sheet.write_row(0, 0, ("Time (seconds)", "Post Displacement (Microns)"))
+        metadata_values = (
+            well_name,
+            SYNTHETIC_BEGIN_RECORDING,
+            SYNTHETIC_PLATE_BARCODE,
+            1e6 / sampling_period_microseconds,
+            "y",
+            "Synthetic",
+        )
+        for row_idx in range(num_samples):
+            sheet.write_number(row_idx + 1, 0, times[row_idx])
+            sheet.write_number(row_idx + 1, 1, displacement[row_idx])
+            # the metadata is in the same rows as the start of the data, and constant memory mode writes each row only once
+            if row_idx < len(metadata_values):
+                metadata_value = metadata_values[row_idx]
+                if isinstance(metadata_value, datetime.datetime):
+                    sheet.write_datetime(row_idx + 1, 4, metadata_value, date_format)
+                else:
+                    sheet.write(row_idx + 1, 4, metadata_value)
+        workbook.close()
+        file_paths.append(file_path)
+    return file_paths
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+import json
+
+from curibio.sdk import instrumentation
+import pytest
+
+from .baselines import BenchmarkBaselines
+from .baselines import BenchmarkMeasurement
+from .baselines import measure
+from .baselines import MIN_MEMORY_SLACK_BYTES
+from .baselines import MIN_SECONDS_SLACK
+
+
+def test_measure__keeps_fastest_time_and_traces_memory_of_extra_round(mocker):
+    num_bytes = 10 * MIN_MEMORY_SLACK_BYTES
+    calls = list()
+
+    def _allocate(num_bytes):
+        calls.append(num_bytes)
+        return bytearray(num_bytes)
+
+    # the start and end of each round, which take 3, 2 and 1 seconds
+    mocker.patch.object(
+        instrumentation.time,
+        "perf_counter",
+        autospec=True,
+        side_effect=[0, 3, 10, 12, 20, 21],
+    )
+    measurement = measure(_allocate, setup=lambda: (num_bytes,), rounds=2)
+
+    assert calls == [num_bytes] * 3
+    assert measurement.seconds == 2
+    assert measurement.peak_memory_bytes >= num_bytes
+
+
+def test_BenchmarkBaselines__check__finds_measurements_exceeding_tolerance():
+    baselines = BenchmarkBaselines(
+        {"bench": BenchmarkMeasurement(10, 100 * MIN_MEMORY_SLACK_BYTES)},
+        tolerance=0.5,
+    )
+
+    assert (
+        baselines.check(
+            "bench",
+            BenchmarkMeasurement(15 + MIN_SECONDS_SLACK, 150 * MIN_MEMORY_SLACK_BYTES),
+        )
+        == []
+    )
+    regressions = baselines.check(
+        "bench", BenchmarkMeasurement(16, 152 * MIN_MEMORY_SLACK_BYTES)
+    )
+    assert len(regressions) == 2
+    assert "bench took 16.000 s, but its baseline is 10.000 s" in regressions
+
+
+def test_BenchmarkBaselines__check__warns_if_there_is_no_baseline():
+    baselines = BenchmarkBaselines(dict())
+
+    with pytest.warns(UserWarning, match="no baseline for bench"):
+        regressions = baselines.check("bench", BenchmarkMeasurement(1, 1))
+
+    assert regressions == []
+
+
+def test_BenchmarkBaselines__write__stores_measurements_and_keeps_other_baselines(
+    tmp_path,
+):
+    file_path = str(tmp_path / "baselines.json")
+    BenchmarkBaselines(
+        {"kept": BenchmarkMeasurement(1, 2), "replaced": BenchmarkMeasurement(3, 4)}
+    ).write(file_path)
+    baselines = BenchmarkBaselines.load(file_path, updating=True)
+
+    assert baselines.check("replaced", BenchmarkMeasurement(300, 400)) == []
+    baselines.write(file_path)
+
+    with open(file_path, "r", encoding="utf-8") as baselines_file:
+        stored = json.load(baselines_file)
+    assert stored["benchmarks"] == {
+        "kept": {"seconds": 1, "peak_memory_bytes": 2},
+        "replaced": {"seconds": 300, "peak_memory_bytes": 400},
+    }
+
+
+def test_BenchmarkBaselines__load__has_no_baselines_if_file_does_not_exist(tmp_path):
+    baselines = BenchmarkBaselines.load(str(tmp_path / "missing.json"))
+
+    with pytest.warns(UserWarning, match="no baseline"):
+        baselines.check("bench", BenchmarkMeasurement(1, 1))
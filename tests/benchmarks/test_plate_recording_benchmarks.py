@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+import glob
+import os
+from typing import Dict
+from typing import List
+
+from curibio.sdk import ExcelWellFile
+from curibio.sdk import PlateRecording
+import pytest
+
+from .baselines import BenchmarkMeasurement
+from .baselines import DEFAULT_ROUNDS
+from .baselines import measure
+from .fixtures import BENCHMARK_PLATE_NUM_WELLS
+from .fixtures import fixture_benchmark_baselines
+from .fixtures import fixture_synthetic_plate_dirs
+from .fixtures import get_benchmark_name
+
+__fixtures__ = (
+    fixture_benchmark_baselines,
+    fixture_synthetic_plate_dirs,
+)
+
+pytestmark = pytest.mark.benchmark
+
+PLATE_KINDS = ("h5", "optical")
+
+
+def _assert_no_regressions(regressions: List[str]) -> None:
+    assert not regressions, "\n".join(regressions)
+
+
+def _load_plate_recording(plate_dir: str) -> PlateRecording:
+    plate_recording = PlateRecording.from_directory(plate_dir)
+    for well_idx in plate_recording.get_well_indices():
+        well_file = plate_recording.get_well_by_index(well_idx)
+        well_file.get_raw_tissue_reading()
+        well_file.get_raw_reference_reading()
+    return plate_recording
+
+
+def test_synthetic_plates__have_twitches_in_every_well(synthetic_plate_dirs):
+    for plate_dir in synthetic_plate_dirs.values():
+        analysis_result = PlateRecording.from_directory(plate_dir).analyze()
+
+        assert len(analysis_result.well_indices) == BENCHMARK_PLATE_NUM_WELLS
+        assert all(
+            well_result.error_message is None
+            for well_result in analysis_result.well_results
+        )
+        assert min(analysis_result.twitch_counts) > 0
+
+
+@pytest.mark.parametrize("plate_kind", PLATE_KINDS)
+def test_benchmark__load_plate_recording(
+    plate_kind, synthetic_plate_dirs, benchmark_baselines
+):
+    measurement = measure(
+        lambda: _load_plate_recording(synthetic_plate_dirs[plate_kind])
+    )
+
+    _assert_no_regressions(
+        benchmark_baselines.check(get_benchmark_name(plate_kind, "load"), measurement)
+    )
+
+
+def test_benchmark__parse_excel_well_files(synthetic_plate_dirs, benchmark_baselines):
+    file_paths = sorted(glob.glob(os.path.join(synthetic_plate_dirs["optical"], "*")))
+
+    measurement = measure(
+        lambda: [ExcelWellFile(iter_file_path) for iter_file_path in file_paths]
+    )
+
+    _assert_no_regressions(
+        benchmark_baselines.check(
+            get_benchmark_name("optical", "parse_excel_well_files"), measurement
+        )
+    )
+
+
+@pytest.mark.parametrize("plate_kind", PLATE_KINDS)
+def test_benchmark__analyze(plate_kind, synthetic_plate_dirs, benchmark_baselines):
+    measurement = measure(
+        PlateRecording.analyze,
+        setup=lambda: (_load_plate_recording(synthetic_plate_dirs[plate_kind]),),
+    )
+
+    _assert_no_regressions(
+        benchmark_baselines.check(
+            get_benchmark_name(plate_kind, "analyze"), measurement
+        )
+    )
+
+
+@pytest.mark.parametrize("plate_kind", PLATE_KINDS)
+def test_benchmark__write_xlsx_of_each_sheet(
+    plate_kind, synthetic_plate_dirs, benchmark_baselines, tmp_path
+):
+    plate_recording = _load_plate_recording(synthetic_plate_dirs[plate_kind])
+    analysis_result = plate_recording.analyze()
+    fastest_seconds: Dict[str, float] = dict()
+    peak_memory_bytes: Dict[str, int] = dict()
+    # like measure, the stages are timed a few times and then traced once
+    for trace_memory in (False,) * DEFAULT_ROUNDS + (True,):
+        report = plate_recording.write_xlsx(
+            str(tmp_path),
+            file_name="benchmark.xlsx",
+            analysis_result=analysis_result,
+            trace_memory=trace_memory,
+        )
+        for stage in report.stages:
+            if stage.depth > 1:
+                continue
+            if trace_memory:
+                peak_memory_bytes[stage.name] = stage.peak_memory_bytes
+            else:
+                fastest_seconds[stage.name] = min(
+                    fastest_seconds.get(stage.name, float("inf")),
+                    stage.duration_seconds,
+                )
+
+    regressions = list()
+    for stage_name, seconds in fastest_seconds.items():
+        # the stages of the sheets are nested in the write_xlsx stage
+        benchmark = (
+            stage_name if stage_name == "write_xlsx" else f"write_xlsx.{stage_name}"
+        )
+        regressions.extend(
+            benchmark_baselines.check(
+                get_benchmark_name(plate_kind, benchmark),
+                BenchmarkMeasurement(seconds, peak_memory_bytes[stage_name]),
+            )
+        )
+    _assert_no_regressions(regressions)
+
+
+@pytest.mark.parametrize("plate_kind", PLATE_KINDS)
+def test_benchmark__end_to_end(
+    plate_kind, synthetic_plate_dirs, benchmark_baselines, tmp_path
+):
+    measurement = measure(
+        lambda: PlateRecording.from_directory(
+            synthetic_plate_dirs[plate_kind]
+        ).write_xlsx(str(tmp_path), file_name="benchmark.xlsx")
+    )
+
+    _assert_no_regressions(
+        benchmark_baselines.check(
+            get_benchmark_name(plate_kind, "end_to_end"), measurement
+        )
+    )
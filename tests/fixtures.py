@@ -12,6 +12,12 @@ import pytest
 from stdlib_utils import get_current_file_abs_directory
 
 PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
+PATH_TO_FILLED_OPTICAL_TEMPLATE = os.path.join(
+    PATH_OF_CURRENT_FILE, "excel_optical_data", "optical_data_filled_template.xlsx"
+)
+PATH_TO_OPTICAL_PLATE_FOLDER = os.path.join(
+    PATH_OF_CURRENT_FILE, "excel_optical_data", "Data_MA26_Plate2_ZIP_2020-2"
+)
 
 
 @pytest.fixture(scope="function", name="generic_well_file_0_3_1")
@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+from curibio.sdk import get_aggregate_statistics
+from curibio.sdk import get_per_twitch_table
+from mantarray_waveform_analysis import AMPLITUDE_UUID
+from mantarray_waveform_analysis import AUC_UUID
+from mantarray_waveform_analysis import TWITCH_FREQUENCY_UUID
+from mantarray_waveform_analysis import TWITCH_PERIOD_UUID
+from mantarray_waveform_analysis import WIDTH_UUID
+from mantarray_waveform_analysis import WIDTH_VALUE_UUID
+import numpy as np
+
+
+def _create_per_twitch_table(periods, frequencies, amplitudes, widths, aucs):
+    per_twitch_metrics = dict()
+    for iter_twitch_idx, iter_values in enumerate(
+        zip(periods, frequencies, amplitudes, widths, aucs)
+    ):
+        period, frequency, amplitude, width, auc = iter_values
+        per_twitch_metrics[(iter_twitch_idx + 1) * 100000] = {
+            TWITCH_PERIOD_UUID: period,
+            TWITCH_FREQUENCY_UUID: frequency,
+            AMPLITUDE_UUID: amplitude,
+            WIDTH_UUID: {50: {WIDTH_VALUE_UUID: width}},
+            AUC_UUID: auc,
+        }
+    return get_per_twitch_table(per_twitch_metrics)
+
+
+def test_get_aggregate_statistics__computes_statistics_of_each_metric_of_each_well():
+    tables = [
+        _create_per_twitch_table(
+            [100000, 100002, 100004, 100006],
+            [1.0, 0.5, 1.0, 0.5],
+            [1000, 3000, 1000, 3000],
+            [50000, 50000, 50000, 50000],
+            [10, 20, 30, 40],
+        ),
+        _create_per_twitch_table([90000], [2.0], [500], [40000], [7]),
+    ]
+
+    actual_counts, actual_statistics = get_aggregate_statistics(tables)
+
+    np.testing.assert_array_equal(actual_counts, [4, 1])
+    assert actual_statistics.shape == (2, 5, 4)
+    np.testing.assert_allclose(
+        actual_statistics[0],
+        [
+            [1.00003, 0.00002, 2 / 100003, 0.00001],
+            [0.75, 0.25, 0.25 / 0.75, 0.125],
+            [2000, 1000, 0.5, 500],
+            [0.5, 0, 0, 0],
+            [25, 11, 11 / 25, 5.5],
+        ],
+    )
+    np.testing.assert_allclose(
+        actual_statistics[1],
+        [[0.9, 0, 0, 0], [2.0, 0, 0, 0], [500, 0, 0, 0], [0.4, 0, 0, 0], [7, 0, 0, 0]],
+    )
+
+
+def test_get_aggregate_statistics__rounds_mean_and_stdev_of_metrics_other_than_frequency_to_whole_units_like_pipeline():
+    tables = [
+        _create_per_twitch_table(
+            [100000, 100001], [1.0, 0.75], [1, 2], [50000, 50003], [4, 7]
+        )
+    ]
+
+    _, actual_statistics = get_aggregate_statistics(tables)
+
+    # halves are rounded to the nearest even number, like the aggregate metrics of the pipeline
+    np.testing.assert_allclose(actual_statistics[0, :, 0], [1.0, 0.875, 2, 0.50002, 6])
+    np.testing.assert_allclose(
+        actual_statistics[0, :, 1], [0, 0.125, 0, 0.00002, 2], atol=1e-12
+    )
+
+
+def test_get_aggregate_statistics__returns_NaN_for_wells_without_per_twitch_table():
+    tables = [None, _create_per_twitch_table([100000], [1.0], [2], [3], [4]), None]
+
+    actual_counts, actual_statistics = get_aggregate_statistics(tables)
+
+    np.testing.assert_array_equal(actual_counts, [0, 1, 0])
+    assert np.isnan(actual_statistics[[0, 2]]).all()
+    assert not np.isnan(actual_statistics[1]).any()
+
+
+def test_get_aggregate_statistics__returns_empty_arrays_for_no_wells():
+    actual_counts, actual_statistics = get_aggregate_statistics([])
+
+    assert actual_counts.shape == (0,)
+    assert actual_statistics.shape == (0, 5, 4)
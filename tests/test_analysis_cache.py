@@ -0,0 +1,360 @@
+# -*- coding: utf-8 -*-
+import os
+import pickle
+import tempfile
+
+from curibio.sdk import analysis_cache
+from curibio.sdk import plate_recording
+from curibio.sdk import PlateRecording
+from curibio.sdk import WellAnalysisResult
+from mantarray_waveform_analysis import BESSEL_LOWPASS_10_UUID
+from mantarray_waveform_analysis import BUTTERWORTH_LOWPASS_30_UUID
+from mantarray_waveform_analysis import PipelineTemplate
+import numpy as np
+import pytest
+from stdlib_utils import get_current_file_abs_directory
+
+from .fixtures import fixture_generic_well_file_0_3_1
+from .fixtures import PATH_TO_OPTICAL_PLATE_FOLDER
+
+__fixtures__ = [fixture_generic_well_file_0_3_1]
+
+PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
+
+GENERIC_PIPELINE_TEMPLATE = PipelineTemplate(
+    noise_filter_uuid=BESSEL_LOWPASS_10_UUID, tissue_sampling_period=960
+)
+GENERIC_RAW_TISSUE_READING = np.array([[0, 960, 1920], [5, 10, 5]], dtype=np.int32)
+GENERIC_RAW_REFERENCE_READING = np.array([[0, 960, 1920], [1, 1, 1]], dtype=np.int32)
+
+
+def _create_result(well_index=0):
+    return WellAnalysisResult(
+        well_index=well_index,
+        last_raw_timepoint=1920,
+        filtered_data=np.array([[0, 960, 1920], [4, 9, 4]]),
+        peak_and_valley_indices=([1], [0, 2]),
+        per_twitch_metrics=None,
+        aggregate_metrics=None,
+        error_message="Error: Not Enough Twitches Detected",
+    )
+
+
+def _get_generic_cache_key():
+    return analysis_cache.get_analysis_cache_key(
+        GENERIC_RAW_TISSUE_READING,
+        GENERIC_RAW_REFERENCE_READING,
+        GENERIC_PIPELINE_TEMPLATE,
+    )
+
+
+def _set_last_used(cache_dir, cache_key, last_used_seconds):
+    os.utime(
+        analysis_cache._get_cache_file_path(  # pylint: disable=protected-access # setting the time explicitly to control the order of eviction
+            cache_dir, cache_key
+        ),
+        (last_used_seconds, last_used_seconds),
+    )
+
+
+def test_get_analysis_cache_key__is_same_for_equal_data_in_different_memory_layouts():
+    non_contiguous_tissue_reading = np.asfortranarray(GENERIC_RAW_TISSUE_READING)
+    assert non_contiguous_tissue_reading.flags.c_contiguous is False
+
+    assert _get_generic_cache_key() == analysis_cache.get_analysis_cache_key(
+        non_contiguous_tissue_reading,
+        GENERIC_RAW_REFERENCE_READING.copy(),
+        PipelineTemplate(
+            noise_filter_uuid=BESSEL_LOWPASS_10_UUID, tissue_sampling_period=960
+        ),
+    )
+
+
+@pytest.mark.parametrize(
+    "raw_tissue_reading,raw_reference_reading,pipeline_template",
+    [
+        (
+            GENERIC_RAW_TISSUE_READING + 1,
+            GENERIC_RAW_REFERENCE_READING,
+            GENERIC_PIPELINE_TEMPLATE,
+        ),
+        (
+            GENERIC_RAW_TISSUE_READING.astype(np.float64),
+            GENERIC_RAW_REFERENCE_READING,
+            GENERIC_PIPELINE_TEMPLATE,
+        ),
+        (
+            GENERIC_RAW_TISSUE_READING,
+            GENERIC_RAW_REFERENCE_READING[:, :2],
+            GENERIC_PIPELINE_TEMPLATE,
+        ),
+        (
+            GENERIC_RAW_TISSUE_READING,
+            GENERIC_RAW_REFERENCE_READING,
+            PipelineTemplate(
+                noise_filter_uuid=BUTTERWORTH_LOWPASS_30_UUID,
+                tissue_sampling_period=960,
+            ),
+        ),
+        (
+            GENERIC_RAW_TISSUE_READING,
+            GENERIC_RAW_REFERENCE_READING,
+            PipelineTemplate(
+                noise_filter_uuid=BESSEL_LOWPASS_10_UUID, tissue_sampling_period=160
+            ),
+        ),
+        (
+            GENERIC_RAW_TISSUE_READING,
+            GENERIC_RAW_REFERENCE_READING,
+            PipelineTemplate(
+                noise_filter_uuid=BESSEL_LOWPASS_10_UUID,
+                tissue_sampling_period=960,
+                magnetic_twitches_point_up=True,
+            ),
+        ),
+    ],
+)
+def test_get_analysis_cache_key__changes_if_data_or_template_changes(
+    raw_tissue_reading, raw_reference_reading, pipeline_template
+):
+    assert _get_generic_cache_key() != analysis_cache.get_analysis_cache_key(
+        raw_tissue_reading, raw_reference_reading, pipeline_template
+    )
+
+
+def test_get_analysis_cache_key__changes_if_version_of_sdk_changes(mocker):
+    original_key = _get_generic_cache_key()
+    mocker.patch.object(analysis_cache, "PACKAGE_VERSION", "99.0.0")
+
+    assert _get_generic_cache_key() != original_key
+
+
+def test_get_analysis_cache_key__changes_if_version_of_waveform_analysis_changes(
+    mocker,
+):
+    original_key = _get_generic_cache_key()
+    mocker.patch.object(
+        analysis_cache,
+        "_get_waveform_analysis_version",
+        autospec=True,
+        return_value="99.0.0",
+    )
+
+    assert _get_generic_cache_key() != original_key
+
+
+def test_get_analysis_cache_key__only_looks_up_version_of_waveform_analysis_once(
+    mocker,
+):
+    analysis_cache._get_waveform_analysis_version.cache_clear()  # pylint: disable=protected-access # the version may already have been looked up by another test
+    spied_version = mocker.spy(analysis_cache.metadata, "version")
+    _get_generic_cache_key()
+    _get_generic_cache_key()
+
+    spied_version.assert_called_once_with("mantarray-waveform-analysis")
+
+
+def test_store_cached_analysis__can_be_loaded_for_a_different_well():
+    cache_key = _get_generic_cache_key()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = os.path.join(tmp_dir, "analysis_cache")
+        analysis_cache.store_cached_analysis(
+            cache_dir, cache_key, _create_result(well_index=0), 1024 * 1024
+        )
+        loaded_result = analysis_cache.load_cached_analysis(cache_dir, cache_key, 5)
+
+        assert loaded_result.well_index == 5
+        assert loaded_result.error_message == "Error: Not Enough Twitches Detected"
+        np.testing.assert_array_equal(
+            loaded_result.filtered_data, _create_result().filtered_data
+        )
+        assert os.listdir(cache_dir) == [f"{cache_key}.pkl"]
+
+
+@pytest.mark.parametrize(
+    "file_contents",
+    [
+        None,
+        b"",
+        b"not a pickle",
+        pickle.dumps({"well_index": 0}),
+        pickle.dumps(_create_result())[:-40],
+        b"cbuiltins\nnot_a_builtin\n.",  # AttributeError
+        b"cnot_a_module\nname\n.",  # ImportError
+    ],
+)
+def test_load_cached_analysis__returns_none_if_there_is_no_valid_result(
+    file_contents,
+):
+    cache_key = _get_generic_cache_key()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        if file_contents is not None:
+            with open(os.path.join(cache_dir, f"{cache_key}.pkl"), "wb") as cache_file:
+                cache_file.write(file_contents)
+
+        assert analysis_cache.load_cached_analysis(cache_dir, cache_key, 0) is None
+
+
+def test_load_cached_analysis__still_loads_result_if_last_used_time_cannot_be_updated(
+    mocker,
+):
+    cache_key = _get_generic_cache_key()
+    with tempfile.TemporaryDirectory() as cache_dir:
+        analysis_cache.store_cached_analysis(
+            cache_dir, cache_key, _create_result(), 1024 * 1024
+        )
+        mocker.patch.object(os, "utime", autospec=True, side_effect=OSError)
+
+        assert analysis_cache.load_cached_analysis(cache_dir, cache_key, 0) is not None
+
+
+def test_store_cached_analysis__evicts_least_recently_used_results():
+    with tempfile.TemporaryDirectory() as cache_dir:
+        analysis_cache.store_cached_analysis(
+            cache_dir, "first", _create_result(), 1024 * 1024
+        )
+        result_size = os.path.getsize(os.path.join(cache_dir, "first.pkl"))
+        analysis_cache.store_cached_analysis(
+            cache_dir, "second", _create_result(), 1024 * 1024
+        )
+        _set_last_used(cache_dir, "first", 1000)
+        _set_last_used(cache_dir, "second", 2000)
+        with open(os.path.join(cache_dir, "notes.txt"), "w") as other_file:
+            other_file.write("not a cached result")
+        assert analysis_cache.load_cached_analysis(cache_dir, "first", 0) is not None
+
+        analysis_cache.store_cached_analysis(
+            cache_dir, "third", _create_result(), result_size * 2
+        )
+
+        assert sorted(os.listdir(cache_dir)) == ["first.pkl", "notes.txt", "third.pkl"]
+
+
+def test_store_cached_analysis__ignores_results_already_evicted_by_another_process(
+    mocker,
+):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for cache_key in ("first", "second"):
+            analysis_cache.store_cached_analysis(
+                cache_dir, cache_key, _create_result(), 1024 * 1024
+            )
+        _set_last_used(cache_dir, "first", 1000)
+        mocker.patch.object(os, "remove", autospec=True, side_effect=FileNotFoundError)
+
+        analysis_cache.store_cached_analysis(cache_dir, "third", _create_result(), 0)
+
+        assert len(os.listdir(cache_dir)) == 3
+
+
+def test_store_cached_analysis__logs_warning_if_result_cannot_be_written(mocker):
+    spied_warning = mocker.spy(analysis_cache.logger, "warning")
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        not_a_dir = os.path.join(tmp_dir, "not_a_dir")
+        with open(not_a_dir, "w") as some_file:
+            some_file.write("some contents")
+
+        analysis_cache.store_cached_analysis(
+            not_a_dir, "first", _create_result(), 1024 * 1024
+        )
+
+    assert "Unable to write analysis cache for well 0" in spied_warning.call_args[0][0]
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_PlateRecording__loads_analysis_of_unchanged_wells_from_cache(
+    mocker, generic_well_file_0_3_1, max_workers
+):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        cache_dir = os.path.join(tmp_dir, "analysis_cache")
+        first_pr = PlateRecording(
+            [generic_well_file_0_3_1], analysis_cache_dir=cache_dir
+        )
+        first_pr.write_xlsx(tmp_dir, file_name="first.xlsx", max_workers=max_workers)
+        well_idx = first_pr.get_well_indices()[0]
+        assert len(os.listdir(cache_dir)) == 1
+
+        spied_analyze_well = mocker.spy(plate_recording, "analyze_well")
+        second_pr = PlateRecording(
+            [generic_well_file_0_3_1], analysis_cache_dir=cache_dir
+        )
+        second_pr.write_xlsx(tmp_dir, file_name="second.xlsx")
+
+        spied_analyze_well.assert_not_called()
+        first_result = first_pr._get_well_analysis_result(  # pylint: disable=protected-access # checking the stored results
+            well_idx
+        )
+        second_result = second_pr._get_well_analysis_result(  # pylint: disable=protected-access # checking the stored results
+            well_idx
+        )
+        np.testing.assert_array_equal(
+            second_result.filtered_data, first_result.filtered_data
+        )
+        assert second_result.aggregate_metrics.keys() == (
+            first_result.aggregate_metrics.keys()
+        )
+
+
+def test_PlateRecording__analyzes_wells_again_if_pipeline_template_is_not_cached(
+    mocker, generic_well_file_0_3_1
+):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        pr = PlateRecording([generic_well_file_0_3_1], analysis_cache_dir=cache_dir)
+        well_idx = pr.get_well_indices()[0]
+        pr._get_well_analysis_result(  # pylint: disable=protected-access # analyzing the well without writing a file
+            well_idx
+        )
+
+        spied_analyze_well = mocker.spy(plate_recording, "analyze_well")
+        pr.set_pipeline_template(
+            PipelineTemplate(
+                noise_filter_uuid=BUTTERWORTH_LOWPASS_30_UUID,
+                tissue_sampling_period=pr.get_pipeline_template().tissue_sampling_period,
+            )
+        )
+        pr._get_well_analysis_result(  # pylint: disable=protected-access # analyzing the well without writing a file
+            well_idx
+        )
+
+        assert spied_analyze_well.call_count == 1
+        assert len(os.listdir(cache_dir)) == 2
+
+
+@pytest.mark.parametrize(
+    "dir_to_load_files_from",
+    [
+        os.path.join(PATH_OF_CURRENT_FILE, "h5", "peak_detection_errors"),
+        os.path.join(PATH_OF_CURRENT_FILE, "zipped_MA20123456__2020_08_17_145752"),
+        PATH_TO_OPTICAL_PLATE_FOLDER,
+    ],
+)
+def test_PlateRecording__from_directory__uses_analysis_cache_dir(
+    dir_to_load_files_from,
+):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        pr = PlateRecording.from_directory(
+            dir_to_load_files_from, analysis_cache_dir=cache_dir
+        )
+
+        assert (
+            pr._analysis_cache_dir  # pylint: disable=protected-access # checking the stored directory
+            == cache_dir
+        )
+
+
+def test_PlateRecording__reports_storing_and_loading_cached_analysis_of_each_well(
+    generic_well_file_0_3_1,
+):
+    with tempfile.TemporaryDirectory() as cache_dir:
+        first_report = PlateRecording(
+            [generic_well_file_0_3_1], analysis_cache_dir=cache_dir
+        ).write_xlsx(cache_dir, file_name="first.xlsx", create_waveform_charts=False)
+        second_report = PlateRecording(
+            [generic_well_file_0_3_1], analysis_cache_dir=cache_dir
+        ).write_xlsx(cache_dir, file_name="second.xlsx", create_waveform_charts=False)
+
+    well_idx = generic_well_file_0_3_1.get_well_index()
+    assert len(first_report.get_stages("store_cached_analysis", well_idx)) == 1
+    assert len(first_report.get_stages("filter", well_idx)) == 1
+    assert len(second_report.get_stages("load_cached_analysis", well_idx)) == 1
+    assert second_report.get_stages("filter") == []
+    assert second_report.get_stages("store_cached_analysis") == []
@@ -0,0 +1,46 @@
+# -*- coding: utf-8 -*-
+from curibio.sdk.chart_data import get_min_max_decimation_indices
+import numpy as np
+import pytest
+
+
+def test_get_min_max_decimation_indices__returns_all_indices_if_within_budget():
+    np.testing.assert_array_equal(
+        get_min_max_decimation_indices(np.arange(10.0), 10), np.arange(10)
+    )
+
+
+def test_get_min_max_decimation_indices__keeps_min_and_max_of_each_bucket_in_order():
+    values = np.array([0, 5, -3, 2, 9, 1, 4, -8, 6, 7, 3, 2], dtype=np.float64)
+
+    actual = get_min_max_decimation_indices(values, 8)
+
+    # 3 buckets of 4 points, plus the first and last points
+    np.testing.assert_array_equal(actual, [0, 1, 2, 4, 7, 9, 11])
+
+
+def test_get_min_max_decimation_indices__keeps_extremes_of_long_waveform_within_budget():
+    values = np.sin(np.arange(100000) / 1000) * np.linspace(1, 2, 100000)
+    values[12345] = 10
+    values[67890] = -10
+
+    actual = get_min_max_decimation_indices(values, 500)
+
+    assert len(actual) <= 500
+    assert np.all(np.diff(actual) > 0)
+    assert {0, 12345, 67890, 99999} <= set(actual.tolist())
+
+
+def test_get_min_max_decimation_indices__ignores_nan_values():
+    values = np.arange(20, dtype=np.float64)
+    values[5:10] = np.nan
+
+    actual = get_min_max_decimation_indices(values, 6)
+
+    assert not np.isnan(values[actual]).any()
+    assert {0, 19} <= set(actual.tolist())
+
+
+def test_get_min_max_decimation_indices__raises_error_if_budget_is_too_small():
+    with pytest.raises(ValueError, match="max_points must be at least 4, not 3"):
+        get_min_max_decimation_indices(np.arange(10.0), 3)
@@ -3,9 +3,12 @@ from collections import OrderedDict
 import uuid
 
 from curibio.sdk import AGGREGATE_METRICS_SHEET_NAME
+from curibio.sdk import AGGREGATE_STATISTIC_NAMES
 from curibio.sdk import ALL_FORMATS
 from curibio.sdk import CALCULATED_METRIC_DISPLAY_NAMES
 from curibio.sdk import CHART_BASE_WIDTH
+from curibio.sdk import CHART_DATA_COLUMNS_PER_WELL
+from curibio.sdk import CHART_DATA_SHEET_NAME
 from curibio.sdk import CHART_FIXED_WIDTH
 from curibio.sdk import CHART_FIXED_WIDTH_CELLS
 from curibio.sdk import CHART_HEIGHT
@@ -13,10 +16,16 @@ from curibio.sdk import CHART_HEIGHT_CELLS
 from curibio.sdk import CHART_WINDOW_NUM_DATA_POINTS
 from curibio.sdk import CHART_WINDOW_NUM_SECONDS
 from curibio.sdk import CONTINUOUS_WAVEFORM_SHEET_NAME
+from curibio.sdk import CSV_OPTICAL_DATA_START_ROW
+from curibio.sdk import CSV_OPTICAL_METADATA_ROWS
+from curibio.sdk import DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES
 from curibio.sdk import DEFAULT_CELL_WIDTH
+from curibio.sdk import DEFAULT_CHART_MAX_POINTS
 from curibio.sdk import EXCEL_OPTICAL_METADATA_CELLS
 from curibio.sdk import FORCE_FREQUENCY_RELATIONSHIP_SHEET
 from curibio.sdk import FULL_CHART_SHEET_NAME
+from curibio.sdk import H5_RESULTS_CHUNK_NUM_SAMPLES
+from curibio.sdk import H5_RESULTS_FILE_FORMAT_VERSION
 from curibio.sdk import INTERPOLATED_DATA_PERIOD_CMS
 from curibio.sdk import INTERPOLATED_DATA_PERIOD_SECONDS
 from curibio.sdk import INTERPOLATION_VALUE_UUID
@@ -28,7 +37,9 @@ from curibio.sdk import METADATA_UUID_DESCRIPTIONS
 from curibio.sdk import MICROSECONDS_PER_CENTIMILLISECOND
 from curibio.sdk import NUMBER_OF_PER_TWITCH_METRICS
 from curibio.sdk import PEAK_VALLEY_COLUMN_START
+from curibio.sdk import PEAKS_AND_VALLEYS_TABLE_NAME
 from curibio.sdk import PER_TWITCH_METRICS_SHEET_NAME
+from curibio.sdk import PER_TWITCH_TIMEPOINT_COLUMN_NAME
 from curibio.sdk import SECONDS_PER_CELL
 from curibio.sdk import SNAPSHOT_CHART_SHEET_NAME
 from curibio.sdk import TSP_TO_DEFAULT_FILTER_UUID
@@ -64,6 +75,7 @@ def test_misc():
             (AUC_UUID, "Twitch Area Under the Curve (AUC)"),
         ]
     )
+    assert AGGREGATE_STATISTIC_NAMES == ("Mean", "StDev", "CoV", "SEM")
 
 
 def test_excel_sheet_names():
@@ -71,10 +83,18 @@ def test_excel_sheet_names():
     assert CONTINUOUS_WAVEFORM_SHEET_NAME == "continuous-waveforms"
     assert AGGREGATE_METRICS_SHEET_NAME == "aggregate-metrics"
     assert PER_TWITCH_METRICS_SHEET_NAME == "per-twitch-metrics"
+    assert PER_TWITCH_TIMEPOINT_COLUMN_NAME == "Timepoint of Twitch Contraction"
     assert SNAPSHOT_CHART_SHEET_NAME == "continuous-waveform-snapshots"
     assert FULL_CHART_SHEET_NAME == "full-continuous-waveform-plots"
     assert TWITCH_FREQUENCIES_CHART_SHEET_NAME == "twitch-frequencies-plots"
     assert FORCE_FREQUENCY_RELATIONSHIP_SHEET == "force-frequency-relationship"
+    assert CHART_DATA_SHEET_NAME == "chart-data"
+    assert PEAKS_AND_VALLEYS_TABLE_NAME == "peaks-and-valleys"
+
+
+def test_h5_results_file():
+    assert H5_RESULTS_FILE_FORMAT_VERSION == "0.1.0"
+    assert H5_RESULTS_CHUNK_NUM_SAMPLES == 6000
 
 
 def test_excel_sheet_rows():
@@ -113,6 +133,8 @@ def test_charts():
         == CHART_WINDOW_NUM_SECONDS / INTERPOLATED_DATA_PERIOD_SECONDS
     )
     assert SECONDS_PER_CELL == 2.5
+    assert DEFAULT_CHART_MAX_POINTS == 5000
+    assert CHART_DATA_COLUMNS_PER_WELL == 8
 
 
 def test_excel_optical_metadata():
@@ -137,3 +159,17 @@ def test_excel_optical_metadata():
         MANTARRAY_SERIAL_NUMBER_UUID: "E7",
         INTERPOLATION_VALUE_UUID: "E8",
     }
+    assert CSV_OPTICAL_METADATA_ROWS == {
+        WELL_NAME_UUID: 0,
+        UTC_BEGINNING_RECORDING_UUID: 1,
+        PLATE_BARCODE_UUID: 2,
+        TISSUE_SAMPLING_PERIOD_UUID: 3,
+        TWITCHES_POINT_UP_UUID: 4,
+        MANTARRAY_SERIAL_NUMBER_UUID: 5,
+        INTERPOLATION_VALUE_UUID: 6,
+    }
+    assert CSV_OPTICAL_DATA_START_ROW == 8
+
+
+def test_analysis_cache_constants():
+    assert DEFAULT_ANALYSIS_CACHE_MAX_SIZE_BYTES == 1024 * 1024 * 1024
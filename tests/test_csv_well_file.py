@@ -0,0 +1,152 @@
+# -*- coding: utf-8 -*-
+import datetime
+import io
+import os
+import re
+import tempfile
+import zipfile
+
+from curibio.sdk import CsvWellFile
+from curibio.sdk import ExcelWellFile
+from curibio.sdk import MetadataNotFoundError
+from curibio.sdk import PlateRecording
+from mantarray_file_manager import PLATE_BARCODE_UUID
+from mantarray_file_manager import WELL_NAME_UUID
+import numpy as np
+import pytest
+from stdlib_utils import get_current_file_abs_directory
+
+from .fixtures import PATH_TO_FILLED_OPTICAL_TEMPLATE
+from .fixtures import PATH_TO_OPTICAL_PLATE_FOLDER
+
+PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
+
+PATH_OF_CSV_PLATE = os.path.join(
+    PATH_OF_CURRENT_FILE, "csv_optical_data", "Data_MA26_Plate2_CSV_2020-2"
+)
+
+
+@pytest.mark.parametrize(
+    "file_name",
+    ["optical_data_filled_template.csv", "optical_data_filled_template.tsv"],
+)
+def test_CsvWellFile__reads_same_metadata_and_data_as_excel_template(file_name):
+    excel_wf = ExcelWellFile(PATH_TO_FILLED_OPTICAL_TEMPLATE)
+    csv_wf = CsvWellFile(
+        os.path.join(PATH_OF_CURRENT_FILE, "csv_optical_data", file_name)
+    )
+
+    assert csv_wf.get_metadata() == excel_wf.get_metadata()
+    np.testing.assert_array_equal(
+        csv_wf.get_raw_tissue_reading(), excel_wf.get_raw_tissue_reading()
+    )
+    assert csv_wf.get_raw_tissue_reading().flags.c_contiguous is True
+
+
+def test_CsvWellFile__can_read_from_file_object_more_than_once():
+    file_path = os.path.join(
+        PATH_OF_CURRENT_FILE, "csv_optical_data", "optical_data_filled_template.csv"
+    )
+    with open(file_path, "rb") as csv_file:
+        file_obj = io.BytesIO(csv_file.read())
+
+    wf = CsvWellFile("A1.csv", lazy=True, file_obj=file_obj)
+    assert wf.get_well_name() == "A1"
+    assert wf.get_raw_tissue_reading().shape == (2, 1466)
+    assert file_obj.closed is False
+
+
+def test_CsvWellFile__treats_missing_metadata_values_as_empty():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "A1.csv")
+        with open(file_path, "w") as csv_file:
+            csv_file.write("Well name (i.e. A1),\nTimestamp\n")
+        wf = CsvWellFile(file_path, lazy=True)
+
+        assert wf.get_metadata().raw_values[WELL_NAME_UUID] is None
+        assert wf.get_metadata().raw_values[PLATE_BARCODE_UUID] is None
+        with pytest.raises(MetadataNotFoundError):
+            wf.get_well_name()
+
+
+@pytest.mark.parametrize(
+    "begin_recording,expected",
+    [
+        ("2020-10-12 04:40", datetime.datetime(2020, 10, 12, 4, 40)),
+        ("2020-10-12 04:40:30", datetime.datetime(2020, 10, 12, 4, 40, 30)),
+        ("2020-10-12 4:40", datetime.datetime(2020, 10, 12, 4, 40)),
+    ],
+)
+def test_CsvWellFile__get_begin_recording__parses_times_with_or_without_seconds(
+    begin_recording, expected
+):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "A1.csv")
+        with open(file_path, "w") as csv_file:
+            csv_file.write(f"Well name (i.e. A1),A1\nTimestamp,{begin_recording}\n")
+        wf = CsvWellFile(file_path, lazy=True)
+
+        assert wf.get_begin_recording() == expected
+
+
+def test_CsvWellFile__get_metadata__raises_error_for_malformed_time():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "A1.csv")
+        with open(file_path, "w") as csv_file:
+            csv_file.write("Well name (i.e. A1),A1\nTimestamp,12/10/2020 4:40\n")
+        wf = CsvWellFile(file_path, lazy=True)
+
+        with pytest.raises(ValueError, match=re.escape("'12/10/2020 4:40'")):
+            wf.get_metadata()
+
+
+@pytest.mark.parametrize("getter_name", ["get_h5_file", "get_h5_attribute"])
+def test_CsvWellFile__h5_getters_raise_error(getter_name):
+    wf = CsvWellFile(
+        os.path.join(
+            PATH_OF_CURRENT_FILE, "csv_optical_data", "optical_data_filled_template.csv"
+        ),
+        lazy=True,
+    )
+    getter = getattr(wf, getter_name)
+    args = ("File Format Version",) if getter_name == "get_h5_attribute" else tuple()
+    with pytest.raises(
+        NotImplementedError, match="CsvWellFiles do not store an H5 file"
+    ):
+        getter(*args)
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_PlateRecording__from_directory__loads_csv_files_like_excel_files(
+    max_workers,
+):
+    csv_pr = PlateRecording.from_directory(PATH_OF_CSV_PLATE, max_workers=max_workers)
+    excel_pr = PlateRecording.from_directory(PATH_TO_OPTICAL_PLATE_FOLDER)
+
+    assert csv_pr.get_well_indices() == excel_pr.get_well_indices() == (0, 1)
+    for iter_well_idx in (0, 1):
+        csv_wf = csv_pr.get_well_by_index(iter_well_idx)
+        assert isinstance(csv_wf, CsvWellFile)
+        np.testing.assert_array_equal(
+            csv_wf.get_raw_tissue_reading(),
+            excel_pr.get_well_by_index(iter_well_idx).get_raw_tissue_reading(),
+        )
+    np.testing.assert_array_equal(
+        csv_pr.get_reference_magnetic_data(0), excel_pr.get_reference_magnetic_data(0)
+    )
+
+
+def test_PlateRecording__from_zip__loads_csv_files():
+    zip_file = io.BytesIO()
+    with zipfile.ZipFile(zip_file, "w") as zip_ref:
+        for iter_file_name in os.listdir(PATH_OF_CSV_PLATE):
+            zip_ref.write(
+                os.path.join(PATH_OF_CSV_PLATE, iter_file_name),
+                arcname=f"Data_MA26_Plate2_CSV_2020-2/{iter_file_name}",
+            )
+    zip_file.seek(0)
+
+    pr = PlateRecording.from_zip(zip_file)
+
+    assert pr.get_well_indices() == (0, 1)
+    assert pr.get_well_by_index(1).get_raw_tissue_reading().shape == (2, 1143)
@@ -7,6 +7,7 @@ import zipfile
 
 from curibio.sdk import NUMBER_OF_PER_TWITCH_METRICS
 from curibio.sdk import PlateRecording
+from curibio.sdk import XlsxWritingOptions
 from curibio.sdk.constants import CALCULATED_METRIC_DISPLAY_NAMES
 from curibio.sdk.constants import PER_TWITCH_METRICS_SHEET_NAME
 from curibio.sdk.constants import TWENTY_FOUR_WELL_PLATE
@@ -571,7 +572,11 @@ def test_write_xlsx__creates_two_snapshot_charts_correctly(
 ):
     test_file_name = "test_chart.xlsx"
     with tempfile.TemporaryDirectory() as tmp_dir:
-        pr.write_xlsx(tmp_dir, file_name=test_file_name)
+        pr.write_xlsx(
+            tmp_dir,
+            file_name=test_file_name,
+            options=XlsxWritingOptions(chart_max_points=None),
+        )
         with zipfile.ZipFile(os.path.join(tmp_dir, test_file_name), "r") as zip_ref:
             zip_ref.extractall(tmp_dir)
 
@@ -831,7 +836,11 @@ def test_write_xlsx__creates_two_full_charts_correctly(
 ):
     test_file_name = "test_full.xlsx"
     with tempfile.TemporaryDirectory() as tmp_dir:
-        pr.write_xlsx(tmp_dir, file_name=test_file_name)
+        pr.write_xlsx(
+            tmp_dir,
+            file_name=test_file_name,
+            options=XlsxWritingOptions(chart_max_points=None),
+        )
         with zipfile.ZipFile(os.path.join(tmp_dir, test_file_name), "r") as zip_ref:
             zip_ref.extractall(tmp_dir)
 
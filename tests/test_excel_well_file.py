@@ -1,16 +1,28 @@
 # -*- coding: utf-8 -*-
 
+import dataclasses
 import datetime
+import io
 import os
+import pickle
+import re
 from shutil import copy
 import tempfile
 
+from curibio.sdk import excel_well_file
 from curibio.sdk import ExcelWellFile
 from curibio.sdk import MetadataNotFoundError
+from curibio.sdk import OpticalWellMetadata
 from curibio.sdk import PlateRecording
+from curibio.sdk import TWITCHES_POINT_UP_UUID
 from mantarray_file_manager import CURI_BIO_ACCOUNT_UUID
 from mantarray_file_manager import CURI_BIO_USER_ACCOUNT_ID
+from mantarray_file_manager import MANTARRAY_SERIAL_NUMBER_UUID
 from mantarray_file_manager import METADATA_UUID_DESCRIPTIONS
+from mantarray_file_manager import PLATE_BARCODE_UUID
+from mantarray_file_manager import SOFTWARE_BUILD_NUMBER_UUID
+from mantarray_file_manager import TISSUE_SAMPLING_PERIOD_UUID
+from mantarray_file_manager import UTC_BEGINNING_RECORDING_UUID
 from mantarray_file_manager import WELL_NAME_UUID
 import numpy as np
 from openpyxl import load_workbook
@@ -18,6 +30,8 @@ import pytest
 from stdlib_utils import get_current_file_abs_directory
 
 from .fixtures import fixture_generic_excel_well_file_0_1_0
+from .fixtures import PATH_TO_FILLED_OPTICAL_TEMPLATE
+from .fixtures import PATH_TO_OPTICAL_PLATE_FOLDER
 from .utils import get_cell_value
 
 
@@ -173,17 +187,143 @@ def test_ExcelWellFile__get_twitches_point_up(generic_excel_well_file_0_1_0):
     assert generic_excel_well_file_0_1_0.get_twitches_point_up() is True
 
 
-def test_ExcelWellFile__get_twitches_point_up__with_capital_Y(
-    generic_excel_well_file_0_1_0, mocker
-):
+def test_ExcelWellFile__get_twitches_point_up__with_capital_Y(mocker):
     # Tanner (10/20/20): mocking here to avoid having to create a new excel file just for this case.
     mocker.patch.object(
-        generic_excel_well_file_0_1_0,
-        "get_excel_metadata_value",
+        excel_well_file,
+        "_get_metadata_values",
         autospec=True,
-        return_value="Y",
+        return_value={TWITCHES_POINT_UP_UUID: "Y"},
+    )
+    ewf = ExcelWellFile(
+        PATH_TO_FILLED_OPTICAL_TEMPLATE,
+        lazy=True,
+    )
+    assert ewf.get_twitches_point_up() is True
+
+
+def test_ExcelWellFile__reads_all_metadata_only_once(mocker):
+    spied_metadata_reader = mocker.spy(excel_well_file, "_get_metadata_values")
+    ewf = ExcelWellFile(
+        PATH_TO_FILLED_OPTICAL_TEMPLATE,
+        lazy=True,
+    )
+    ewf.get_well_name()
+    ewf.get_well_index()
+    ewf.get_plate_barcode()
+    ewf.get_begin_recording()
+    ewf.get_tissue_sampling_period_microseconds()
+    ewf.get_twitches_point_up()
+    ewf.get_mantarray_serial_number()
+    ewf.get_interpolation_value()
+    ewf.get_excel_metadata_value(PLATE_BARCODE_UUID)
+    assert spied_metadata_reader.call_count == 1
+
+
+def test_ExcelWellFile__get_metadata__returns_parsed_snapshot(
+    generic_excel_well_file_0_1_0,
+):
+    actual = generic_excel_well_file_0_1_0.get_metadata()
+    assert isinstance(actual, OpticalWellMetadata)
+    assert actual.well_name == "A1"
+    assert actual.well_index == 0
+    assert actual.plate_barcode == "Test Barcode"
+    assert actual.begin_recording == datetime.datetime(2020, 10, 12, 4, 40)
+    assert actual.tissue_sampling_period_microseconds == 16667
+    assert actual.twitches_point_up is True
+    assert actual.mantarray_serial_number == "Test Name"
+    assert actual.interpolation_value_microseconds == 0.0123e6
+    assert actual.raw_values[PLATE_BARCODE_UUID] == "Test Barcode"
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        actual.well_name = "B1"
+
+
+def test_OpticalWellMetadata__from_raw_values__leaves_missing_values_as_None():
+    actual = OpticalWellMetadata.from_raw_values({PLATE_BARCODE_UUID: "Test Barcode"})
+    assert actual.plate_barcode == "Test Barcode"
+    assert actual.well_name is None
+    assert actual.well_index is None
+    assert actual.begin_recording is None
+    assert actual.tissue_sampling_period_microseconds is None
+    assert actual.twitches_point_up is False
+    assert actual.interpolation_value_microseconds is None
+
+
+def test_OpticalWellMetadata__from_raw_values__raises_error_for_malformed_value():
+    with pytest.raises(ValueError, match=re.escape("'not a timestamp'")):
+        OpticalWellMetadata.from_raw_values(
+            {
+                WELL_NAME_UUID: "A1",
+                PLATE_BARCODE_UUID: "Test Barcode",
+                UTC_BEGINNING_RECORDING_UUID: "not a timestamp",
+            }
+        )
+
+
+@pytest.mark.parametrize(
+    "getter_name,expected_metadata_uuid",
+    [
+        ("get_well_name", WELL_NAME_UUID),
+        ("get_well_index", WELL_NAME_UUID),
+        ("get_plate_barcode", PLATE_BARCODE_UUID),
+        ("get_begin_recording", UTC_BEGINNING_RECORDING_UUID),
+        ("get_tissue_sampling_period_microseconds", TISSUE_SAMPLING_PERIOD_UUID),
+        ("get_mantarray_serial_number", MANTARRAY_SERIAL_NUMBER_UUID),
+    ],
+)
+def test_ExcelWellFile__getters_raise_error_when_metadata_is_missing(
+    mocker, getter_name, expected_metadata_uuid
+):
+    mocker.patch.object(
+        excel_well_file, "_get_metadata_values", autospec=True, return_value={}
+    )
+    ewf = ExcelWellFile(
+        PATH_TO_FILLED_OPTICAL_TEMPLATE,
+        lazy=True,
+    )
+    with pytest.raises(
+        MetadataNotFoundError,
+        match=re.escape(METADATA_UUID_DESCRIPTIONS[expected_metadata_uuid]),
+    ):
+        getattr(ewf, getter_name)()
+
+
+def test_ExcelWellFile__get_excel_metadata_value__raises_error_for_metadata_not_in_excel_files(
+    generic_excel_well_file_0_1_0,
+):
+    with pytest.raises(NotImplementedError):
+        generic_excel_well_file_0_1_0.get_excel_metadata_value(
+            SOFTWARE_BUILD_NUMBER_UUID
+        )
+
+
+def test_ExcelWellFile__can_be_pickled_without_workbook(generic_excel_well_file_0_1_0):
+    generic_excel_well_file_0_1_0._get_excel_sheet()  # pylint: disable=protected-access # make sure an open sheet is not pickled
+    actual = pickle.loads(pickle.dumps(generic_excel_well_file_0_1_0))
+    assert actual._excel_sheet is None  # pylint: disable=protected-access
+    assert actual.get_metadata() == generic_excel_well_file_0_1_0.get_metadata()
+    np.testing.assert_array_equal(
+        actual.get_raw_tissue_reading(),
+        generic_excel_well_file_0_1_0.get_raw_tissue_reading(),
+    )
+
+
+def test_ExcelWellFile__pickles_file_object_only_until_data_is_read():
+    with open(PATH_TO_FILLED_OPTICAL_TEMPLATE, "rb") as in_file:
+        file_obj = io.BytesIO(in_file.read())
+    well_file = ExcelWellFile(
+        PATH_TO_FILLED_OPTICAL_TEMPLATE, lazy=True, file_obj=file_obj
+    )
+    well_file.get_metadata()
+    unpickled = pickle.loads(pickle.dumps(well_file))
+    assert unpickled._file_obj is not None  # pylint: disable=protected-access
+
+    well_file.get_raw_tissue_reading()
+    unpickled = pickle.loads(pickle.dumps(well_file))
+    assert unpickled._file_obj is None  # pylint: disable=protected-access
+    np.testing.assert_array_equal(
+        unpickled.get_raw_tissue_reading(), well_file.get_raw_tissue_reading()
     )
-    assert generic_excel_well_file_0_1_0.get_twitches_point_up() is True
 
 
 def test_ExcelWellFile__get_raw_tissue_reading(generic_excel_well_file_0_1_0):
@@ -196,10 +336,89 @@ def test_ExcelWellFile__get_raw_tissue_reading(generic_excel_well_file_0_1_0):
     np.testing.assert_almost_equal(raw_tissue_reading[1][-1], 104.7408281)
 
 
+def test_ExcelWellFile__get_raw_tissue_reading__bulk_reader_matches_cell_by_cell_reader(
+    generic_excel_well_file_0_1_0,
+):
+    sheet = (
+        generic_excel_well_file_0_1_0._get_excel_sheet()  # pylint: disable=protected-access # comparing against the original reader
+    )
+    get_col_as_array = (
+        excel_well_file._get_col_as_array  # pylint: disable=protected-access # comparing against the original reader
+    )
+    expected = np.array((get_col_as_array(sheet, 1, 0), get_col_as_array(sheet, 1, 1)))
+    actual = generic_excel_well_file_0_1_0.get_raw_tissue_reading()
+    assert actual.dtype == np.float64
+    np.testing.assert_array_equal(actual, expected)
+
+
+def test_ExcelWellFile__get_raw_tissue_reading__falls_back_to_cell_by_cell_reader_if_bulk_reader_fails(
+    mocker,
+):
+    mocked_bulk_reader = mocker.patch.object(
+        excel_well_file,
+        "_get_tissue_columns_in_bulk",
+        autospec=True,
+        side_effect=ValueError("unreadable sheet"),
+    )
+    spied_col_reader = mocker.spy(excel_well_file, "_get_col_as_array")
+
+    ewf = ExcelWellFile(PATH_TO_FILLED_OPTICAL_TEMPLATE)
+    raw_tissue_reading = ewf.get_raw_tissue_reading()
+
+    assert mocked_bulk_reader.call_count == 1
+    assert spied_col_reader.call_count == 2
+    assert raw_tissue_reading.shape == (2, 1466)
+    np.testing.assert_almost_equal(raw_tissue_reading[1][-1], 104.7408281)
+
+
+def test_ExcelWellFile__lazy__does_not_open_workbook_until_data_is_needed(mocker):
+    spied_metadata_reader = mocker.spy(excel_well_file, "_get_metadata_values")
+    spied_bulk_reader = mocker.spy(excel_well_file, "_get_tissue_columns_in_bulk")
+
+    ewf = ExcelWellFile(
+        PATH_TO_FILLED_OPTICAL_TEMPLATE,
+        lazy=True,
+    )
+    assert spied_metadata_reader.call_count == 0
+    assert spied_bulk_reader.call_count == 0
+
+    assert ewf.get_well_name() == "A1"
+    assert spied_metadata_reader.call_count == 1
+    assert spied_bulk_reader.call_count == 0
+
+    assert ewf.get_raw_reference_reading().shape == (2, 1466)
+    assert ewf.get_raw_reference_reading() is ewf.get_raw_reference_reading()
+    assert ewf.get_raw_tissue_reading().shape == (2, 1466)
+    assert spied_metadata_reader.call_count == 1
+    assert spied_bulk_reader.call_count == 1
+
+
+def test_PlateRecording__from_directory__does_not_parse_optical_data_until_it_is_needed(
+    mocker,
+):
+    spied_bulk_reader = mocker.spy(excel_well_file, "_get_tissue_columns_in_bulk")
+    pr = PlateRecording.from_directory(PATH_TO_OPTICAL_PLATE_FOLDER)
+    assert pr.get_well_indices() == (0, 1)
+    assert spied_bulk_reader.call_count == 0
+
+    pr.get_reference_magnetic_data(0)
+    assert spied_bulk_reader.call_count == 2
+
+
 def test_ExcelWellFile__get_raw_reference_reading(generic_excel_well_file_0_1_0):
     assert generic_excel_well_file_0_1_0.get_raw_reference_reading().shape == (2, 1466)
 
 
+def test_ExcelWellFile__get_raw_reference_reading__is_a_read_only_view_of_zeros(
+    generic_excel_well_file_0_1_0,
+):
+    actual = generic_excel_well_file_0_1_0.get_raw_reference_reading()
+    assert actual.strides == (0, 0)
+    assert actual.flags.writeable is False
+    assert actual.dtype == np.float64
+    np.testing.assert_array_equal(actual, np.zeros((2, 1466)))
+
+
 def test_ExcelWellFile__get_interpolation_value__returns_data_period_if_no_value_is_given():
     wf = ExcelWellFile(
         os.path.join(
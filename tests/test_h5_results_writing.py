@@ -0,0 +1,197 @@
+# -*- coding: utf-8 -*-
+import os
+
+from curibio.sdk import AGGREGATE_STATISTIC_NAMES
+from curibio.sdk import H5_RESULTS_FILE_FORMAT_VERSION
+from curibio.sdk import h5_results_writing
+from curibio.sdk import PlateRecording
+from curibio.sdk.constants import PACKAGE_VERSION
+from curibio.sdk.constants import TWENTY_FOUR_WELL_PLATE
+import h5py
+from mantarray_file_manager import MAIN_FIRMWARE_VERSION_UUID
+from mantarray_file_manager import MANTARRAY_SERIAL_NUMBER_UUID
+from mantarray_file_manager import PLATE_BARCODE_UUID
+from mantarray_file_manager import UTC_BEGINNING_RECORDING_UUID
+import numpy as np
+
+from .fixtures import fixture_generic_excel_well_file_0_1_0
+from .fixtures import fixture_generic_well_file_0_3_1
+from .fixtures import fixture_generic_well_file_0_3_1__2
+from .fixtures import fixture_plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+
+__fixtures__ = (
+    fixture_generic_excel_well_file_0_1_0,
+    fixture_generic_well_file_0_3_1,
+    fixture_generic_well_file_0_3_1__2,
+    fixture_plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+)
+
+
+def test_write_h5_results__writes_metadata_as_attributes_named_by_uuid(
+    plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    file_path = os.path.join(tmp_dir, "results.h5")
+    first_well_file = pr.get_well_by_index(pr.get_well_indices()[0])
+
+    pr.write_h5_results(file_path)
+
+    with h5py.File(file_path, "r") as h5_file:
+        assert h5_file.attrs["File Format Version"] == H5_RESULTS_FILE_FORMAT_VERSION
+        assert h5_file.attrs["SDK Version"] == PACKAGE_VERSION
+        assert (
+            h5_file.attrs[str(PLATE_BARCODE_UUID)]
+            == first_well_file.get_plate_barcode()
+        )
+        assert (
+            h5_file.attrs[str(UTC_BEGINNING_RECORDING_UUID)]
+            == first_well_file.get_begin_recording().isoformat()
+        )
+        assert (
+            h5_file.attrs[str(MANTARRAY_SERIAL_NUMBER_UUID)]
+            == first_well_file.get_mantarray_serial_number()
+        )
+        assert h5_file.attrs[
+            str(MAIN_FIRMWARE_VERSION_UUID)
+        ] == first_well_file.get_h5_attribute(str(MAIN_FIRMWARE_VERSION_UUID))
+
+
+def test_write_h5_results__writes_analysis_results_of_each_well(
+    mocker, plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    file_path = os.path.join(tmp_dir, "results.h5")
+    analysis_result = pr.analyze()
+    spied_analyze = mocker.spy(PlateRecording, "analyze")
+
+    pr.write_h5_results(file_path, analysis_result=analysis_result)
+
+    spied_analyze.assert_not_called()
+    with h5py.File(file_path, "r") as h5_file:
+        # pylint: disable=no-member # pylint infers the datasets of the file as groups
+        np.testing.assert_array_equal(
+            h5_file["well_indices"][()], analysis_result.well_indices
+        )
+        well_names = h5_file["well_names"].asstr()[()].tolist()
+        assert well_names == [
+            TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(iter_well_idx)
+            for iter_well_idx in analysis_result.well_indices
+        ]
+        np.testing.assert_array_equal(
+            h5_file["resampled_times"][()], analysis_result.resampled_times
+        )
+        np.testing.assert_array_equal(
+            h5_file["resampled_waveforms"][()], analysis_result.resampled_waveforms.T
+        )
+        np.testing.assert_array_equal(
+            h5_file["twitch_counts"][()], analysis_result.twitch_counts
+        )
+        np.testing.assert_array_equal(
+            h5_file["aggregate_statistics"][()], analysis_result.aggregate_statistics
+        )
+        assert h5_file["aggregate_statistics"].attrs[
+            "Statistic Names"
+        ].tolist() == list(AGGREGATE_STATISTIC_NAMES)
+
+        for iter_well_position, iter_well_name in enumerate(well_names):
+            well_result = analysis_result.well_results[iter_well_position]
+            well_group = h5_file["wells"][iter_well_name]
+            assert well_group.attrs["Well Index"] == well_result.well_index
+            assert well_group.attrs["Error Message"] == (
+                well_result.error_message or ""
+            )
+            np.testing.assert_array_equal(
+                well_group["filtered_data"][()], well_result.filtered_data
+            )
+            peak_indices, valley_indices = well_result.peak_and_valley_indices
+            np.testing.assert_array_equal(well_group["peak_indices"][()], peak_indices)
+            np.testing.assert_array_equal(
+                well_group["valley_indices"][()], valley_indices
+            )
+            per_twitch_table = analysis_result.per_twitch_tables[iter_well_position]
+            if per_twitch_table is None:
+                assert len(well_group["per_twitch_metrics"]) == 0
+                continue
+            assert set(well_group["per_twitch_metrics"]) == set(per_twitch_table)
+            for iter_column_name, iter_values in per_twitch_table.items():
+                np.testing.assert_array_equal(
+                    well_group["per_twitch_metrics"][iter_column_name][()], iter_values
+                )
+
+
+def test_write_h5_results__writes_waveforms_in_compressed_chunks_of_time(
+    mocker, plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    file_path = os.path.join(tmp_dir, "results.h5")
+    analysis_result = pr.analyze()
+    chunk_num_samples = (
+        100  # the recordings in the fixture are shorter than the default chunk
+    )
+    mocker.patch.object(
+        h5_results_writing,
+        "H5_RESULTS_CHUNK_NUM_SAMPLES",
+        chunk_num_samples,
+        autospec=False,
+    )
+
+    pr.write_h5_results(file_path, analysis_result=analysis_result)
+
+    with h5py.File(file_path, "r") as h5_file:
+        # pylint: disable=no-member # pylint infers the datasets of the file as groups
+        waveforms = h5_file["resampled_waveforms"]
+        num_samples = waveforms.shape[1]
+        assert num_samples > chunk_num_samples
+        assert waveforms.chunks == (1, chunk_num_samples)
+        assert waveforms.compression == "gzip"
+        filtered_data = h5_file["wells"][h5_file["well_names"].asstr()[0]][
+            "filtered_data"
+        ]
+        assert filtered_data.chunks == (
+            1,
+            min(filtered_data.shape[1], chunk_num_samples),
+        )
+        assert filtered_data.compression == "gzip"
+
+        window_start = num_samples // 2
+        window_stop = window_start + chunk_num_samples
+        window = np.s_[1, window_start:window_stop]
+        np.testing.assert_array_equal(
+            waveforms[window], analysis_result.resampled_waveforms.T[window]
+        )
+
+
+def test_write_h5_results__writes_uncompressed_datasets_if_compression_is_none(
+    plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    file_path = os.path.join(tmp_dir, "results.h5")
+
+    pr.write_h5_results(file_path, compression=None)
+
+    with h5py.File(file_path, "r") as h5_file:
+        # pylint: disable=no-member # pylint infers the datasets of the file as groups
+        assert h5_file["resampled_waveforms"].compression is None
+        assert h5_file["resampled_waveforms"].chunks is not None
+
+
+def test_write_h5_results__writes_only_recording_metadata_of_optical_files(
+    tmp_path, generic_excel_well_file_0_1_0
+):
+    pr = PlateRecording([generic_excel_well_file_0_1_0])
+    file_path = os.path.join(tmp_path, "results.h5")
+
+    pr.write_h5_results(file_path)
+
+    with h5py.File(file_path, "r") as h5_file:
+        # pylint: disable=no-member # pylint infers the datasets of the file as groups
+        assert (
+            h5_file.attrs[str(PLATE_BARCODE_UUID)]
+            == generic_excel_well_file_0_1_0.get_plate_barcode()
+        )
+        assert (
+            h5_file.attrs[str(UTC_BEGINNING_RECORDING_UUID)]
+            == generic_excel_well_file_0_1_0.get_begin_recording().isoformat()
+        )
+        assert str(MANTARRAY_SERIAL_NUMBER_UUID) not in h5_file.attrs
+        assert h5_file["resampled_waveforms"].shape[0] == 1
@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+import json
+import time
+import tracemalloc
+
+from curibio.sdk import StageRecorder
+import pytest
+
+
+def test_StageRecorder__measures_nested_stages_in_order_they_began():
+    recorder = StageRecorder()
+
+    with recorder.measure("outer"):
+        with recorder.measure("inner", well_index=3):
+            time.sleep(0.01)
+        with recorder.measure("inner", well_index=4):
+            pass
+
+    report = recorder.get_report()
+    assert [(stage.name, stage.well_index, stage.depth) for stage in report.stages] == [
+        ("outer", None, 0),
+        ("inner", 3, 1),
+        ("inner", 4, 1),
+    ]
+    outer, first_inner, second_inner = report.stages
+    assert outer.start_seconds == 0
+    assert first_inner.duration_seconds >= 0.01
+    assert second_inner.start_seconds >= first_inner.duration_seconds
+    assert outer.duration_seconds >= (
+        first_inner.duration_seconds + second_inner.duration_seconds
+    )
+    assert outer.peak_memory_bytes is None
+    assert outer.memory_change_bytes is None
+    assert report.traced_memory is False
+
+
+def test_StageRecorder__measures_stage_that_raises_error():
+    recorder = StageRecorder()
+
+    with pytest.raises(ValueError):
+        with recorder.measure("failing"):
+            raise ValueError()
+
+    assert [stage.name for stage in recorder.get_report().stages] == ["failing"]
+
+
+def test_StageRecorder__does_not_measure_stages_if_not_enabled():
+    recorder = StageRecorder(enabled=False)
+
+    with recorder.measure("stage"):
+        pass
+
+    assert recorder.get_report().stages == tuple()
+
+
+@pytest.mark.parametrize("is_reset_peak_removed", [False, True])
+def test_StageRecorder__traces_peak_memory_of_each_stage_including_nested_stages(
+    monkeypatch, is_reset_peak_removed
+):
+    if is_reset_peak_removed:
+        # tracemalloc.reset_peak was added in Python 3.9, and the traces are cleared instead before then
+        monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    recorder = StageRecorder(trace_memory=True)
+    num_bytes = 10 * 1024 * 1024
+    # other small objects may be freed during the stages
+    tolerance_bytes = num_bytes // 100
+
+    with recorder.measure("outer"):
+        with recorder.measure("allocating"):
+            allocated = bytearray(num_bytes)
+            del allocated
+        with recorder.measure("keeping"):
+            kept = bytearray(num_bytes // 2)
+
+    assert not tracemalloc.is_tracing()
+    report = recorder.get_report()
+    assert report.traced_memory is True
+    outer, allocating, keeping = report.stages
+    assert allocating.peak_memory_bytes >= num_bytes - tolerance_bytes
+    assert allocating.memory_change_bytes < tolerance_bytes
+    assert num_bytes // 2 - tolerance_bytes <= keeping.peak_memory_bytes < num_bytes
+    assert keeping.memory_change_bytes >= num_bytes // 2 - tolerance_bytes
+    # the peak of the first nested stage is kept, even though it was reset for the second
+    assert outer.peak_memory_bytes >= num_bytes - tolerance_bytes
+    assert len(kept) == num_bytes // 2
+
+
+@pytest.mark.parametrize("is_reset_peak_removed", [False, True])
+def test_StageRecorder__leaves_tracemalloc_running_if_it_was_already_tracing(
+    monkeypatch, is_reset_peak_removed
+):
+    if is_reset_peak_removed:
+        monkeypatch.delattr(tracemalloc, "reset_peak", raising=False)
+    tracemalloc.start()
+    try:
+        recorder = StageRecorder(trace_memory=True)
+        with recorder.measure("stage"):
+            pass
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+
+
+def test_StageReport__gets_stages_by_name_and_well_and_total_seconds():
+    recorder = StageRecorder()
+    for well_index in (0, 1):
+        with recorder.measure("well", well_index):
+            pass
+    with recorder.measure("plate"):
+        pass
+    report = recorder.get_report()
+
+    assert [stage.well_index for stage in report.get_stages("well")] == [0, 1]
+    assert report.get_stages("well", well_index=1) == [report.stages[1]]
+    assert report.get_total_seconds("well") == pytest.approx(
+        report.stages[0].duration_seconds + report.stages[1].duration_seconds
+    )
+
+
+def test_StageReport__writes_measurements_as_json(tmp_path):
+    recorder = StageRecorder()
+    with recorder.measure("stage", 5):
+        pass
+    report = recorder.get_report()
+    file_path = tmp_path / "report.json"
+
+    report.write_json(str(file_path))
+
+    actual = json.loads(file_path.read_text())
+    assert actual == json.loads(report.to_json())
+    assert actual["traced_memory"] is False
+    assert actual["stages"] == [
+        {
+            "name": "stage",
+            "well_index": 5,
+            "depth": 0,
+            "start_seconds": 0.0,
+            "duration_seconds": report.stages[0].duration_seconds,
+            "peak_memory_bytes": None,
+            "memory_change_bytes": None,
+        }
+    ]
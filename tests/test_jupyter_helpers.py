@@ -1,13 +1,83 @@
 # -*- coding: utf-8 -*-
+from http.server import BaseHTTPRequestHandler
+from http.server import ThreadingHTTPServer
+import json
+import os
+import threading
+import time
+
 from curibio.sdk import __version__
 from curibio.sdk import check_if_latest_version
 from curibio.sdk import get_latest_version_from_pypi
 from curibio.sdk import jupyter_helpers
+from curibio.sdk.jupyter_helpers import get_latest_version
+from curibio.sdk.jupyter_helpers import get_version_cache_file_path
+from curibio.sdk.jupyter_helpers import OFFLINE_ENV_VAR
+from curibio.sdk.jupyter_helpers import VERSION_CHECK_TIMEOUT_SECONDS
 import pytest
 import requests
 import semver
 
 
+class _LocalPyPI:
+    """A local HTTP server standing in for the JSON API of PyPI."""
+
+    def __init__(self) -> None:
+        self.latest_version = "99.0.0"
+        self.delay_seconds = 0.0
+        self.num_requests = 0
+        local_pypi = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(
+                self,
+            ):  # pylint: disable=invalid-name # name required by BaseHTTPRequestHandler
+                local_pypi.num_requests += 1
+                time.sleep(local_pypi.delay_seconds)
+                body = json.dumps(
+                    {"info": {"version": local_pypi.latest_version}}
+                ).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(
+                self, *args
+            ):  # pylint: disable=arguments-differ # keep test output quiet
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._server.daemon_threads = True
+        self._server_thread = threading.Thread(target=self._server.serve_forever)
+        self.url = f"http://127.0.0.1:{self._server.server_port}/pypi/curibio.sdk/json"
+
+    def start(self) -> None:
+        self._server_thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        self._server_thread.join()
+
+
+@pytest.fixture(autouse=True, name="version_cache_dir")
+def fixture_version_cache_dir(tmp_path, monkeypatch):
+    # keep the tests from using the cache of the user running them
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    monkeypatch.delenv(OFFLINE_ENV_VAR, raising=False)
+    yield tmp_path
+
+
+@pytest.fixture(name="local_pypi")
+def fixture_local_pypi():
+    local_pypi = _LocalPyPI()
+    local_pypi.start()
+    yield local_pypi
+    local_pypi.stop()
+
+
 @pytest.mark.slow  # connects to actual PyPI website
 def test_get_latest_version_from_pypi__When_invoked_to_real_PyPI_url__Then_it_returns_something_that_looks_like_semver():
     actual = get_latest_version_from_pypi()
@@ -33,7 +103,9 @@ def test_get_latest_version_from_pypi__Given_Response_json_is_mocked_to_return_a
 
     actual = get_latest_version_from_pypi()
 
-    mocked_get.assert_called_once_with("https://pypi.org/pypi/curibio.sdk/json")
+    mocked_get.assert_called_once_with(
+        "https://pypi.org/pypi/curibio.sdk/json", timeout=VERSION_CHECK_TIMEOUT_SECONDS
+    )
 
     assert actual == expected
 
@@ -68,3 +140,162 @@ def test_check_if_latest_version__Given_pypi_is_mocked_to_return_current_version
     mocked_print = mocker.patch("builtins.print", autospec=True)
     check_if_latest_version()
     assert mocked_print.call_count == 0
+
+
+def test_get_latest_version_from_pypi__returns_version_from_given_url(local_pypi):
+    assert get_latest_version_from_pypi(url=local_pypi.url) == "99.0.0"
+
+
+def test_get_latest_version_from_pypi__raises_error_if_server_does_not_respond_within_timeout(
+    local_pypi,
+):
+    local_pypi.delay_seconds = 2
+
+    with pytest.raises(requests.Timeout):
+        get_latest_version_from_pypi(timeout=0.1, url=local_pypi.url)
+
+
+def test_get_latest_version__caches_version_until_ttl_expires(local_pypi):
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+    local_pypi.latest_version = "100.0.0"
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+    assert local_pypi.num_requests == 1
+
+    with open(get_version_cache_file_path(), "r", encoding="utf-8") as cache_file:
+        cached = json.load(cache_file)
+    cached["checked_at"] -= 61
+    with open(get_version_cache_file_path(), "w", encoding="utf-8") as cache_file:
+        json.dump(cached, cache_file)
+
+    assert get_latest_version(ttl_seconds=60, url=local_pypi.url) == "100.0.0"
+    assert local_pypi.num_requests == 2
+
+
+def test_get_latest_version__ignores_version_cached_by_another_version_of_the_sdk(
+    local_pypi, monkeypatch
+):
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+    local_pypi.latest_version = "100.0.0"
+    monkeypatch.setattr(jupyter_helpers, "PACKAGE_VERSION", "99.0.0")
+
+    assert get_latest_version(url=local_pypi.url) == "100.0.0"
+    assert local_pypi.num_requests == 2
+
+
+def test_check_if_latest_version__prints_nothing_after_upgrading_to_cached_latest_version(
+    local_pypi, monkeypatch, capsys
+):
+    monkeypatch.setattr(jupyter_helpers, "PACKAGE_VERSION", "98.0.0")
+    check_if_latest_version(url=local_pypi.url)
+    assert "99.0.0 is available" in capsys.readouterr().out
+    monkeypatch.setattr(jupyter_helpers, "PACKAGE_VERSION", "99.0.0")
+    local_pypi.latest_version = "99.0.0"
+
+    check_if_latest_version(url=local_pypi.url)
+    assert capsys.readouterr().out == ""
+
+
+def test_get_latest_version__ignores_invalid_cache_file(local_pypi):
+    cache_file_path = get_version_cache_file_path()
+    os.makedirs(os.path.dirname(cache_file_path))
+    with open(cache_file_path, "w", encoding="utf-8") as cache_file:
+        cache_file.write("not json")
+
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+    assert local_pypi.num_requests == 1
+
+
+def test_get_latest_version__returns_version_if_it_cannot_be_cached(
+    local_pypi, version_cache_dir
+):
+    (version_cache_dir / "curibio.sdk").write_text("a file where the folder should be")
+
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+    assert local_pypi.num_requests == 2
+
+
+def test_get_latest_version__removes_temporary_file_if_cache_file_cannot_be_replaced(
+    local_pypi, version_cache_dir, monkeypatch
+):
+    def replace_cache_file(*_):
+        raise PermissionError("cache file is read-only")
+
+    monkeypatch.setattr(jupyter_helpers.os, "replace", replace_cache_file)
+
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+    assert list((version_cache_dir / "curibio.sdk").iterdir()) == []
+
+
+@pytest.mark.parametrize("offline_value", ["1", "true"])
+def test_get_latest_version__does_not_connect_to_pypi_when_offline(
+    offline_value, local_pypi, monkeypatch
+):
+    monkeypatch.setenv(OFFLINE_ENV_VAR, offline_value)
+
+    assert get_latest_version(url=local_pypi.url) is None
+    assert local_pypi.num_requests == 0
+
+
+def test_get_latest_version__uses_cached_version_when_offline(local_pypi, monkeypatch):
+    get_latest_version(url=local_pypi.url)
+    monkeypatch.setenv(OFFLINE_ENV_VAR, "1")
+
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+    assert local_pypi.num_requests == 1
+
+
+def test_get_latest_version__connects_to_pypi_when_offline_switch_is_0(
+    local_pypi, monkeypatch
+):
+    monkeypatch.setenv(OFFLINE_ENV_VAR, "0")
+
+    assert get_latest_version(url=local_pypi.url) == "99.0.0"
+
+
+def test_get_latest_version__returns_None_if_pypi_cannot_be_reached(local_pypi):
+    local_pypi.delay_seconds = 2
+
+    assert get_latest_version(timeout=0.1, url=local_pypi.url) is None
+    assert not os.path.exists(get_version_cache_file_path())
+
+
+def test_get_version_cache_file_path__uses_home_folder_if_xdg_cache_home_is_not_set(
+    tmp_path, monkeypatch
+):
+    monkeypatch.delenv("XDG_CACHE_HOME")
+    monkeypatch.setenv("HOME", str(tmp_path))
+
+    assert get_version_cache_file_path() == os.path.join(
+        str(tmp_path), ".cache", "curibio.sdk", "latest-version.json"
+    )
+
+
+def test_check_if_latest_version__prints_nothing_if_pypi_does_not_respond_within_timeout(
+    mocker, local_pypi
+):
+    mocked_print = mocker.patch("builtins.print", autospec=True)
+    local_pypi.delay_seconds = 2
+
+    start = time.perf_counter()
+    actual = check_if_latest_version(timeout=0.1, url=local_pypi.url)
+
+    assert actual is None
+    assert time.perf_counter() - start < local_pypi.delay_seconds
+    mocked_print.assert_not_called()
+
+
+def test_check_if_latest_version__returns_without_waiting_for_pypi_in_background(
+    mocker, local_pypi
+):
+    mocked_print = mocker.patch("builtins.print", autospec=True)
+    local_pypi.delay_seconds = 1
+
+    start = time.perf_counter()
+    thread = check_if_latest_version(background=True, url=local_pypi.url)
+
+    assert time.perf_counter() - start < local_pypi.delay_seconds
+    assert thread.daemon is True
+    thread.join(timeout=5)
+    assert not thread.is_alive()
+    assert "99.0.0" in mocked_print.call_args[0][0]
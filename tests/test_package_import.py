@@ -0,0 +1,91 @@
+# -*- coding: utf-8 -*-
+import subprocess
+import sys
+
+import curibio.sdk
+from curibio.sdk import PlateRecording
+from curibio.sdk.plate_recording import PlateRecording as PlateRecordingInModule
+import pytest
+
+# importing the package should only take a few milliseconds, this leaves room for slow machines
+MAX_PACKAGE_IMPORT_SECONDS = 0.5
+
+HEAVY_MODULES = (
+    "numpy",
+    "scipy",
+    "matplotlib",
+    "h5py",
+    "xlsxwriter",
+    "openpyxl",
+    "requests",
+    "mantarray_waveform_analysis",
+    "mantarray_file_manager",
+)
+
+
+def _run_in_new_interpreter(code: str) -> str:
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stderr
+
+
+def test_import__does_not_import_heavy_dependencies():
+    output = _run_in_new_interpreter(
+        "import sys\n"
+        "import curibio.sdk\n"
+        f"imported = [name for name in {HEAVY_MODULES!r} if name in sys.modules]\n"
+        "assert not imported, imported\n"
+    )
+
+    assert (
+        "curibio.sdk.plate_recording"
+        not in output  # pylint: disable=unsupported-membership-test # pylint doesn't infer that the output of subprocess.run is text when text=True
+    )
+
+
+def _get_package_import_seconds() -> float:
+    output = _run_in_new_interpreter("import curibio.sdk")
+    # each line is "import time: <self us> | <cumulative us> | <module>"
+    package_line = [
+        line for line in output.splitlines() if line.endswith("| curibio.sdk")
+    ][0]
+    return int(package_line.split("|")[1]) / 1e6
+
+
+@pytest.mark.benchmark  # the import time depends on the load of the machine running the tests
+def test_import__takes_less_than_max_seconds():
+    # the fastest of a few imports, so that other processes slowing one down don't fail the test
+    fastest_seconds = min(_get_package_import_seconds() for _ in range(3))
+
+    assert fastest_seconds < MAX_PACKAGE_IMPORT_SECONDS
+
+
+def test_import__of_PlateRecording_does_not_configure_logging_or_import_pyplot():
+    _run_in_new_interpreter(
+        "import logging\n"
+        "import sys\n"
+        "handlers = list(logging.getLogger().handlers)\n"
+        "from curibio.sdk import PlateRecording\n"
+        "assert logging.getLogger().handlers == handlers\n"
+        "assert 'matplotlib.pyplot' not in sys.modules\n"
+    )
+
+
+def test_package__loads_each_public_name_from_its_module():
+    assert PlateRecording is PlateRecordingInModule
+    for name in curibio.sdk.__all__:
+        assert getattr(curibio.sdk, name) is not None
+    assert curibio.sdk.__version__ == curibio.sdk.constants.PACKAGE_VERSION
+    assert curibio.sdk.jupyter_helpers.__name__ == "curibio.sdk.jupyter_helpers"
+
+
+def test_package__lists_public_names_in_dir():
+    assert set(curibio.sdk.__all__) <= set(dir(curibio.sdk))
+
+
+def test_package__raises_error_for_unknown_name():
+    with pytest.raises(AttributeError, match="has no attribute 'PlateRecordings'"):
+        curibio.sdk.PlateRecordings  # pylint: disable=pointless-statement
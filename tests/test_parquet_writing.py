@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+import datetime
+import os
+import sys
+
+from curibio.sdk import AGGREGATE_METRICS_SHEET_NAME
+from curibio.sdk import AGGREGATE_STATISTIC_NAMES
+from curibio.sdk import CONTINUOUS_WAVEFORM_SHEET_NAME
+from curibio.sdk import PEAKS_AND_VALLEYS_TABLE_NAME
+from curibio.sdk import PER_TWITCH_METRICS_SHEET_NAME
+from curibio.sdk import PlateRecording
+from curibio.sdk.constants import TWENTY_FOUR_WELL_PLATE
+from curibio.sdk.parquet_writing import get_arrow_tables
+from mantarray_waveform_analysis import CENTIMILLISECONDS_PER_SECOND
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+
+from .fixtures import fixture_generic_well_file_0_3_1
+from .fixtures import fixture_generic_well_file_0_3_1__2
+from .fixtures import fixture_plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+
+__fixtures__ = (
+    fixture_generic_well_file_0_3_1,
+    fixture_generic_well_file_0_3_1__2,
+    fixture_plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+)
+
+
+def _get_well_rows(table, well_name):
+    return table.filter(
+        np.array(table["Well Name"].to_pylist(), dtype=object) == well_name
+    )
+
+
+def _assert_waveform_rows(waveforms, well_name, analysis_result, well_position):
+    first_index, last_index = analysis_result.resampling_bounds[well_position]
+    well_waveform = _get_well_rows(waveforms, well_name)
+    np.testing.assert_array_equal(
+        well_waveform["Time (seconds)"].to_numpy(),
+        analysis_result.resampled_times[first_index:last_index],
+    )
+    np.testing.assert_array_equal(
+        well_waveform["Waveform"].to_numpy(),
+        analysis_result.resampled_waveforms[first_index:last_index, well_position],
+    )
+
+
+def _assert_event_rows(events, well_name, well_result):
+    well_events = _get_well_rows(events, well_name)
+    peak_indices, valley_indices = well_result.peak_and_valley_indices
+    event_rows = list(
+        zip(well_events["Event"].to_pylist(), well_events["Index"].to_pylist())
+    )
+    assert event_rows == sorted(
+        [("Peak", iter_idx) for iter_idx in peak_indices]
+        + [("Valley", iter_idx) for iter_idx in valley_indices],
+        key=lambda event: (event[1], event[0]),
+    )
+    np.testing.assert_array_equal(
+        well_events["Time (seconds)"].to_numpy(),
+        well_result.filtered_data[0][well_events["Index"].to_numpy()]
+        / CENTIMILLISECONDS_PER_SECOND,
+    )
+
+
+def _assert_aggregate_rows(aggregate, well_name, analysis_result, well_position):
+    well_aggregate = _get_well_rows(aggregate, well_name)
+    assert well_aggregate["Error Message"].to_pylist() == [
+        analysis_result.well_results[well_position].error_message
+    ] * len(well_aggregate)
+    assert set(well_aggregate["n (twitches)"].to_pylist()) == {
+        analysis_result.twitch_counts[well_position]
+    }
+    np.testing.assert_array_equal(
+        np.column_stack(
+            [
+                well_aggregate[iter_statistic_name].to_numpy()
+                for iter_statistic_name in AGGREGATE_STATISTIC_NAMES
+            ]
+        ),
+        analysis_result.aggregate_statistics[well_position],
+    )
+
+
+def _assert_per_twitch_rows(per_twitch, well_name, per_twitch_table):
+    well_per_twitch = _get_well_rows(per_twitch, well_name)
+    if per_twitch_table is None:
+        assert len(well_per_twitch) == 0
+        return
+    for iter_column_name, iter_values in per_twitch_table.items():
+        np.testing.assert_array_equal(
+            well_per_twitch[iter_column_name].to_numpy(), iter_values
+        )
+
+
+def test_write_parquet__writes_file_of_each_table_with_default_name(
+    plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    first_well_file = pr.get_well_by_index(pr.get_well_indices()[0])
+    expected_prefix = f"{first_well_file.get_plate_barcode()}__{first_well_file.get_begin_recording().strftime('%Y_%m_%d_%H%M%S')}"
+
+    actual = pr.write_parquet(tmp_dir)
+
+    expected_paths = [
+        os.path.join(tmp_dir, f"{expected_prefix}__{iter_table_name}.parquet")
+        for iter_table_name in (
+            CONTINUOUS_WAVEFORM_SHEET_NAME,
+            PEAKS_AND_VALLEYS_TABLE_NAME,
+            PER_TWITCH_METRICS_SHEET_NAME,
+            AGGREGATE_METRICS_SHEET_NAME,
+        )
+    ]
+    assert actual == expected_paths
+    assert sorted(os.listdir(tmp_dir)) == sorted(
+        os.path.basename(iter_path) for iter_path in expected_paths
+    )
+
+
+def test_write_parquet__writes_analysis_results_of_each_well(
+    mocker, plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    analysis_result = pr.analyze()
+    spied_analyze = mocker.spy(PlateRecording, "analyze")
+
+    file_paths = pr.write_parquet(
+        tmp_dir, file_name_prefix="plate", analysis_result=analysis_result
+    )
+
+    spied_analyze.assert_not_called()
+    waveforms, events, per_twitch, aggregate = (
+        pq.read_table(iter_path) for iter_path in file_paths
+    )
+    first_well_file = pr.get_well_by_index(pr.get_well_indices()[0])
+    for iter_table in (waveforms, events, per_twitch, aggregate):
+        assert set(iter_table["Plate Barcode"].to_pylist()) == {
+            first_well_file.get_plate_barcode()
+        }
+        assert set(iter_table["Recording Start Time (UTC)"].to_pylist()) == {
+            first_well_file.get_begin_recording()
+        }
+    for iter_well_position, iter_well_idx in enumerate(analysis_result.well_indices):
+        well_name = TWENTY_FOUR_WELL_PLATE.get_well_name_from_well_index(iter_well_idx)
+        _assert_waveform_rows(waveforms, well_name, analysis_result, iter_well_position)
+        well_result = analysis_result.well_results[iter_well_position]
+        _assert_event_rows(events, well_name, well_result)
+        _assert_aggregate_rows(
+            aggregate, well_name, analysis_result, iter_well_position
+        )
+        _assert_per_twitch_rows(
+            per_twitch,
+            well_name,
+            analysis_result.per_twitch_tables[iter_well_position],
+        )
+
+
+def test_write_parquet__writes_files_with_given_compression(
+    plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+
+    file_paths = pr.write_parquet(tmp_dir, compression="gzip")
+
+    for iter_path in file_paths:
+        metadata = pq.ParquetFile(iter_path).metadata
+        assert metadata.row_group(0).column(0).compression == "GZIP"
+
+
+def test_get_arrow_tables__treats_begin_recording_without_time_zone_as_utc(
+    plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+):
+    pr, _ = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+
+    actual = get_arrow_tables(
+        pr.analyze(),
+        "ML2021001000",
+        datetime.datetime(2021, 2, 3, 4, 5, 6),
+        TWENTY_FOUR_WELL_PLATE,
+    )
+
+    assert actual[AGGREGATE_METRICS_SHEET_NAME]["Recording Start Time (UTC)"][
+        0
+    ].as_py() == datetime.datetime(2021, 2, 3, 4, 5, 6, tzinfo=datetime.timezone.utc)
+
+
+def test_write_parquet__raises_error_before_analyzing_if_pyarrow_is_not_installed(
+    mocker, plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    # a module set to None in sys.modules can't be imported
+    mocker.patch.dict(sys.modules, {"pyarrow": None})
+    spied_analyze = mocker.spy(PlateRecording, "analyze")
+
+    with pytest.raises(ImportError, match=r"pip install curibio.sdk\[parquet\]"):
+        pr.write_parquet(tmp_dir)
+    spied_analyze.assert_not_called()
+    assert os.listdir(tmp_dir) == []
@@ -10,16 +10,22 @@ python3 -c "import os; from curibio.sdk import PlateRecording; PlateRecording([o
 
 """
 import datetime
+import json
 import os
+import pickle
 from shutil import copy
 import tempfile
 from typing import Optional
 from typing import Union
+import zipfile
 
 from curibio.sdk import __version__
 from curibio.sdk import AGGREGATE_METRICS_SHEET_NAME
 from curibio.sdk import CALCULATED_METRIC_DISPLAY_NAMES
+from curibio.sdk import CHART_DATA_COLUMNS_PER_WELL
+from curibio.sdk import CHART_DATA_SHEET_NAME
 from curibio.sdk import CONTINUOUS_WAVEFORM_SHEET_NAME
+from curibio.sdk import ExcelWellFile
 from curibio.sdk import FORCE_FREQUENCY_RELATIONSHIP_SHEET
 from curibio.sdk import INTERPOLATED_DATA_PERIOD_CMS
 from curibio.sdk import METADATA_EXCEL_SHEET_NAME
@@ -27,10 +33,13 @@ from curibio.sdk import METADATA_INSTRUMENT_ROW_START
 from curibio.sdk import METADATA_OUTPUT_FILE_ROW_START
 from curibio.sdk import METADATA_RECORDING_ROW_START
 from curibio.sdk import NUMBER_OF_PER_TWITCH_METRICS
+from curibio.sdk import PEAK_VALLEY_COLUMN_START
 from curibio.sdk import PER_TWITCH_METRICS_SHEET_NAME
 from curibio.sdk import plate_recording
 from curibio.sdk import PlateRecording
 from curibio.sdk import TWITCH_FREQUENCIES_CHART_SHEET_NAME
+from curibio.sdk import WellFileLoadingError
+from curibio.sdk import XlsxWritingOptions
 from freezegun import freeze_time
 from labware_domain_models import LabwareDefinition
 from mantarray_file_manager import MAIN_FIRMWARE_VERSION_UUID
@@ -40,14 +49,19 @@ from mantarray_file_manager import PLATE_BARCODE_UUID
 from mantarray_file_manager import SOFTWARE_BUILD_NUMBER_UUID
 from mantarray_file_manager import SOFTWARE_RELEASE_VERSION_UUID
 from mantarray_file_manager import UTC_BEGINNING_RECORDING_UUID
+from mantarray_waveform_analysis import AMPLITUDE_UUID
 from mantarray_waveform_analysis import BESSEL_LOWPASS_10_UUID
 from mantarray_waveform_analysis import BUTTERWORTH_LOWPASS_30_UUID
 from mantarray_waveform_analysis import CENTIMILLISECONDS_PER_SECOND
 from mantarray_waveform_analysis import Pipeline
+from mantarray_waveform_analysis import PipelineTemplate
 from mantarray_waveform_analysis import TooFewPeaksDetectedError
+from mantarray_waveform_analysis import TWITCH_PERIOD_UUID
 from mantarray_waveform_analysis import TwoPeaksInARowError
 from mantarray_waveform_analysis import TwoValleysInARowError
+from mantarray_waveform_analysis import WIDTH_UUID
 from matplotlib.figure import Figure
+import numpy as np
 from openpyxl import load_workbook
 from PIL import Image
 from PIL import ImageDraw
@@ -56,6 +70,7 @@ import pytest
 from pytest import approx
 from stdlib_utils import get_current_file_abs_directory
 from stdlib_utils import is_system_windows
+from xlsxwriter.utility import xl_col_to_name
 
 from .fixtures import fixture_generic_well_file_0_3_1
 from .fixtures import fixture_generic_well_file_0_3_1__2
@@ -66,6 +81,8 @@ from .fixtures import fixture_plate_recording_in_tmp_dir_for_generic_well_file_0
 from .fixtures import fixture_plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
 from .fixtures import fixture_plate_recording_in_tmp_dir_for_real_3min_well_file_0_3_1
 from .fixtures import fixture_real_3min_well_file_0_3_1
+from .fixtures import PATH_TO_FILLED_OPTICAL_TEMPLATE
+from .fixtures import PATH_TO_OPTICAL_PLATE_FOLDER
 from .utils import get_cell_value
 
 __fixtures__ = (
@@ -872,3 +889,739 @@ def test_PlateRecording__creates_output_file_without_interpolation_error():
         )
     )
     pr.write_xlsx(".")
+
+
+def test_PlateRecording__from_directory__loads_h5_files_in_threads_in_well_index_order():
+    dir_to_load = os.path.join(
+        PATH_OF_CURRENT_FILE, "h5", "v0.3.2", "MA20223322__2020_09_02_173919"
+    )
+    serial_pr = PlateRecording.from_directory(dir_to_load)
+    parallel_pr = PlateRecording.from_directory(dir_to_load, max_workers=4)
+
+    assert parallel_pr.get_well_indices() == tuple(range(24))
+    assert [
+        iter_well_file.get_well_index()
+        for iter_well_file in parallel_pr._files  # pylint: disable=protected-access # checking the load order
+    ] == list(range(24))
+    for iter_well_idx in (0, 11, 23):
+        np.testing.assert_array_equal(
+            parallel_pr.get_well_by_index(iter_well_idx).get_raw_tissue_reading(),
+            serial_pr.get_well_by_index(iter_well_idx).get_raw_tissue_reading(),
+        )
+
+
+def test_PlateRecording__from_directory__parses_optical_files_in_separate_processes():
+    dir_to_load = PATH_TO_OPTICAL_PLATE_FOLDER
+    serial_pr = PlateRecording.from_directory(dir_to_load)
+    parallel_pr = PlateRecording.from_directory(dir_to_load, max_workers=2)
+
+    assert parallel_pr.get_well_indices() == (0, 1)
+    for iter_well_idx in (0, 1):
+        parallel_well_file = parallel_pr.get_well_by_index(iter_well_idx)
+        assert (
+            parallel_well_file.get_metadata()
+            == serial_pr.get_well_by_index(iter_well_idx).get_metadata()
+        )
+        np.testing.assert_array_equal(
+            parallel_well_file.get_raw_tissue_reading(),
+            serial_pr.get_well_by_index(iter_well_idx).get_raw_tissue_reading(),
+        )
+
+
+def test_open_optical_well_file__reads_the_data_up_front_if_requested(mocker):
+    spied_reader = mocker.spy(ExcelWellFile, "_read_raw_tissue_reading")
+    well_file = plate_recording._open_optical_well_file(  # pylint: disable=protected-access # testing the reading done in worker processes
+        PATH_TO_FILLED_OPTICAL_TEMPLATE,
+        read_data=True,
+    )
+    assert spied_reader.call_count == 1
+    assert well_file.get_raw_tissue_reading().shape[0] == 2
+    assert spied_reader.call_count == 1
+
+
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_PlateRecording__from_directory__reports_errors_of_each_well_file_that_fails_to_load(
+    max_workers,
+):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        copy(
+            PATH_TO_FILLED_OPTICAL_TEMPLATE,
+            os.path.join(tmp_dir, "A1.xlsx"),
+        )
+        bad_file_paths = [
+            os.path.join(tmp_dir, iter_file_name)
+            for iter_file_name in ("B1.xlsx", "C1.xlsx")
+        ]
+        for iter_file_path in bad_file_paths:
+            with open(iter_file_path, "w") as bad_file:
+                bad_file.write("not a workbook")
+
+        with pytest.raises(WellFileLoadingError) as exc_info:
+            PlateRecording.from_directory(tmp_dir, max_workers=max_workers)
+
+    assert sorted(exc_info.value.errors) == bad_file_paths
+    for iter_file_path in bad_file_paths:
+        assert iter_file_path in str(exc_info.value)
+
+
+def test_PlateRecording__from_zip__reads_h5_files_without_extracting_them():
+    file_name = "MA20123456__2020_08_17_145752_files.zip"
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        tmp_file_path = os.path.join(tmp_dir, file_name)
+        copy(
+            os.path.join(
+                PATH_OF_CURRENT_FILE, "zipped_MA20123456__2020_08_17_145752", file_name
+            ),
+            tmp_file_path,
+        )
+        pr = PlateRecording.from_zip(tmp_file_path)
+        assert pr.get_well_indices() == (0, 4, 8)
+        assert pr.get_well_by_index(4).get_raw_tissue_reading().shape[0] == 2
+        assert os.listdir(tmp_dir) == [file_name]
+
+        del pr  # Tanner (10/06/20): Resolve windows error with closing file when it is still open
+
+
+def test_PlateRecording__from_zip__accepts_an_open_file_of_a_mac_zipped_folder():
+    with open(
+        os.path.join(
+            PATH_OF_CURRENT_FILE,
+            "zipped_mac_folder",
+            "MA20123456__2020_08_17_145752_folder.zip",
+        ),
+        "rb",
+    ) as zip_file:
+        pr = PlateRecording.from_zip(zip_file, max_workers=2)
+    assert pr.get_well_indices() == (0, 4, 8)
+    first_well_file = pr.get_well_by_index(0)
+    actual_file_name = (
+        first_well_file._file_name  # pylint: disable=protected-access # checking the well file is named after its archive member
+    )
+    assert (
+        actual_file_name
+        == "MA20123456__2020_08_17_145752/MA20123456__2020_08_17_145752__A1.h5"
+    )
+
+
+@pytest.mark.parametrize(
+    "file_name", ["zipped_optical_files.zip", "zipped_optical_file_folder.zip"]
+)
+@pytest.mark.parametrize("max_workers", [1, 2])
+def test_PlateRecording__from_zip__reads_optical_files_without_extracting_them(
+    file_name, max_workers
+):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        copy(
+            os.path.join(PATH_OF_CURRENT_FILE, "excel_optical_data", file_name), tmp_dir
+        )
+        pr = PlateRecording.from_directory(tmp_dir, max_workers=max_workers)
+        assert len(pr.get_well_indices()) > 0
+        for iter_well_idx in pr.get_well_indices():
+            assert (
+                pr.get_well_by_index(iter_well_idx).get_raw_tissue_reading().shape[1]
+                > 0
+            )
+        assert os.listdir(tmp_dir) == [file_name]
+
+
+def test_PlateRecording__write_xlsx__writes_same_metrics_when_wells_are_analyzed_in_separate_processes():
+    dir_to_load = PATH_TO_OPTICAL_PLATE_FOLDER
+    sheet_values = dict()
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for max_workers in (1, 2):
+            file_name = f"{max_workers}.xlsx"
+            pr = PlateRecording.from_directory(dir_to_load)
+            pr.write_xlsx(
+                tmp_dir,
+                file_name=file_name,
+                create_waveform_charts=False,
+                max_workers=max_workers,
+            )
+            workbook = load_workbook(os.path.join(tmp_dir, file_name))
+            sheet_values[max_workers] = {
+                iter_sheet_name: list(workbook[iter_sheet_name].values)
+                for iter_sheet_name in (
+                    CONTINUOUS_WAVEFORM_SHEET_NAME,
+                    AGGREGATE_METRICS_SHEET_NAME,
+                    PER_TWITCH_METRICS_SHEET_NAME,
+                )
+            }
+    assert sheet_values[2] == sheet_values[1]
+
+
+def test_PlateRecording__analyzes_wells_on_demand(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, _ = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    well_idx = pr.get_well_indices()[0]
+    result = pr._get_well_analysis_result(  # pylint: disable=protected-access # results are normally computed when writing the file
+        well_idx
+    )
+    assert result.well_index == well_idx
+    assert result.aggregate_metrics is not None
+
+
+def test_PlateRecording__write_xlsx__computes_metrics_of_each_well_once_even_if_they_fail(
+    mocker, plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    mocked_metrics = mocker.patch.object(
+        Pipeline,
+        "get_magnetic_data_metrics",
+        autospec=True,
+        side_effect=TooFewPeaksDetectedError(),
+    )
+
+    pr.write_xlsx(tmp_dir, file_name="first.xlsx", create_waveform_charts=False)
+    assert mocked_metrics.call_count == 1
+
+    pr.write_xlsx(tmp_dir, file_name="second.xlsx", create_waveform_charts=False)
+    assert mocked_metrics.call_count == 1
+
+
+def test_PlateRecording__set_pipeline_template__causes_wells_to_be_analyzed_again(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, _ = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    well_idx = pr.get_well_indices()[0]
+    initial_template = pr.get_pipeline_template()
+    initial_result = pr._get_well_analysis_result(  # pylint: disable=protected-access # checking the cached results
+        well_idx
+    )
+    assert (
+        pr._get_well_analysis_result(  # pylint: disable=protected-access # checking the cached results
+            well_idx
+        )
+        is initial_result
+    )
+
+    pr.set_pipeline_template(
+        PipelineTemplate(
+            noise_filter_uuid=BUTTERWORTH_LOWPASS_30_UUID,
+            tissue_sampling_period=initial_template.tissue_sampling_period,
+        )
+    )
+    new_result = pr._get_well_analysis_result(  # pylint: disable=protected-access # checking the cached results
+        well_idx
+    )
+
+    assert new_result is not initial_result
+    assert not np.array_equal(new_result.filtered_data, initial_result.filtered_data)
+    assert (
+        pr._pipelines[  # pylint: disable=protected-access # checking the pipelines were recreated
+            well_idx
+        ].get_template()
+        is pr.get_pipeline_template()
+    )
+
+
+def test_PlateRecording__analyzes_wells_again_if_pipeline_template_is_changed_in_place(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, _ = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    well_idx = pr.get_well_indices()[0]
+    initial_result = pr._get_well_analysis_result(  # pylint: disable=protected-access # checking the cached results
+        well_idx
+    )
+
+    pr.get_pipeline_template().magnetic_twitches_point_up = (
+        not pr.get_pipeline_template().magnetic_twitches_point_up
+    )
+
+    assert (
+        pr._get_well_analysis_result(  # pylint: disable=protected-access # checking the cached results
+            well_idx
+        )
+        is not initial_result
+    )
+
+
+def test_PlateRecording__set_pipeline_template__is_used_if_set_before_wells_are_analyzed(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, _ = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    new_template = PipelineTemplate(
+        noise_filter_uuid=BUTTERWORTH_LOWPASS_30_UUID,
+        tissue_sampling_period=pr.get_pipeline_template().tissue_sampling_period,
+    )
+    pr.set_pipeline_template(new_template)
+
+    pr.get_reference_magnetic_data(pr.get_well_indices()[0])
+
+    pipelines = (
+        pr._pipelines  # pylint: disable=protected-access # checking which template the pipelines were created with
+    )
+    for iter_pipeline in pipelines.values():
+        assert iter_pipeline.get_template() is new_template
+
+
+def test_group_adjacent_wells__groups_values_of_wells_with_consecutive_indices():
+    assert plate_recording._group_adjacent_wells(  # pylint: disable=protected-access # testing the grouping used to write rows in bulk
+        {5: "N/A", 0: 1.5, 1: 2.5, 3: 4.5, 4: 5.5}
+    ) == [
+        (0, [1.5, 2.5]),
+        (3, [4.5, 5.5, "N/A"]),
+    ]
+
+
+def _get_sheet_values_written_with_and_without_constant_memory(pr, tmp_dir):
+    sheet_values = dict()
+    for constant_memory in (False, True):
+        file_name = f"{constant_memory}.xlsx"
+        pr.write_xlsx(
+            tmp_dir,
+            file_name=file_name,
+            create_waveform_charts=False,
+            options=XlsxWritingOptions(constant_memory=constant_memory),
+        )
+        workbook = load_workbook(os.path.join(tmp_dir, file_name))
+        sheet_values[constant_memory] = {
+            iter_sheet_name: list(workbook[iter_sheet_name].values)
+            for iter_sheet_name in (
+                CONTINUOUS_WAVEFORM_SHEET_NAME,
+                AGGREGATE_METRICS_SHEET_NAME,
+                PER_TWITCH_METRICS_SHEET_NAME,
+            )
+        }
+    return sheet_values
+
+
+@pytest.mark.parametrize(
+    "dir_to_load",
+    [
+        pytest.param(
+            os.path.join(
+                PATH_OF_CURRENT_FILE, "h5", "v0.3.1", "MA201110001__2020_09_03_213024"
+            ),
+            marks=pytest.mark.slow,
+        ),
+        os.path.join(PATH_OF_CURRENT_FILE, "h5", "peak_detection_errors"),
+        PATH_TO_OPTICAL_PLATE_FOLDER,
+    ],
+)
+def test_PlateRecording__write_xlsx__writes_same_sheets_in_constant_memory_mode(
+    dir_to_load,
+):
+    pr = PlateRecording.from_directory(dir_to_load)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        sheet_values = _get_sheet_values_written_with_and_without_constant_memory(
+            pr, tmp_dir
+        )
+    assert sheet_values[True] == sheet_values[False]
+
+
+def test_PlateRecording__write_xlsx__passes_constant_memory_option_to_workbook(
+    mocker, plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    spied_workbook = mocker.spy(plate_recording, "Workbook")
+    pr.write_xlsx(
+        tmp_dir,
+        create_continuous_waveforms=False,
+        create_waveform_charts=False,
+        options=XlsxWritingOptions(constant_memory=True),
+    )
+    _, actual_options = spied_workbook.call_args[0]
+    assert actual_options["constant_memory"] is True
+
+
+def test_PlateRecording__write_xlsx__plots_downsampled_waveforms_from_hidden_chart_data_sheet(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    file_name = "charts.xlsx"
+    pr.write_xlsx(
+        tmp_dir, file_name=file_name, options=XlsxWritingOptions(chart_max_points=100)
+    )
+
+    workbook = load_workbook(os.path.join(tmp_dir, file_name))
+    assert workbook.sheetnames[-1] == CHART_DATA_SHEET_NAME
+    chart_data_sheet = workbook[CHART_DATA_SHEET_NAME]
+    assert chart_data_sheet.sheet_state == "hidden"
+    chart_data_columns = list(chart_data_sheet.iter_cols(values_only=True))
+    assert len(chart_data_columns) == CHART_DATA_COLUMNS_PER_WELL
+    assert chart_data_columns[0][0] == "B3 Time (seconds)"
+    assert chart_data_columns[7][0] == "B3 Valley Values"
+    full_waveform = [
+        iter_value for iter_value in chart_data_columns[1][1:] if iter_value is not None
+    ]
+    assert len(full_waveform) <= 100
+    well_index = pr.get_well_indices()[0]
+    waveform_column = [
+        iter_value
+        for iter_value in list(
+            workbook[CONTINUOUS_WAVEFORM_SHEET_NAME].iter_cols(
+                min_col=well_index + 2, max_col=well_index + 2, values_only=True
+            )
+        )[0][1:]
+        if iter_value is not None
+    ]
+    assert len(waveform_column) > 100
+    assert (min(full_waveform), max(full_waveform)) == (
+        min(waveform_column),
+        max(waveform_column),
+    )
+    peak_values = list(
+        workbook[CONTINUOUS_WAVEFORM_SHEET_NAME].iter_cols(
+            min_col=PEAK_VALLEY_COLUMN_START + well_index * 2 + 1,
+            max_col=PEAK_VALLEY_COLUMN_START + well_index * 2 + 1,
+            values_only=True,
+        )
+    )[0][1:]
+    num_peaks = len(
+        [iter_value for iter_value in peak_values if iter_value is not None]
+    )
+    assert num_peaks > 0
+    assert [
+        iter_value for iter_value in chart_data_columns[5][1:] if iter_value is not None
+    ] == [iter_value for iter_value in peak_values if iter_value is not None]
+
+    with zipfile.ZipFile(os.path.join(tmp_dir, file_name), "r") as zip_ref:
+        snapshot_chart_xml = zip_ref.read("xl/charts/chart1.xml").decode("utf-8")
+        full_chart_xml = zip_ref.read("xl/charts/chart2.xml").decode("utf-8")
+    for chart_xml in (snapshot_chart_xml, full_chart_xml):
+        assert CONTINUOUS_WAVEFORM_SHEET_NAME not in chart_xml
+        assert f"'{CHART_DATA_SHEET_NAME}'!$F$2:$F${num_peaks + 1}" in chart_xml
+    assert f"'{CHART_DATA_SHEET_NAME}'!$D$2:$D$" in snapshot_chart_xml
+    assert (
+        f"'{CHART_DATA_SHEET_NAME}'!$B$2:$B${len(full_waveform) + 1}" in full_chart_xml
+    )
+
+
+@pytest.mark.parametrize(
+    "write_xlsx_kwargs",
+    [
+        {"create_waveform_charts": False},
+        {"options": XlsxWritingOptions(chart_max_points=None)},
+        # the waveform of the well is shorter than the default chart_max_points
+        {},
+    ],
+)
+def test_PlateRecording__write_xlsx__does_not_create_chart_data_sheet_without_downsampled_charts(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1, write_xlsx_kwargs
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    file_name = "no_chart_data.xlsx"
+    pr.write_xlsx(tmp_dir, file_name=file_name, **write_xlsx_kwargs)
+
+    workbook = load_workbook(os.path.join(tmp_dir, file_name))
+    assert CHART_DATA_SHEET_NAME not in workbook.sheetnames
+
+
+def test_PlateRecording__write_xlsx__plots_waveforms_that_are_not_downsampled_from_continuous_waveforms_sheet(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    file_name = "charts.xlsx"
+    # the full waveform of the well has 355 points, and its snapshot has 300
+    pr.write_xlsx(
+        tmp_dir, file_name=file_name, options=XlsxWritingOptions(chart_max_points=320)
+    )
+
+    workbook = load_workbook(os.path.join(tmp_dir, file_name))
+    chart_data_columns = list(
+        workbook[CHART_DATA_SHEET_NAME].iter_cols(values_only=True)
+    )
+    assert [column[0] for column in chart_data_columns] == [
+        "B3 Time (seconds)",
+        "B3 Waveform",
+        None,
+        None,
+        "B3 Peak Time (seconds)",
+        "B3 Peak Values",
+        "B3 Valley Time (seconds)",
+        "B3 Valley Values",
+    ]
+    assert all(iter_value is None for iter_value in chart_data_columns[2])
+
+    with zipfile.ZipFile(os.path.join(tmp_dir, file_name), "r") as zip_ref:
+        snapshot_chart_xml = zip_ref.read("xl/charts/chart1.xml").decode("utf-8")
+        full_chart_xml = zip_ref.read("xl/charts/chart2.xml").decode("utf-8")
+    assert f"'{CONTINUOUS_WAVEFORM_SHEET_NAME}'!$A$2:$A$301" in snapshot_chart_xml
+    assert f"'{CHART_DATA_SHEET_NAME}'!$F$2:$F$" in snapshot_chart_xml
+    assert CONTINUOUS_WAVEFORM_SHEET_NAME not in full_chart_xml
+
+
+def test_PlateRecording__get_peak_detection_markers__places_each_marker_at_its_time_rounded_to_hundredths(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, _ = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    analysis_result = pr._get_well_analysis_result(  # pylint: disable=protected-access # testing the markers of a single well
+        pr.get_well_indices()[0]
+    )
+    filtered_data = analysis_result.filtered_data
+    peak_indices = analysis_result.peak_and_valley_indices[0]
+
+    (
+        actual_rows,
+        actual_times,
+        actual_values,
+    ) = pr._get_peak_detection_markers(  # pylint: disable=protected-access # testing the markers of a single well
+        peak_indices, filtered_data
+    )
+
+    assert len(actual_rows) == len(peak_indices) > 0
+    for iter_marker_idx, iter_peak_idx in enumerate(peak_indices):
+        expected_time = round(
+            filtered_data[0][iter_peak_idx] / CENTIMILLISECONDS_PER_SECOND, 2
+        )
+        assert actual_times[iter_marker_idx] == expected_time
+        assert actual_rows[iter_marker_idx] == int(expected_time * 100)
+        assert actual_values[iter_marker_idx] == approx(
+            np.interp(
+                expected_time * CENTIMILLISECONDS_PER_SECOND,
+                filtered_data[0],
+                filtered_data[1],
+            )
+        )
+
+
+def test_PlateRecording__get_per_twitch_table__returns_metrics_written_to_per_twitch_sheet(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    well_index = pr.get_well_indices()[0]
+    file_name = "per_twitch.xlsx"
+    pr.write_xlsx(tmp_dir, file_name=file_name, create_continuous_waveforms=False)
+
+    actual = pr.get_per_twitch_table(well_index)
+
+    per_twitch_sheet = load_workbook(os.path.join(tmp_dir, file_name))[
+        PER_TWITCH_METRICS_SHEET_NAME
+    ]
+    first_row = well_index * (NUMBER_OF_PER_TWITCH_METRICS + 2) + 1
+    for iter_row, (iter_metric_name, iter_values) in enumerate(
+        actual.items(), start=first_row
+    ):
+        assert get_cell_value(per_twitch_sheet, iter_row, 0) == iter_metric_name
+        assert [
+            get_cell_value(per_twitch_sheet, iter_row, iter_col + 1)
+            for iter_col in range(len(iter_values))
+        ] == iter_values.tolist()
+
+
+def test_PlateRecording__get_per_twitch_table__returns_None_if_metrics_could_not_be_computed(
+    mocker, plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+):
+    pr, _ = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    mocker.patch.object(
+        Pipeline,
+        "get_magnetic_data_metrics",
+        autospec=True,
+        side_effect=TooFewPeaksDetectedError(),
+    )
+    assert pr.get_per_twitch_table(pr.get_well_indices()[0]) is None
+
+
+def test_PlateRecording__get_aggregate_statistics__matches_aggregate_metrics_of_pipeline(
+    plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+):
+    pr, _ = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+
+    actual_counts, actual_statistics = pr.get_aggregate_statistics()
+
+    assert actual_statistics.shape == (len(pr.get_well_indices()), 5, 4)
+    for iter_well_row, iter_well_idx in enumerate(pr.get_well_indices()):
+        aggregate_metrics = pr._get_well_analysis_result(  # pylint: disable=protected-access # comparing to the results of the pipeline
+            iter_well_idx
+        ).aggregate_metrics
+        if aggregate_metrics is None:
+            assert actual_counts[iter_well_row] == 0
+            continue
+        assert actual_counts[iter_well_row] == aggregate_metrics[AMPLITUDE_UUID]["n"]
+        for iter_metric_idx, (iter_metric_uuid, iter_metric_name) in enumerate(
+            CALCULATED_METRIC_DISPLAY_NAMES.items()
+        ):
+            metric_dict = aggregate_metrics[iter_metric_uuid]
+            if isinstance(iter_metric_name, tuple):
+                metric_dict = metric_dict[iter_metric_name[0]]
+            scale = (
+                CENTIMILLISECONDS_PER_SECOND
+                if iter_metric_uuid in (TWITCH_PERIOD_UUID, WIDTH_UUID)
+                else 1
+            )
+            expected_mean = metric_dict["mean"] / scale
+            expected_stdev = metric_dict["std"] / scale
+            assert actual_statistics[iter_well_row, iter_metric_idx, :2].tolist() == [
+                approx(expected_mean, rel=1e-15),
+                approx(expected_stdev, rel=1e-15),
+            ]
+
+
+def test_PlateRecording__get_aggregate_statistics__returns_NaN_if_metrics_could_not_be_computed(
+    mocker, plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+):
+    pr, _ = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    mocker.patch.object(
+        Pipeline,
+        "get_magnetic_data_metrics",
+        autospec=True,
+        side_effect=TooFewPeaksDetectedError(),
+    )
+
+    actual_counts, actual_statistics = pr.get_aggregate_statistics()
+
+    np.testing.assert_array_equal(actual_counts, [0])
+    assert np.isnan(actual_statistics).all()
+
+
+def test_PlateRecording__analyze__returns_picklable_results_of_every_well(
+    plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+):
+    pr, _ = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    well_indices = pr.get_well_indices()
+
+    actual = pr.analyze()
+
+    assert actual.well_indices == well_indices
+    assert len(actual.well_results) == len(well_indices)
+    assert actual.resampled_waveforms.shape == (
+        len(actual.resampled_times),
+        len(well_indices),
+    )
+    for iter_well_row, iter_well_idx in enumerate(well_indices):
+        well_result = actual.well_results[iter_well_row]
+        assert well_result.well_index == iter_well_idx
+        assert (
+            actual.peak_and_valley_indices[iter_well_row]
+            == well_result.peak_and_valley_indices
+        )
+        assert actual.error_messages[iter_well_row] == well_result.error_message
+        expected_table = pr.get_per_twitch_table(iter_well_idx)
+        actual_table = actual.per_twitch_tables[iter_well_row]
+        if expected_table is None:
+            assert actual_table is None
+            continue
+        assert list(actual_table) == list(expected_table)
+        for iter_metric_name, iter_values in expected_table.items():
+            np.testing.assert_array_equal(actual_table[iter_metric_name], iter_values)
+    expected_counts, expected_statistics = pr.get_aggregate_statistics()
+    np.testing.assert_array_equal(actual.twitch_counts, expected_counts)
+    np.testing.assert_array_equal(actual.aggregate_statistics, expected_statistics)
+
+    unpickled = pickle.loads(pickle.dumps(actual))
+    assert unpickled.well_indices == well_indices
+    np.testing.assert_array_equal(
+        unpickled.resampled_waveforms, actual.resampled_waveforms
+    )
+
+
+def test_PlateRecording__analyze__returns_error_message_of_wells_whose_metrics_could_not_be_computed(
+    mocker, plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+):
+    pr, _ = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    mocker.patch.object(
+        Pipeline,
+        "get_magnetic_data_metrics",
+        autospec=True,
+        side_effect=TooFewPeaksDetectedError(),
+    )
+
+    actual = pr.analyze()
+
+    assert actual.per_twitch_tables == [None]
+    assert actual.error_messages == ["Error: Not Enough Twitches Detected"]
+    np.testing.assert_array_equal(actual.twitch_counts, [0])
+
+
+def test_write_xlsx__writes_resampled_waveforms_of_analysis_result_without_analyzing_again(
+    mocker, plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    analysis_result = pr.analyze()
+    spied_analyze = mocker.spy(PlateRecording, "analyze")
+    file_name = "from_analysis.xlsx"
+
+    pr.write_xlsx(
+        tmp_dir,
+        file_name=file_name,
+        create_waveform_charts=False,
+        analysis_result=analysis_result,
+    )
+
+    spied_analyze.assert_not_called()
+    continuous_sheet = load_workbook(os.path.join(tmp_dir, file_name))[
+        CONTINUOUS_WAVEFORM_SHEET_NAME
+    ]
+    well_index = analysis_result.well_indices[0]
+    first_index, last_index = analysis_result.resampling_bounds[0]
+    data_rows = slice(1, last_index - first_index + 1)
+    actual_times = [cell.value for cell in continuous_sheet["A"][data_rows]]
+    actual_values = [
+        cell.value
+        for cell in continuous_sheet[xl_col_to_name(well_index + 1)][data_rows]
+    ]
+    assert (
+        actual_times == analysis_result.resampled_times[first_index:last_index].tolist()
+    )
+    assert actual_values == approx(
+        analysis_result.resampled_waveforms[first_index:last_index, 0].tolist(),
+        rel=1e-15,
+    )
+
+
+def test_write_xlsx__returns_and_writes_report_of_each_stage_and_well(
+    plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_multiple_well_files_0_3_1
+    report_file_path = os.path.join(tmp_dir, "stages.json")
+
+    report = pr.write_xlsx(
+        tmp_dir, file_name="timed.xlsx", stage_report_file=report_file_path
+    )
+
+    with open(report_file_path, "r", encoding="utf-8") as report_file:
+        assert json.load(report_file) == report.to_dict()
+    write_xlsx_stage = report.stages[0]
+    assert (write_xlsx_stage.name, write_xlsx_stage.depth) == ("write_xlsx", 0)
+    assert [stage.name for stage in report.stages if stage.depth == 1] == [
+        "analyze",
+        "open_workbook",
+        "metadata_sheet",
+        "continuous_waveforms_sheet",
+        "aggregate_metrics_sheet",
+        "per_twitch_metrics_sheet",
+        "chart_data_sheet",
+        "close_workbook",
+    ]
+    assert (
+        sum(stage.duration_seconds for stage in report.stages if stage.depth == 1)
+        <= write_xlsx_stage.duration_seconds
+    )
+    for stage_name in ("resample", "per_twitch_tables", "write_waveform_rows"):
+        assert len(report.get_stages(stage_name)) == 1
+    for well_index in pr.get_well_indices():
+        for stage_name in (
+            "load_well_data",
+            "filter",
+            "peak_detection",
+            "metrics",
+            "peak_and_valley_markers",
+            "chart_data",
+            "waveform_charts",
+        ):
+            assert len(report.get_stages(stage_name, well_index)) == 1
+        num_twitch_charts = len(report.get_stages("twitch_charts", well_index))
+        has_metrics = pr.get_per_twitch_table(well_index) is not None
+        assert num_twitch_charts == int(has_metrics)
+    assert report.traced_memory is False
+
+
+def test_write_xlsx__reports_memory_of_stages_if_traced_and_not_analyze_stage_if_analysis_result_given(
+    plate_recording_in_tmp_dir_for_generic_well_file_0_3_1,
+):
+    pr, tmp_dir = plate_recording_in_tmp_dir_for_generic_well_file_0_3_1
+    analysis_result = pr.analyze()
+
+    report = pr.write_xlsx(
+        tmp_dir,
+        file_name="traced.xlsx",
+        create_waveform_charts=False,
+        analysis_result=analysis_result,
+        trace_memory=True,
+    )
+
+    assert report.traced_memory is True
+    assert report.get_stages("analyze") == []
+    for stage in report.stages:
+        assert stage.peak_memory_bytes >= 0
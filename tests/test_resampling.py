@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+from curibio.sdk import resampling
+import numpy as np
+import pytest
+from scipy import interpolate
+
+GENERIC_GRID = np.arange(1000, 10000, 1000)
+
+
+@pytest.mark.parametrize(
+    "sample_times,expected_bounds",
+    [
+        (np.array([0, 10000]), (0, 9)),
+        (np.array([960, 5500]), (0, 5)),
+        (np.array([1500, 5000]), (1, 5)),
+        (np.array([2000, 4999]), (1, 4)),
+        (np.array([20000, 30000]), (9, 9)),
+        (np.array([0, 500]), (0, 0)),
+    ],
+)
+def test_get_resampling_bounds__returns_range_of_grid_covered_by_sample_times(
+    sample_times, expected_bounds
+):
+    assert resampling.get_resampling_bounds(sample_times, GENERIC_GRID) == (
+        expected_bounds
+    )
+
+
+def test_interpolate_waveforms__matches_scipy_interp1d_exactly():
+    rng = np.random.default_rng(seed=0)
+    sample_times = np.cumsum(rng.integers(900, 1100, 500))
+    sample_values = rng.normal(size=(3, 500)) * 1e6
+    new_times = np.arange(sample_times[0], sample_times[-1], 1000)
+
+    actual = resampling.interpolate_waveforms(sample_times, sample_values, new_times)
+
+    for iter_row, iter_values in enumerate(sample_values):
+        np.testing.assert_array_equal(
+            actual[iter_row], interpolate.interp1d(sample_times, iter_values)(new_times)
+        )
+
+
+def test_resample_waveforms__interpolates_waveforms_with_same_times_together(mocker):
+    spied_interpolate = mocker.spy(resampling, "interpolate_waveforms")
+    sample_times = np.arange(0, 9600, 960)
+    waveforms = [
+        np.array([sample_times, sample_times * iter_factor])
+        for iter_factor in (1, 2, 3)
+    ]
+
+    actual_data, actual_bounds = resampling.resample_waveforms(waveforms, GENERIC_GRID)
+
+    assert spied_interpolate.call_count == 1
+    assert actual_data.shape == (9, 3)
+    assert actual_bounds == [(0, 8)] * 3
+    np.testing.assert_array_almost_equal(actual_data[:8, 2], GENERIC_GRID[:8] * 3)
+    assert np.isnan(actual_data[8]).all()
+
+
+def test_resample_waveforms__resamples_waveforms_with_different_times_separately():
+    waveforms = [
+        np.array([[0, 10000], [0, 10]]),
+        np.array([[2500, 4500], [25, 45]]),
+        np.array([[20000, 30000], [1, 1]]),
+    ]
+
+    actual_data, actual_bounds = resampling.resample_waveforms(waveforms, GENERIC_GRID)
+
+    assert actual_bounds == [(0, 9), (2, 4), (9, 9)]
+    np.testing.assert_array_almost_equal(actual_data[:, 0], GENERIC_GRID / 1000)
+    np.testing.assert_array_almost_equal(actual_data[2:4, 1], [30, 40])
+    assert np.isnan(actual_data[[0, 1, 4], 1]).all()
+    assert np.isnan(actual_data[:, 2]).all()
+
+
+def test_resample_waveforms__slices_samples_at_grid_times_instead_of_interpolating(
+    mocker,
+):
+    spied_interpolate = mocker.spy(resampling, "interpolate_waveforms")
+    sample_times = np.arange(0, 10250, 250)
+    sample_values = np.sin(sample_times / 777)
+
+    actual_data, _ = resampling.resample_waveforms(
+        [np.array([sample_times, sample_values])], GENERIC_GRID
+    )
+
+    spied_interpolate.assert_not_called()
+    np.testing.assert_array_equal(actual_data[:, 0], sample_values[4:37:4])
+
+
+@pytest.mark.parametrize(
+    "sample_times,grid",
+    [
+        (np.arange(0, 10000, 300), GENERIC_GRID),
+        (np.arange(100, 10100, 250), GENERIC_GRID),
+        (np.array([0, 250, 500, 1000, 1250, 2000, 3000, 10000]), GENERIC_GRID),
+        (np.arange(0, 10250, 250), np.array([1000, 2000, 4000])),
+        (np.arange(0, 10250, 250), np.array([1000])),
+    ],
+)
+def test_resample_waveforms__interpolates_if_grid_times_are_not_all_sample_times(
+    mocker, sample_times, grid
+):
+    spied_interpolate = mocker.spy(resampling, "interpolate_waveforms")
+    sample_values = np.sin(sample_times / 777)
+
+    actual_data, _ = resampling.resample_waveforms(
+        [np.array([sample_times, sample_values])], grid
+    )
+
+    assert spied_interpolate.call_count == 1
+    np.testing.assert_array_equal(
+        actual_data[:, 0], interpolate.interp1d(sample_times, sample_values)(grid)
+    )
@@ -0,0 +1,211 @@
+# -*- coding: utf-8 -*-
+import json
+import os
+from shutil import copy
+import tempfile
+
+from curibio.sdk import excel_well_file
+from curibio.sdk import ExcelWellFile
+from curibio.sdk import PlateRecording
+from curibio.sdk import sidecar_cache
+from mantarray_file_manager import WELL_NAME_UUID
+import numpy as np
+import pytest
+from stdlib_utils import get_current_file_abs_directory
+
+from .fixtures import PATH_TO_FILLED_OPTICAL_TEMPLATE
+from .fixtures import PATH_TO_OPTICAL_PLATE_FOLDER
+
+PATH_OF_CURRENT_FILE = get_current_file_abs_directory()
+
+
+@pytest.fixture(scope="function", name="optical_file_and_cache_dir")
+def fixture_optical_file_and_cache_dir():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "A1.xlsx")
+        copy(PATH_TO_FILLED_OPTICAL_TEMPLATE, file_path)
+        yield file_path, os.path.join(tmp_dir, "cache")
+
+
+def _get_sidecar_json_path(file_path, cache_dir):
+    return (
+        sidecar_cache._get_sidecar_base_path(  # pylint: disable=protected-access # checking the stored contents
+            file_path, cache_dir
+        )
+        + ".json"
+    )
+
+
+def test_ExcelWellFile__loads_memory_mapped_sidecar_instead_of_parsing_workbook_again(
+    optical_file_and_cache_dir, mocker
+):
+    file_path, cache_dir = optical_file_and_cache_dir
+    parsed_wf = ExcelWellFile(file_path, cache_dir=cache_dir)
+    assert len(os.listdir(cache_dir)) == 2
+
+    mocked_bulk_reader = mocker.patch.object(
+        excel_well_file, "_get_tissue_columns_in_bulk", autospec=True
+    )
+    mocked_metadata_reader = mocker.patch.object(
+        excel_well_file, "_get_metadata_values", autospec=True
+    )
+    cached_wf = ExcelWellFile(file_path, cache_dir=cache_dir)
+
+    mocked_bulk_reader.assert_not_called()
+    mocked_metadata_reader.assert_not_called()
+    assert cached_wf.get_metadata() == parsed_wf.get_metadata()
+    actual_reading = cached_wf.get_raw_tissue_reading()
+    assert isinstance(actual_reading, np.memmap)
+    assert actual_reading.flags.writeable is False
+    np.testing.assert_array_equal(actual_reading, parsed_wf.get_raw_tissue_reading())
+
+
+def test_ExcelWellFile__reparses_workbook_when_sidecar_is_stale(
+    optical_file_and_cache_dir,
+):
+    file_path, cache_dir = optical_file_and_cache_dir
+    ExcelWellFile(file_path, cache_dir=cache_dir)
+    copy(
+        os.path.join(
+            PATH_OF_CURRENT_FILE,
+            "excel_optical_data",
+            "optical_data_filled_template_well_B1.xlsx",
+        ),
+        file_path,
+    )
+
+    wf = ExcelWellFile(file_path, cache_dir=cache_dir)
+    assert wf.get_well_name() == "B1"
+    assert not isinstance(wf.get_raw_tissue_reading(), np.memmap)
+    assert wf.get_raw_tissue_reading().shape[1] > 0
+
+    assert ExcelWellFile(file_path, cache_dir=cache_dir).get_well_name() == "B1"
+
+
+def test_load_sidecar__keeps_sidecar_if_only_modification_time_changed(
+    optical_file_and_cache_dir, mocker
+):
+    file_path, cache_dir = optical_file_and_cache_dir
+    ExcelWellFile(file_path, cache_dir=cache_dir)
+    file_stat = os.stat(file_path)
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+
+    spied_hash = mocker.spy(sidecar_cache, "_get_file_hash")
+    assert sidecar_cache.load_sidecar(file_path, cache_dir) is not None
+    assert spied_hash.call_count == 1
+    with open(_get_sidecar_json_path(file_path, cache_dir), "r") as json_file:
+        assert json.load(json_file)["mtime_ns"] == file_stat.st_mtime_ns + 10 ** 9
+
+    assert sidecar_cache.load_sidecar(file_path, cache_dir) is not None
+    assert spied_hash.call_count == 1
+
+
+def test_load_sidecar__still_loads_sidecar_if_updated_modification_time_cannot_be_saved(
+    optical_file_and_cache_dir, mocker
+):
+    file_path, cache_dir = optical_file_and_cache_dir
+    ExcelWellFile(file_path, cache_dir=cache_dir)
+    file_stat = os.stat(file_path)
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+    mocker.patch.object(
+        sidecar_cache, "_write_json_atomically", autospec=True, side_effect=OSError
+    )
+
+    assert sidecar_cache.load_sidecar(file_path, cache_dir) is not None
+
+
+def test_load_sidecar__returns_none_if_contents_changed_without_changing_size(
+    optical_file_and_cache_dir,
+):
+    file_path, cache_dir = optical_file_and_cache_dir
+    ExcelWellFile(file_path, cache_dir=cache_dir)
+    with open(file_path, "r+b") as well_file:
+        well_file.seek(-1, os.SEEK_END)
+        last_byte = well_file.read(1)
+        well_file.seek(-1, os.SEEK_END)
+        well_file.write(bytes([last_byte[0] ^ 0xFF]))
+    file_stat = os.stat(file_path)
+    os.utime(file_path, ns=(file_stat.st_atime_ns, file_stat.st_mtime_ns + 10 ** 9))
+
+    assert sidecar_cache.load_sidecar(file_path, cache_dir) is None
+
+
+@pytest.mark.parametrize(
+    "test_description,json_contents_to_change",
+    [
+        ("returns None if format version is different", {"format_version": 0}),
+        ("returns None if data shape is different", {"shape": [2, 1]}),
+    ],
+)
+def test_load_sidecar__returns_none_for_sidecar_that_does_not_match(
+    test_description, json_contents_to_change, optical_file_and_cache_dir
+):
+    file_path, cache_dir = optical_file_and_cache_dir
+    ExcelWellFile(file_path, cache_dir=cache_dir)
+    json_path = _get_sidecar_json_path(file_path, cache_dir)
+    with open(json_path, "r") as json_file:
+        sidecar_info = json.load(json_file)
+    sidecar_info.update(json_contents_to_change)
+    with open(json_path, "w") as json_file:
+        json.dump(sidecar_info, json_file)
+
+    assert sidecar_cache.load_sidecar(file_path, cache_dir) is None
+
+
+def test_load_sidecar__returns_none_if_sidecar_files_are_missing_or_corrupt(
+    optical_file_and_cache_dir,
+):
+    file_path, cache_dir = optical_file_and_cache_dir
+    assert sidecar_cache.load_sidecar(file_path, cache_dir) is None
+
+    ExcelWellFile(file_path, cache_dir=cache_dir)
+    json_path = _get_sidecar_json_path(file_path, cache_dir)
+    os.remove(json_path[: -len(".json")] + ".npy")
+    assert sidecar_cache.load_sidecar(file_path, cache_dir) is None
+
+    with open(json_path, "w") as json_file:
+        json_file.write("{not json")
+    assert sidecar_cache.load_sidecar(file_path, cache_dir) is None
+
+
+def test_write_sidecar__logs_warning_instead_of_raising_if_it_cannot_be_written(
+    optical_file_and_cache_dir, mocker
+):
+    file_path, _ = optical_file_and_cache_dir
+    spied_warning_logger = mocker.spy(sidecar_cache.logger, "warning")
+    not_a_dir = file_path  # a file can't be used as the cache directory
+
+    wf = ExcelWellFile(file_path, cache_dir=not_a_dir)
+
+    assert wf.get_raw_tissue_reading().shape[1] > 0
+    spied_warning_logger.assert_called_once()
+    assert file_path in spied_warning_logger.call_args[0][0]
+
+
+def test_ExcelWellFile__does_not_use_cache_when_reading_from_file_object(
+    optical_file_and_cache_dir,
+):
+    file_path, cache_dir = optical_file_and_cache_dir
+    with open(file_path, "rb") as file_obj:
+        wf = ExcelWellFile(file_path, file_obj=file_obj, cache_dir=cache_dir)
+    assert wf.get_excel_metadata_value(WELL_NAME_UUID) == "A1"
+    assert not os.path.exists(cache_dir)
+
+
+def test_PlateRecording__from_directory__can_analyze_cached_optical_files_without_changing_them():
+    dir_to_load = PATH_TO_OPTICAL_PLATE_FOLDER
+    with tempfile.TemporaryDirectory() as cache_dir:
+        PlateRecording.from_directory(
+            dir_to_load, cache_dir=cache_dir
+        ).get_reference_magnetic_data(0)
+        pr = PlateRecording.from_directory(dir_to_load, cache_dir=cache_dir)
+        well_file = pr.get_well_by_index(0)
+        expected_reading = np.array(well_file.get_raw_tissue_reading())
+        assert isinstance(well_file.get_raw_tissue_reading(), np.memmap)
+
+        pr.get_reference_magnetic_data(0)
+
+        np.testing.assert_array_equal(
+            well_file.get_raw_tissue_reading(), expected_reading
+        )
+        del pr, well_file  # release the memory maps before the directory is removed
@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+import pickle
+
+from curibio.sdk import CALCULATED_METRIC_DISPLAY_NAMES
+from curibio.sdk import get_per_twitch_table
+from curibio.sdk import PER_TWITCH_TIMEPOINT_COLUMN_NAME
+from curibio.sdk import well_analysis
+from curibio.sdk import WellAnalysisResult
+from mantarray_waveform_analysis import AMPLITUDE_UUID
+from mantarray_waveform_analysis import AUC_UUID
+from mantarray_waveform_analysis import BESSEL_LOWPASS_10_UUID
+from mantarray_waveform_analysis import CENTIMILLISECONDS_PER_SECOND
+from mantarray_waveform_analysis import Pipeline
+from mantarray_waveform_analysis import PipelineTemplate
+from mantarray_waveform_analysis import TooFewPeaksDetectedError
+from mantarray_waveform_analysis import TWITCH_FREQUENCY_UUID
+from mantarray_waveform_analysis import TWITCH_PERIOD_UUID
+from mantarray_waveform_analysis import TwoPeaksInARowError
+from mantarray_waveform_analysis import TwoValleysInARowError
+from mantarray_waveform_analysis import WIDTH_UUID
+from mantarray_waveform_analysis import WIDTH_VALUE_UUID
+from mantarray_waveform_analysis.exceptions import PeakDetectionError
+import numpy as np
+import pytest
+
+from .fixtures import fixture_generic_well_file_0_3_1
+
+__fixtures__ = [fixture_generic_well_file_0_3_1]
+
+
+@pytest.fixture(scope="function", name="generic_pipeline_template_0_3_1")
+def fixture_generic_pipeline_template_0_3_1(generic_well_file_0_3_1):
+    yield PipelineTemplate(
+        noise_filter_uuid=BESSEL_LOWPASS_10_UUID,
+        tissue_sampling_period=generic_well_file_0_3_1.get_tissue_sampling_period_microseconds()
+        / 1000000
+        * CENTIMILLISECONDS_PER_SECOND,
+    )
+
+
+@pytest.mark.parametrize(
+    "error,expected_message",
+    [
+        (
+            TwoPeaksInARowError(([], []), [], (0, 1)),
+            "Error: Two Contractions in a Row Detected",
+        ),
+        (
+            TwoValleysInARowError(([], []), [], (0, 1)),
+            "Error: Two Relaxations in a Row Detected",
+        ),
+        (TooFewPeaksDetectedError(), "Error: Not Enough Twitches Detected"),
+    ],
+)
+def test_classify_peak_detection_error__returns_message_for_each_type_of_error(
+    error, expected_message
+):
+    assert well_analysis.classify_peak_detection_error(error) == expected_message
+
+
+def test_classify_peak_detection_error__raises_error_for_unknown_type_of_error():
+    with pytest.raises(NotImplementedError, match="Unknown PeakDetectionError"):
+        well_analysis.classify_peak_detection_error(PeakDetectionError())
+
+
+def test_analyze_raw_well_data__matches_pipeline_results_and_can_be_pickled(
+    generic_well_file_0_3_1, generic_pipeline_template_0_3_1
+):
+    raw_tissue_reading = generic_well_file_0_3_1.get_raw_tissue_reading()
+    raw_reference_reading = generic_well_file_0_3_1.get_raw_reference_reading()
+    pipeline = generic_pipeline_template_0_3_1.create_pipeline()
+    pipeline.load_raw_magnetic_data(raw_tissue_reading, raw_reference_reading)
+
+    result = pickle.loads(
+        pickle.dumps(
+            well_analysis.analyze_raw_well_data(
+                11,
+                generic_pipeline_template_0_3_1,
+                raw_tissue_reading,
+                raw_reference_reading,
+            )
+        )
+    )
+
+    assert isinstance(result, WellAnalysisResult)
+    assert result.well_index == 11
+    assert result.last_raw_timepoint == raw_tissue_reading[0][-1]
+    np.testing.assert_array_equal(
+        result.filtered_data, pipeline.get_noise_filtered_magnetic_data()
+    )
+    assert result.error_message is None
+    assert (
+        result.aggregate_metrics[AMPLITUDE_UUID]["n"]
+        == pipeline.get_magnetic_data_metrics()[1][AMPLITUDE_UUID]["n"]
+    )
+
+
+def test_analyze_well__stores_classified_error_instead_of_raising_it(
+    mocker, generic_well_file_0_3_1, generic_pipeline_template_0_3_1
+):
+    mocker.patch.object(
+        Pipeline,
+        "get_magnetic_data_metrics",
+        autospec=True,
+        side_effect=TwoPeaksInARowError(([], []), [], (0, 1)),
+    )
+    pipeline = generic_pipeline_template_0_3_1.create_pipeline()
+    pipeline.load_raw_magnetic_data(
+        generic_well_file_0_3_1.get_raw_tissue_reading(),
+        generic_well_file_0_3_1.get_raw_reference_reading(),
+    )
+
+    result = well_analysis.analyze_well(11, pipeline)
+
+    assert result.per_twitch_metrics is None
+    assert result.aggregate_metrics is None
+    assert result.error_message == "Error: Two Contractions in a Row Detected"
+    assert len(result.peak_and_valley_indices[0]) > 0
+
+
+def test_get_per_twitch_table__returns_column_of_each_metric_in_display_units():
+    per_twitch_metrics = {
+        iter_timepoint: {
+            TWITCH_PERIOD_UUID: 100000 + iter_offset,
+            TWITCH_FREQUENCY_UUID: 1.0 - iter_offset / 1000,
+            AMPLITUDE_UUID: 2000 + iter_offset,
+            WIDTH_UUID: {50: {WIDTH_VALUE_UUID: 50000 + iter_offset}},
+            AUC_UUID: 3000.5 + iter_offset,
+        }
+        for iter_offset, iter_timepoint in enumerate((150000, 250000, 350000))
+    }
+
+    actual = get_per_twitch_table(per_twitch_metrics)
+
+    assert list(actual) == [PER_TWITCH_TIMEPOINT_COLUMN_NAME] + [
+        iter_name[1] if isinstance(iter_name, tuple) else iter_name
+        for iter_name in CALCULATED_METRIC_DISPLAY_NAMES.values()
+    ]
+    np.testing.assert_array_equal(
+        actual[PER_TWITCH_TIMEPOINT_COLUMN_NAME], [1.5, 2.5, 3.5]
+    )
+    np.testing.assert_array_equal(
+        actual["Twitch Period (seconds)"], [1.0, 1.00001, 1.00002]
+    )
+    np.testing.assert_array_equal(actual["Twitch Frequency (Hz)"], [1.0, 0.999, 0.998])
+    np.testing.assert_array_equal(actual["Twitch Amplitude"], [2000, 2001, 2002])
+    np.testing.assert_array_equal(
+        actual["Twitch Width 50 (FWHM) (seconds)"], [0.5, 0.50001, 0.50002]
+    )
+    np.testing.assert_array_equal(
+        actual["Twitch Area Under the Curve (AUC)"], [3000.5, 3001.5, 3002.5]
+    )
+    for iter_column in actual.values():
+        assert iter_column.dtype == np.float64
+        assert iter_column.flags["C_CONTIGUOUS"]
@@ -0,0 +1,236 @@
+# -*- coding: utf-8 -*-
+import os
+import tempfile
+import time
+
+from curibio.sdk import xlsx_writing
+from curibio.sdk.xlsx_writing import write_columns_by_row
+from curibio.sdk.xlsx_writing import write_values_to_column
+from curibio.sdk.xlsx_writing import write_values_to_row
+from curibio.sdk.xlsx_writing import XlsxWritingOptions
+import numpy as np
+from openpyxl import load_workbook
+import pytest
+from xlsxwriter import Workbook
+
+
+def _write_and_read_back(write_values, data_only=True):
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "values.xlsx")
+        workbook = Workbook(file_path)
+        worksheet = workbook.add_worksheet()
+        write_values(workbook, worksheet)
+        workbook.close()
+        actual_sheet = load_workbook(file_path, data_only=data_only).active
+        return [[cell.value for cell in row] for row in actual_sheet.iter_rows()]
+
+
+def test_write_values_to_column__writes_array_starting_at_given_cell():
+    actual = _write_and_read_back(
+        lambda _, worksheet: write_values_to_column(
+            worksheet, 1, 2, np.array([1.5, 2, -3.25])
+        )
+    )
+
+    assert [row[-1] for row in actual] == [None, 1.5, 2, -3.25]
+
+
+def test_write_values_to_row__writes_mixed_values_and_format():
+    def write_values(workbook, worksheet):
+        write_values_to_row(
+            worksheet,
+            2,
+            1,
+            ["Twitch 1", np.float64(0.5), None, 7],
+            cell_format=workbook.add_format({"num_format": "0.00%"}),
+        )
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "values.xlsx")
+        workbook = Workbook(file_path)
+        write_values(workbook, workbook.add_worksheet())
+        workbook.close()
+        actual_sheet = load_workbook(file_path).active
+
+        assert [cell.value for cell in actual_sheet[3]] == [
+            None,
+            "Twitch 1",
+            0.5,
+            None,
+            7,
+        ]
+        assert actual_sheet["C3"].number_format == "0.00%"
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.array([1.0, np.nan, np.inf, -np.inf]),
+        [1.0, float("nan"), np.float64("inf"), float("-inf")],
+    ],
+)
+def test_write_values_to_column__leaves_non_finite_values_blank_by_default(values):
+    actual = _write_and_read_back(
+        lambda _, worksheet: write_values_to_column(worksheet, 0, 0, values)
+    )
+
+    assert [row[0] for row in actual] == [1.0]
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        np.array([1.0, np.nan, np.inf, -np.inf]),
+        [1.0, float("nan"), float("inf"), float("-inf")],
+    ],
+)
+def test_write_values_to_column__writes_excel_errors_for_non_finite_values(values):
+    actual = _write_and_read_back(
+        lambda _, worksheet: write_values_to_column(worksheet, 0, 0, values, "error")
+    )
+
+    assert [row[0] for row in actual] == [1.0, "#NUM!", "#DIV/0!", "#DIV/0!"]
+
+
+def test_write_values_to_row__writes_excel_errors_after_other_values():
+    actual = _write_and_read_back(
+        lambda _, worksheet: write_values_to_row(
+            worksheet, 0, 1, np.array([np.nan, 2.0]), "error"
+        ),
+        data_only=False,
+    )
+
+    assert actual == [[None, "=#NUM!", 2]]
+
+
+def test_write_values_to_row__raises_error_for_non_finite_value_if_policy_is_raise():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        workbook = Workbook(os.path.join(tmp_dir, "values.xlsx"))
+        worksheet = workbook.add_worksheet()
+        with pytest.raises(ValueError, match=r"nan \(at position 1\)"):
+            write_values_to_row(worksheet, 0, 0, np.array([1.0, np.nan]), "raise")
+        workbook.close()
+
+
+def test_write_values_to_column__writes_integer_arrays():
+    actual = _write_and_read_back(
+        lambda _, worksheet: write_values_to_column(
+            worksheet, 0, 0, np.array([3, 4]), "raise"
+        )
+    )
+
+    assert actual == [[3], [4]]
+
+
+def test_check_nan_inf_policy__raises_error_for_unrecognized_policy():
+    with pytest.raises(ValueError, match="Unrecognized nan_inf_policy: zero"):
+        xlsx_writing.check_nan_inf_policy("zero")
+
+
+def test_XlsxWritingOptions__raises_error_for_unrecognized_nan_inf_policy():
+    with pytest.raises(ValueError, match="Unrecognized nan_inf_policy: zero"):
+        XlsxWritingOptions(nan_inf_policy="zero")
+
+
+def test_XlsxWritingOptions__raises_error_for_too_few_chart_points():
+    with pytest.raises(ValueError, match="max_points must be at least 4"):
+        XlsxWritingOptions(chart_max_points=2)
+
+
+def test_XlsxWritingOptions__allows_plotting_full_waveforms():
+    assert XlsxWritingOptions(chart_max_points=None).chart_max_points is None
+
+
+def test_write_columns_by_row__pads_shorter_columns_and_leaves_missing_columns_empty():
+    actual = _write_and_read_back(
+        lambda _, worksheet: write_columns_by_row(
+            worksheet, 1, {1: [1, 2, 3], 3: np.array([4.5, 5.5])}
+        )
+    )
+
+    assert actual == [
+        [None, None, None, None],
+        [None, 1, None, 4.5],
+        [None, 2, None, 5.5],
+        [None, 3, None, None],
+    ]
+
+
+def test_write_columns_by_row__writes_single_cells_before_and_within_columns():
+    actual = _write_and_read_back(
+        lambda _, worksheet: write_columns_by_row(
+            worksheet,
+            1,
+            {0: [1, 2]},
+            single_cells={0: {0: "Time", 2: "Peaks"}, 2: {2: 7.5}, 3: {1: "last"}},
+        )
+    )
+
+    assert actual == [
+        ["Time", None, "Peaks"],
+        [1, None, None],
+        [2, None, 7.5],
+        [None, "last", None],
+    ]
+
+
+def test_write_columns_by_row__writes_excel_errors_for_non_finite_values():
+    actual = _write_and_read_back(
+        lambda _, worksheet: write_columns_by_row(
+            worksheet, 0, {0: [1.0, np.nan], 1: np.array([np.inf, 2.0])}, "error"
+        )
+    )
+
+    assert actual == [[1.0, "#DIV/0!"], ["#NUM!", 2.0]]
+
+
+def test_write_columns_by_row__writes_rows_in_order_in_constant_memory_mode():
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        file_path = os.path.join(tmp_dir, "values.xlsx")
+        workbook = Workbook(file_path, {"constant_memory": True})
+        write_columns_by_row(
+            workbook.add_worksheet(),
+            1,
+            {0: np.arange(5), 1: np.arange(3) * 2},
+            single_cells={0: {0: "a", 1: "b"}, 4: {2: "c"}},
+        )
+        workbook.close()
+        actual_sheet = load_workbook(file_path).active
+
+        assert list(actual_sheet.values) == [
+            ("a", "b", None),
+            (0, 0, None),
+            (1, 2, None),
+            (2, 4, None),
+            (3, None, "c"),
+            (4, None, None),
+        ]
+
+
+@pytest.mark.slow
+def test_write_values_to_column__is_faster_than_writing_each_value_for_long_24_well_recording():
+    # 10 minutes of resampled data at 100 Hz for each well, like the continuous-waveforms sheet
+    waveform_data = np.random.default_rng(seed=0).normal(size=(60000, 24)) * 1e5
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        workbook = Workbook(os.path.join(tmp_dir, "benchmark.xlsx"))
+        each_value_sheet = workbook.add_worksheet()
+        bulk_sheet = workbook.add_worksheet()
+
+        start = time.perf_counter()
+        for iter_col in range(waveform_data.shape[1]):
+            for iter_row, iter_value in enumerate(waveform_data[:, iter_col]):
+                each_value_sheet.write(iter_row + 1, iter_col + 1, iter_value)
+        each_value_seconds = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for iter_col in range(waveform_data.shape[1]):
+            write_values_to_column(
+                bulk_sheet, 1, iter_col + 1, waveform_data[:, iter_col]
+            )
+        bulk_seconds = time.perf_counter() - start
+
+        print(  # allow-print
+            f"Writing {waveform_data.size} values: {each_value_seconds:.2f} s one at a time, {bulk_seconds:.2f} s in bulk ({each_value_seconds / bulk_seconds:.1f}x faster)"
+        )
+        assert bulk_seconds < each_value_seconds
+        workbook.close()